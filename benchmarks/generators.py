@@ -0,0 +1,158 @@
+""" Synthetic log generators for benchmarks """
+
+import base64
+import os
+
+import can
+import cantools
+import numpy as np
+
+# Rows generated and written at once
+BLOCK_ROWS = 100000
+
+# Source addresses the database messages are sent from
+SOURCE_ADDRESSES = (0x00, 0x03, 0x0b, 0x21)
+
+# Timestamp of the first frame and the interval between frames (seconds)
+START_TIME = 1700000000.0
+FRAME_PERIOD = 0.0005
+
+def _frame_ids(dbc_file: str) -> list[tuple[int, int]]:
+    """
+    Returns (arbitration id, length) of every database message sent from
+    every address of SOURCE_ADDRESSES
+    """
+    db = cantools.database.load_file(dbc_file)
+    return [((msg.frame_id & 0x1fffff00) | sa, msg.length)
+            for msg in db.messages for sa in SOURCE_ADDRESSES]
+
+def _frame_blocks(dbc_file: str, rows: int, seed: int = 0):
+    """
+    Yields blocks of (timestamps, arbitration ids, lengths, payloads) of
+    'rows' random frames of the database messages in total
+    """
+    frame_ids = _frame_ids(dbc_file)
+    ids = np.array([x[0] for x in frame_ids], np.uint32)
+    lengths = np.array([x[1] for x in frame_ids], np.int64)
+    rng = np.random.default_rng(seed)
+    for first in range(0, rows, BLOCK_ROWS):
+        count = min(BLOCK_ROWS, rows - first)
+        kinds = rng.integers(0, len(frame_ids), count)
+        timestamps = START_TIME + \
+            (first + np.arange(count, dtype=np.float64)) * FRAME_PERIOD
+        payloads = rng.integers(0, 256, (count, 8), dtype=np.uint8)
+        yield timestamps, ids[kinds], lengths[kinds], payloads
+
+def _write_candump(path: str, dbc_file: str, rows: int) -> None:
+    """
+    Writes a candump -L log
+    """
+    with open(path, "w", encoding="utf-8") as log_file:
+        for timestamps, ids, lengths, payloads in _frame_blocks(dbc_file,
+                                                                rows):
+            log_file.write("".join(
+                f"({ts:.6f}) can0 {fid:08X}#"
+                f"{data[:size].tobytes().hex().upper()}\n"
+                for ts, fid, size, data in zip(timestamps.tolist(),
+                                               ids.tolist(), lengths.tolist(),
+                                               payloads)
+            ))
+
+def _write_asc(path: str, dbc_file: str, rows: int) -> None:
+    """
+    Writes a Vector ASC log with relative timestamps
+    """
+    with open(path, "w", encoding="utf-8") as log_file:
+        log_file.write("date Tue Nov 14 10:13:20.000 pm 2023\n"
+                       "base hex  timestamps absolute\n"
+                       "internal events logged\n"
+                       "Begin Triggerblock Tue Nov 14 10:13:20.000 pm 2023\n"
+                       "   0.000000 Start of measurement\n")
+        for timestamps, ids, lengths, payloads in _frame_blocks(dbc_file,
+                                                                rows):
+            log_file.write("".join(
+                f"{ts - START_TIME:11.6f} 1  {fid:X}x       Rx   d {size} "
+                f"{' '.join(f'{x:02X}' for x in data[:size].tolist())}\n"
+                for ts, fid, size, data in zip(timestamps.tolist(),
+                                               ids.tolist(), lengths.tolist(),
+                                               payloads)
+            ))
+        log_file.write("End TriggerBlock\n")
+
+def _write_can_csv(path: str, dbc_file: str, rows: int) -> None:
+    """
+    Writes a CSV log of CAN frames in python-can format
+    """
+    with open(path, "w", encoding="utf-8") as log_file:
+        log_file.write("timestamp,arbitration_id,extended,remote,error,dlc,"
+                       "data\n")
+        for timestamps, ids, lengths, payloads in _frame_blocks(dbc_file,
+                                                                rows):
+            log_file.write("".join(
+                f"{ts:.6f},0x{fid:x},1,0,0,{size},"
+                f"{base64.b64encode(data[:size].tobytes()).decode()}\n"
+                for ts, fid, size, data in zip(timestamps.tolist(),
+                                               ids.tolist(), lengths.tolist(),
+                                               payloads)
+            ))
+
+def _write_blf(path: str, dbc_file: str, rows: int) -> None:
+    """
+    Writes a BLF log
+    """
+    with can.BLFWriter(path) as writer:
+        for timestamps, ids, lengths, payloads in _frame_blocks(dbc_file,
+                                                                rows):
+            for ts, fid, size, data in zip(timestamps.tolist(), ids.tolist(),
+                                           lengths.tolist(), payloads):
+                writer.on_message_received(can.Message(
+                    timestamp=ts, arbitration_id=fid, is_extended_id=True,
+                    data=data[:size].tobytes(), channel=0
+                ))
+
+_J1939_WRITERS = {
+    ".log": _write_candump,
+    ".asc": _write_asc,
+    ".blf": _write_blf,
+    ".csv": _write_can_csv
+}
+
+J1939_FORMATS = tuple(_J1939_WRITERS)
+
+def generate_j1939_log(path: os.PathLike[str],
+                       dbc_file: str,
+                       rows: int) -> None:
+    """
+    Generates a J1939 log of 'rows' random frames of the messages described
+    in 'dbc_file'. The format is selected by the file extension (see
+    J1939_FORMATS).
+    """
+    _, ext = os.path.splitext(path)
+    try:
+        writer = _J1939_WRITERS[ext]
+    except KeyError as err:
+        raise ValueError(f"Unsupported log format: {ext}") from err
+    writer(str(path), dbc_file, rows)
+
+def generate_simple_csv(path: os.PathLike[str],
+                        rows: int,
+                        signals: int = 8,
+                        delimiter: str = ";") -> None:
+    """
+    Generates a simple CSV file with a timestamp column and 'signals'
+    columns of 'rows' random walk values
+    """
+    rng = np.random.default_rng(0)
+    columns = ["timestamp"] + [f"sig{i}" for i in range(1, signals + 1)]
+    last = np.zeros(signals)
+    with open(path, "w", encoding="utf-8") as csv_file:
+        csv_file.write(delimiter.join(columns) + "\n")
+        for first in range(0, rows, BLOCK_ROWS):
+            count = min(BLOCK_ROWS, rows - first)
+            values = last + np.cumsum(rng.normal(size=(count, signals)),
+                                      axis=0)
+            last = values[-1]
+            timestamps = (first + np.arange(count)) * 0.001
+            np.savetxt(csv_file, np.column_stack([timestamps, values]),
+                       fmt=["%.3f"] + ["%.6g"] * signals,
+                       delimiter=delimiter)
@@ -0,0 +1,242 @@
+""" Log Viewer benchmarks runner """
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue as queue_module
+import sys
+import tempfile
+import time
+
+from generators import J1939_FORMATS, generate_j1939_log, generate_simple_csv
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src", "log_viewer")
+DBC_FILE = os.path.join(ROOT_DIR, "dbc", "example_db.dbc")
+BASELINE_FILE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+
+FORMATS = ("simple_csv",) + tuple(x[1:] for x in J1939_FORMATS)
+
+# Signals plotted by the plot and merge cases
+PLOT_VARS = 4
+
+# Differences below these are considered noise regardless of the tolerance
+NOISE = {"time": 0.05, "rss": 5.0}
+
+# Interval of checking whether a benchmark process is still running (s)
+POLL_INTERVAL = 1.0
+
+def _peak_rss() -> float:
+    """
+    Returns the peak resident set size of the current process in MiB (NaN
+    where it isn't available)
+    """
+    try:
+        import resource # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def _open_plotter(fmt: str, path: str):
+    """
+    Opens the log 'path' of the format 'fmt' completely and returns the
+    plotter
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from plotter import LogOpenProgress, SimpleCsvPlotter, J1939DumpPlotter
+
+    if fmt == "simple_csv":
+        plotter = SimpleCsvPlotter(path, ";", "timestamp", {})
+        plotter.open()
+        return plotter
+    plotter = J1939DumpPlotter(path, [DBC_FILE])
+    while plotter.open(1000000) != LogOpenProgress.OPEN_COMPLETED:
+        pass
+    return plotter
+
+def _run_case(case: str, fmt: str, path: str, queue) -> None:
+    """
+    Runs the benchmark 'case' of the log 'path' in a child process and puts
+    (time, peak RSS) to 'queue'
+    """
+    sys.path.insert(0, SRC_DIR)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # pylint: disable-next=import-outside-toplevel
+    from PyQt6.QtWidgets import QApplication
+    # pylint: disable-next=import-outside-toplevel,unused-import
+    import plotter # noqa: F401 (imported before the timing)
+
+    # pylint: disable-next=unused-variable
+    app = QApplication.instance() or QApplication([])
+    start = time.perf_counter()
+    if case == "open":
+        # Signals are decoded lazily, so opening includes decoding all of them
+        plotter = _open_plotter(fmt, path)
+        for var in plotter.plot_vars:
+            plotter.samples(var)
+    else:
+        plotter = _open_plotter(fmt, path)
+        plot_vars = plotter.plot_vars[:PLOT_VARS]
+        if case == "plot":
+            start = time.perf_counter()
+            plotter.plot([plot_vars], False).close()
+        else:
+            # pylint: disable-next=import-outside-toplevel
+            from plotter import prepare_merged_plot
+            # pylint: disable-next=protected-access
+            plots = [plotter._signal_frame(x) for x in plot_vars]
+            start = time.perf_counter()
+            prepare_merged_plot([plots])
+    queue.put((time.perf_counter() - start, _peak_rss()))
+
+def run_case(case: str,
+             fmt: str,
+             path: str,
+             timeout: float) -> dict[str, float]:
+    """
+    Runs the benchmark 'case' of the log 'path' of the format 'fmt' in a
+    fresh process and returns its time (seconds) and peak RSS (MiB). Raises
+    RuntimeError if the process exits without a result (e.g. it crashes or
+    runs out of memory) or doesn't finish within 'timeout' seconds.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(case, fmt, path, queue))
+    process.start()
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                elapsed, rss = queue.get(timeout=POLL_INTERVAL)
+                break
+            except queue_module.Empty:
+                # The result may be put just before the process exits
+                if process.exitcode is not None and queue.empty():
+                    raise RuntimeError(
+                        f"exited with code {process.exitcode}"
+                    ) from None
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(
+                        f"timed out after {timeout:.0f} s"
+                    ) from None
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    return {"time": elapsed, "rss": rss}
+
+def generate(fmt: str, rows: int, directory: str) -> str:
+    """
+    Generates a log of the format 'fmt' with 'rows' rows in 'directory'
+    (reused if already exists) and returns its path
+    """
+    if fmt == "simple_csv":
+        path = os.path.join(directory, f"simple_{rows}.csv")
+        if not os.path.isfile(path):
+            generate_simple_csv(path, rows)
+    else:
+        path = os.path.join(directory, f"j1939_{rows}.{fmt}")
+        if not os.path.isfile(path):
+            generate_j1939_log(path, DBC_FILE, rows)
+    return path
+
+def compare(results: dict[str, dict[str, float]],
+            baseline: dict[str, dict[str, float]],
+            tolerance: float) -> list[str]:
+    """
+    Returns descriptions of the results which exceed the baseline by more
+    than 'tolerance' (a fraction of the baseline value) and the noise level
+    """
+    regressions = []
+    for name, result in results.items():
+        for metric, value in result.items():
+            base = baseline.get(name, {}).get(metric)
+            if base and value > base * (1 + tolerance) and \
+                    value - base > NOISE.get(metric, 0):
+                regressions.append(
+                    f"{name} {metric}: {value:.3f} > {base:.3f} "
+                    f"(+{(value / base - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+def run_cases(args: argparse.Namespace,
+              directory: str) -> tuple[dict[str, dict[str, float]], list[str]]:
+    """
+    Runs the benchmark cases selected by the command line 'args' with logs
+    generated in 'directory'. Returns the results by case names and the
+    names of the failed cases.
+    """
+    results = {}
+    failures = []
+    for rows in (int(x) for x in args.rows):
+        for fmt in args.formats:
+            path = generate(fmt, rows, directory)
+            for case in args.cases:
+                # Plotting doesn't depend on the log format
+                if case != "open" and fmt not in ("simple_csv", "log"):
+                    continue
+                name = f"{fmt}.{case}.{rows}"
+                try:
+                    results[name] = run_case(case, fmt, path, args.timeout)
+                except RuntimeError as err:
+                    failures.append(name)
+                    print(f"{name:32} failed: {err}", flush=True)
+                    continue
+                print(f"{name:32} {results[name]['time']:10.3f} s "
+                      f"{results[name]['rss']:10.1f} MiB", flush=True)
+    return results, failures
+
+def main() -> int:
+    """
+    Entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e4, 1e5],
+                        help="log sizes in rows (1e4..1e8)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS,
+                        default=list(FORMATS), help="log formats")
+    parser.add_argument("--cases", nargs="+", choices=("open", "plot",
+                                                       "merge"),
+                        default=["open", "plot", "merge"],
+                        help="benchmark cases")
+    parser.add_argument("--data-dir", help="directory of generated logs "
+                        "(a temporary one is used by default)")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed excess over the baseline (fraction)")
+    parser.add_argument("--timeout", type=float, default=3600.0,
+                        help="time limit of a single case (seconds)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = args.data_dir or temp_dir
+        os.makedirs(directory, exist_ok=True)
+        results, failures = run_cases(args, directory)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline, encoding="utf-8") as baseline_file:
+                baseline = json.load(baseline_file)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+        return 1 if failures else 0
+
+    if not os.path.isfile(args.baseline):
+        return 1 if failures else 0
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        regressions = compare(results, json.load(baseline_file),
+                              args.tolerance)
+    for regression in regressions:
+        print("Regression:", regression)
+    return 1 if regressions or failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
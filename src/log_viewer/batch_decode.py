@@ -0,0 +1,189 @@
+""" Headless batch decoding of J1939 logs module """
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from plotter import J1939DumpPlotter, LogOpenProgress
+
+# Output formats and their file extensions
+OUTPUT_FORMATS = {
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "npz": ".npz"
+}
+
+# Messages read per opening step
+_OPEN_STEP = 1000000
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def decode_file(filename: str,
+                dbc_files: list[str],
+                output_dir: str,
+                output_format: str = "npz",
+                asc_base: str = "hex",
+                asc_rel_timestamp: bool = True,
+                output_name: Optional[str] = None) -> tuple[str, int]:
+    """
+    Decodes the J1939 log 'filename' with the databases 'dbc_files' the same
+    way as J1939DumpPlotter and writes all signals to 'output_dir' in
+    'output_format' (see OUTPUT_FORMATS) as 'output_name' (the log name
+    without extension if not given). Parquet and Feather files hold a long
+    table with the signal, timestamp and value columns, NPZ files hold
+    '<signal>/timestamp' and '<signal>/value' arrays. Returns the output
+    path and the number of the read messages.
+    """
+    plotter = J1939DumpPlotter(filename, dbc_files, asc_base,
+                               asc_rel_timestamp)
+    while plotter.open(_OPEN_STEP) != LogOpenProgress.OPEN_COMPLETED:
+        pass
+
+    if output_name is None:
+        output_name = os.path.splitext(os.path.basename(filename))[0]
+    path = os.path.join(output_dir,
+                        output_name + OUTPUT_FORMATS[output_format])
+    signals = {var: plotter.samples(var) for var in plotter.plot_vars}
+    if output_format == "npz":
+        arrays = {}
+        for var, samples in signals.items():
+            arrays[var + "/timestamp"] = samples.timestamps
+            arrays[var + "/value"] = samples.values
+        np.savez(path, **arrays)
+    else:
+        df = pd.DataFrame({
+            "signal": pd.Categorical(np.repeat(
+                list(signals), [len(x) for x in signals.values()]
+            ), categories=list(signals)),
+            "timestamp": np.concatenate(
+                [x.timestamps for x in signals.values()] or [[]]
+            ),
+            "value": np.concatenate(
+                [x.values for x in signals.values()] or [[]]
+            )
+        })
+        if output_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_feather(path)
+    return path, plotter.processed
+
+def output_names(logs: list[str]) -> list[str]:
+    """
+    Returns unique output names (without extension) of 'logs': the log name
+    without extension or, for the logs of the same name (e.g. run.log and
+    run.asc or bench1/run.log and bench2/run.log), the log path relative to
+    their common directory with the extension and path separators replaced
+    by '_'. Raises ValueError if the names still collide (e.g. a log is
+    given twice).
+    """
+    stems = [os.path.splitext(os.path.basename(x))[0] for x in logs]
+    colliding = [os.path.dirname(os.path.abspath(x))
+                 for x, stem in zip(logs, stems) if stems.count(stem) > 1]
+    common = os.path.commonpath(colliding) if colliding else ""
+    names = []
+    for log, stem in zip(logs, stems):
+        if stems.count(stem) > 1:
+            relative = os.path.relpath(os.path.abspath(log), common)
+            stem = relative.replace(os.sep, "_").replace(".", "_")
+        names.append(stem)
+    duplicates = sorted({x for x in names if names.count(x) > 1})
+    if duplicates:
+        raise ValueError("Output names collide: " + ", ".join(duplicates))
+    return names
+
+def _decode_task(args: tuple) -> tuple[str, int, float]:
+    """
+    Decodes a single log in a pool worker process. Returns the output path,
+    the number of the read messages and the decoding time.
+    """
+    start = time.monotonic()
+    path, processed = decode_file(*args)
+    return path, processed, time.monotonic() - start
+
+def make_parser(parser: Optional[argparse.ArgumentParser] = None) \
+        -> argparse.ArgumentParser:
+    """
+    Adds the batch decoding arguments to 'parser' (a new one if not given)
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(
+            description="Decode J1939 logs to columnar files"
+        )
+    parser.add_argument("logs",
+                        nargs="+",
+                        help="J1939 logs (.log/.asc/.blf/.csv)")
+    parser.add_argument("--db",
+                        nargs="+",
+                        required=True,
+                        help="DBC files to decode the logs")
+    parser.add_argument("-o", "--output-dir",
+                        default=".",
+                        help="Directory of the output files")
+    parser.add_argument("-f", "--format",
+                        choices=list(OUTPUT_FORMATS),
+                        default="npz",
+                        help="Output format")
+    parser.add_argument("-j", "--workers",
+                        type=int,
+                        default=0,
+                        help="Number of processes (0 - all CPU cores)")
+    parser.add_argument("--asc-base",
+                        choices=["hex", "dec"],
+                        default="hex",
+                        help="Base of the numbers in .asc logs")
+    parser.add_argument("--asc-abs-timestamp",
+                        action="store_true",
+                        help="Use absolute timestamps of .asc logs")
+    return parser
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Decodes the logs given by the parsed arguments 'args' across a pool of
+    processes (one log per process) and reports the progress to stderr.
+    Returns the exit code: 0 if all logs are decoded, 1 otherwise.
+    """
+    try:
+        names = output_names(args.logs)
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+    if not any(os.path.isfile(x) for x in args.db):
+        print("No database found: " + ", ".join(args.db), file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    workers = min(workers, len(args.logs))
+    failed = 0
+    # Spawned processes don't inherit the state of the parent process
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            executor.submit(_decode_task, (log, args.db, args.output_dir,
+                                           args.format, args.asc_base,
+                                           not args.asc_abs_timestamp,
+                                           name)): log
+            for log, name in zip(args.logs, names)
+        }
+        for done, future in enumerate(
+                concurrent.futures.as_completed(futures), 1):
+            log = futures[future]
+            try:
+                path, processed, elapsed = future.result()
+                print(f"[{done}/{len(futures)}] {log} -> {path} "
+                      f"({processed} messages, {elapsed:.1f} s)",
+                      file=sys.stderr, flush=True)
+            # pylint: disable-next=broad-exception-caught
+            except Exception as err:
+                failed += 1
+                print(f"[{done}/{len(futures)}] {log}: failed: {err!r}",
+                      file=sys.stderr, flush=True)
+    return 1 if failed else 0
@@ -12,9 +12,9 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 class Ui_ImportDialog(object):
     def setupUi(self, ImportDialog):
         ImportDialog.setObjectName("ImportDialog")
-        ImportDialog.resize(345, 110)
-        ImportDialog.setMinimumSize(QtCore.QSize(345, 110))
-        ImportDialog.setMaximumSize(QtCore.QSize(345, 110))
+        ImportDialog.resize(345, 140)
+        ImportDialog.setMinimumSize(QtCore.QSize(345, 140))
+        ImportDialog.setMaximumSize(QtCore.QSize(345, 140))
         self.label = QtWidgets.QLabel(parent=ImportDialog)
         self.label.setGeometry(QtCore.QRect(20, 10, 301, 21))
         self.label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
@@ -25,8 +25,12 @@ class Ui_ImportDialog(object):
         self.messageCount = QtWidgets.QLabel(parent=ImportDialog)
         self.messageCount.setGeometry(QtCore.QRect(148, 40, 171, 21))
         self.messageCount.setObjectName("messageCount")
+        self.progressBar = QtWidgets.QProgressBar(parent=ImportDialog)
+        self.progressBar.setGeometry(QtCore.QRect(20, 70, 301, 21))
+        self.progressBar.setProperty("value", 0)
+        self.progressBar.setObjectName("progressBar")
         self.cancelButton = QtWidgets.QPushButton(parent=ImportDialog)
-        self.cancelButton.setGeometry(QtCore.QRect(110, 70, 121, 31))
+        self.cancelButton.setGeometry(QtCore.QRect(110, 100, 121, 31))
         self.cancelButton.setObjectName("cancelButton")
 
         self.retranslateUi(ImportDialog)
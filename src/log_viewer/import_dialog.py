@@ -7,18 +7,26 @@ from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import QDialog, QMessageBox
 
 from generated_ui import Ui_ImportDialog
-from plotter import J1939DumpPlotter
+from plotter import BasePlotter, SimpleCsvPlotter
 
 class ImportWorker(QObject):
     """
-    A worker to open given plotter
+    A worker to open given plotter. A pipelined plotter reads the log in its
+    own threads (see ImportPipeline) while the worker accumulates the frames
+    and reports the progress. CSV files are read in chunks of rows.
     """
 
+    # Upper limits for a single opening step. Interruption requests are
+    # checked and the progress is reported between the steps only.
+    STEP_MAX_MESSAGES = 100000
+    STEP_TIME_BUDGET = 0.1
+
     failed = pyqtSignal(str)
     finished = pyqtSignal()
     processed = pyqtSignal(int)
+    progress = pyqtSignal(int)
 
-    def __init__(self, plotter: J1939DumpPlotter) -> None:
+    def __init__(self, plotter: BasePlotter) -> None:
         """
         Constructs an ImportWorker to open given 'plotter' object
         """
@@ -32,11 +40,16 @@ class ImportWorker(QObject):
         """
         while not self._plotter.is_opened:
             if QThread.currentThread().isInterruptionRequested():
+                self._plotter.cancel_open()
                 return
             try:
-                self._plotter.open()
+                self._plotter.open(self.STEP_MAX_MESSAGES,
+                                   self.STEP_TIME_BUDGET)
                 self.processed.emit(self._plotter.processed)
-            except (ImportError, ValueError, can.io.blf.BLFParseError) as err:
+                if self._plotter.progress is not None:
+                    self.progress.emit(round(self._plotter.progress * 100))
+            except (ImportError, ValueError, OSError,
+                    can.io.blf.BLFParseError) as err:
                 logging.error(err, exc_info=True)
                 self.failed.emit(str(err))
                 return
@@ -47,7 +60,7 @@ class ImportDialog(QDialog):
     Dialog window with plotter's opening progress
     """
 
-    def __init__(self, plotter: J1939DumpPlotter) -> None:
+    def __init__(self, plotter: BasePlotter) -> None:
         """
         Constructs a ImportDialog with a given 'plotter'. Opening thread will
         start immediately after construction.
@@ -57,6 +70,9 @@ class ImportDialog(QDialog):
 
         self._ui = Ui_ImportDialog()
         self._ui.setupUi(self)
+        if isinstance(plotter, SimpleCsvPlotter):
+            self._ui.label_2.setText("Rows processed:")
+        self._ui.progressBar.setVisible(plotter.progress is not None)
 
         self._thread = QThread()
         self._worker = ImportWorker(plotter)
@@ -68,6 +84,7 @@ class ImportDialog(QDialog):
         self._worker.failed.connect(self._import_failed)
         self._thread.finished.connect(self._import_finished)
         self._worker.processed.connect(self._update_processed)
+        self._worker.progress.connect(self._ui.progressBar.setValue)
         self._ui.cancelButton.clicked.connect(self.reject)
         self._thread.start()
 
@@ -4,6 +4,7 @@ import argparse
 import json
 import locale
 import logging
+import multiprocessing
 import sys
 import os
 import platform
@@ -13,12 +14,12 @@ import matplotlib
 from PyQt6 import QtGui
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
+import batch_decode
 from exceptions import LogViewerInvalidConfig
 from main_window import MainWindow
 from version import __version__
 
 locale.setlocale(locale.LC_ALL, "")
-matplotlib.use("qtagg")
 
 APP_LOG_PATH = "debug.log"
 
@@ -33,6 +34,9 @@ if cur_platform == "Windows":
         pass
 
 if __name__ == "__main__":
+    # Required by the worker processes of a frozen executable
+    multiprocessing.freeze_support()
+
     logging.basicConfig(level=logging.INFO,
                         filename=APP_LOG_PATH,
                         filemode="w",
@@ -46,9 +50,20 @@ if __name__ == "__main__":
                         action="version",
                         version=__version__,
                         help="Print version information and exit")
+    subparsers = parser.add_subparsers(dest="command")
+    batch_decode.make_parser(subparsers.add_parser(
+        "decode",
+        help="Decode J1939 logs to columnar files without starting the GUI",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    ))
 
     args = parser.parse_args()
 
+    if args.command == "decode":
+        sys.exit(batch_decode.run(args))
+
+    matplotlib.use("qtagg")
+
     app = QApplication([])
     app.setWindowIcon(
         QtGui.QIcon(os.path.join(basedir, "icon.ico"))
@@ -2,24 +2,29 @@
 
 import json
 import logging
+import os
+from typing import Optional
 
+import can
 from jsonschema import validate
-from PyQt6.QtCore import pyqtSlot, Qt, QRectF, QSize
+from PyQt6.QtCore import pyqtSlot, Qt, QRectF, QSize, QTimer
 from PyQt6.QtGui import QAction, QColor, QIcon, QPixmap, QTextDocument
-from PyQt6.QtWidgets import QDialog, QFileDialog, QLabel, QListWidget, \
-                            QListWidgetItem, QMainWindow, QMessageBox, \
-                            QStyledItemDelegate, QStyle, QStyleOptionViewItem
+from PyQt6.QtWidgets import QDialog, QFileDialog, QInputDialog, QLabel, \
+                            QListWidget, QListWidgetItem, QMainWindow, \
+                            QMessageBox, QStyledItemDelegate, QStyle, \
+                            QStyleOptionViewItem
 
 from about_dialog import AboutDialog
 from generated_ui import Ui_MainWindow
 from import_dialog import ImportDialog
-from plotter import SimpleCsvPlotter, J1939DumpPlotter, PlotterInitError, \
-                    PlotterPlotError
+from plotter import SimpleCsvPlotter, J1939DumpPlotter, J1939ImportFilter, \
+                    LogCache, PlotterInitError, PlotterPlotError, \
+                    load_log_index
 from settings_schema import APP_SETTINGS_SCHEMA
 from settings_dialog import CursorSettings, AppearanceSettings, SettingsData, \
                             SettingsDialog, SimpleCsvSettings, J1939DumpSettings
 from toolbar import PlotMode
-from utils import get_icons_path, get_settings_path
+from utils import get_cache_path, get_icons_path, get_settings_path
 
 class PlotItemList:
     """
@@ -91,6 +96,12 @@ class PlotItemList:
                 return self._plots
         return [[]]
 
+    def __contains__(self, item: str) -> bool:
+        """
+        Checks if the list contains an item with name 'item'
+        """
+        return item in self._items
+
     def add_items(self, items: list[str]) -> None:
         """
         Adds the list 'list' with item names
@@ -189,6 +200,9 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
     LogViewer's main window
     """
 
+    # Interval (ms) of checking the followed log for new data
+    FOLLOW_INTERVAL = 1000
+
     def __init__(self) -> None:
         """
         Constructs a main window of the LogViewer
@@ -197,9 +211,13 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
 
         self._ready = False
         self._file = ""
+        # All selected logs opened as one (self._file is the first one)
+        self._files = []
         self._plot_windows = {}
         self._plot_windows_actions = {}
+        self._followed_windows = {}
         self._plotter = None
+        self._time_range = None
 
         with open(str(get_settings_path()), "r",
                   encoding="utf-8") as settings_file:
@@ -221,6 +239,14 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
         self._ui.actionSelectAll.setIcon(self.__icon("select_all.png"))
         self._ui.actionSelectClear.setIcon(self.__icon("select_clear.png"))
 
+        # Time range opening setup
+        self._open_range_action = QAction("Open time range...", self)
+        self._ui.menuFile.insertAction(self._ui.actionRefresh,
+                                       self._open_range_action)
+
+        # Follow mode setup
+        self.__setup_follow()
+
         # Status bar setup
         self._status_mode = QLabel()
         self._ui.statusbar.addPermanentWidget(self._status_mode)
@@ -238,6 +264,7 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
         self._ui.actionAssign.triggered.connect(self.assign_plot)
         self._ui.actionClear.triggered.connect(self.clear_assignment)
         self._ui.actionClose.triggered.connect(self.file_close)
+        self._open_range_action.triggered.connect(self.file_open_range)
         self._ui.actionCloseAll.triggered.connect(self.close_all_plot_window)
         self._ui.actionPlot.triggered.connect(self.plot)
         self._ui.actionOpen.triggered.connect(self.file_open)
@@ -250,6 +277,21 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
 
         logging.info("Successfully started")
 
+    def __setup_follow(self) -> None:
+        """
+        Adds the follow mode action to the File menu and sets up the timer
+        checking the followed log for new data
+        """
+        self._follow_action = QAction("Follow", self)
+        self._follow_action.setCheckable(True)
+        self._follow_action.setToolTip("Follow the growing log-file")
+        self._ui.menuFile.insertAction(self._ui.actionClose,
+                                       self._follow_action)
+        self._follow_timer = QTimer(self)
+        self._follow_timer.setInterval(self.FOLLOW_INTERVAL)
+        self._follow_action.toggled.connect(self.follow_toggled)
+        self._follow_timer.timeout.connect(self.follow_update)
+
     def __icon(self, name: str) -> QIcon:
         """
         Gets QIcon for a given 'name' filename
@@ -273,8 +315,12 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
         Updates all QActions according to current application state
         """
         self._ui.actionOpen.setEnabled(not self._ready)
+        self._open_range_action.setEnabled(
+            not self._ready and self._settings["mode"] == "j1939_dump"
+        )
         self._ui.actionRefresh.setEnabled(self._ready)
         self._ui.actionClose.setEnabled(self._ready)
+        self._follow_action.setEnabled(self._ready)
         self._ui.actionPlot.setEnabled(self._ready)
         self._ui.actionSpectrum.setEnabled(self._ready)
         self._ui.actionSelectAll.setEnabled(self._ready)
@@ -313,6 +359,20 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
 
         self.__update_actions()
 
+    def __log_cache(self, mode: str = "j1939_dump") -> Optional[LogCache]:
+        """
+        Returns the decoded logs cache of 'mode' according to current
+        application settings (None if the cache is disabled)
+        """
+        cache_size_mb = self._settings[mode].get("cache_size_mb",
+                                                 LogCache.DEFAULT_SIZE_MB)
+        if cache_size_mb > 0:
+            path = get_cache_path()
+            if mode != "j1939_dump":
+                path = os.path.join(path, mode)
+            return LogCache.from_megabytes(path, cache_size_mb)
+        return None
+
     def __import(self) -> None:
         """
         Performs import from opened self._file according to current application
@@ -325,28 +385,55 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
                         self._file,
                         self._settings["simple_csv"]["delimiter"],
                         self._settings["simple_csv"]["timestamp"],
-                        self._settings["simple_csv"]["scales"]
+                        self._settings["simple_csv"]["scales"],
+                        self._follow_action.isChecked(),
+                        self._settings["simple_csv"].get("compact", False),
+                        self._settings["simple_csv"].get("engine", "c"),
+                        self._settings["simple_csv"].get("lazy", False) and
+                        not self._follow_action.isChecked(),
+                        self._settings["simple_csv"].get(
+                            "cache_columns", SimpleCsvPlotter.CACHE_COLUMNS
+                        ),
+                        self.__log_cache("simple_csv"),
+                        self._settings["simple_csv"].get("derived", {})
                     )
-                    self._plotter.open()
-                    self._ready = True
-                    logging.info("Successfully opened: %s", self._file)
+                    dialog = ImportDialog(self._plotter)
+                    if dialog.exec() == QDialog.DialogCode.Accepted:
+                        self._ready = True
+                        logging.info("Successfully opened: %s", self._file)
+                    else:
+                        logging.warning("Failed to open: %s", self._file)
                 except PlotterInitError as err:
                     logging.error(err, exc_info=True)
                     QMessageBox.critical(None, "Critical error", str(err))
             elif self._settings["mode"] == "j1939_dump":
                 try:
                     self._plotter = J1939DumpPlotter(
-                            self._file,
+                            self._files if len(self._files) > 1 else self._file,
                             self._settings["j1939_dump"]["db"],
                             self._settings["j1939_dump"]["asc_base"],
-                            self._settings["j1939_dump"]["asc_rel_timestamp"]
+                            self._settings["j1939_dump"]["asc_rel_timestamp"],
+                            self._settings["j1939_dump"].get("workers", 0),
+                            self.__log_cache(),
+                            self._follow_action.isChecked() and
+                            len(self._files) <= 1,
+                            J1939ImportFilter.from_settings(
+                                self._settings["j1939_dump"].get("filter", {})
+                            ),
+                            self._time_range,
+                            self._settings["j1939_dump"].get("compact", False),
+                            self._settings["j1939_dump"].get("pipeline", True),
+                            self._settings["j1939_dump"].get("keep_raw", False),
+                            self._settings["j1939_dump"].get("derived", {})
                         )
                     dialog = ImportDialog(self._plotter)
                     if dialog.exec() == QDialog.DialogCode.Accepted:
                         self._ready = True
-                        logging.info("Successfully opened: %s", self._file)
+                        logging.info("Successfully opened: %s",
+                                     ", ".join(self._files))
                     else:
-                        logging.warning("Failed to open: %s", self._file)
+                        logging.warning("Failed to open: %s",
+                                        ", ".join(self._files))
                 except PlotterInitError as err:
                     logging.error(err, exc_info=True)
                     QMessageBox.critical(None, "Critical error", str(err))
@@ -360,11 +447,13 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
             json.dump(self._settings, settings_file, indent=4)
             logging.info("Changed application configuration")
 
-    @pyqtSlot()
-    def file_open(self) -> None:
+    def __select_file(self) -> None:
         """
-        Performs select and open file according to current application mode
+        Selects self._file (and self._files) according to current
+        application mode. Multiple J1939 dump files may be selected to be
+        opened as one.
         """
+        self._files = []
         if self._settings["mode"] == "simple_csv":
             self._file, _ = QFileDialog.getOpenFileName(
                 None,
@@ -374,12 +463,13 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
             )
         elif self._settings["mode"] == "j1939_dump":
             if self._settings["j1939_dump"]["db"]:
-                self._file, _ = QFileDialog.getOpenFileName(
+                self._files, _ = QFileDialog.getOpenFileNames(
                     None,
-                    "Open log-file",
+                    "Open log-files",
                     "./",
                     "J1939-CAN dump file (*.asc *.blf *.csv *.log)"
                 )
+                self._file = self._files[0] if self._files else ""
             else:
                 self._file = ""
                 QMessageBox.warning(
@@ -393,6 +483,64 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
                 )
         else:
             self._file = ""
+        if not self._files and self._file:
+            self._files = [self._file]
+
+    def __select_time_range(self) -> bool:
+        """
+        Asks for a time range of self._files to open. Returns False if it's
+        cancelled.
+        """
+        try:
+            indexes = [
+                load_log_index(
+                    x,
+                    self._settings["j1939_dump"]["asc_base"],
+                    self._settings["j1939_dump"]["asc_rel_timestamp"],
+                    self.__log_cache()
+                )
+                for x in self._files
+            ]
+        except (ImportError, OSError, ValueError,
+                can.io.blf.BLFParseError) as err:
+            logging.error(err, exc_info=True)
+            QMessageBox.critical(None, "Critical error", str(err))
+            return False
+        start_times = [x.start_time for x in indexes if x.chunks]
+        start_time = min(start_times) if start_times else 0.0
+        start, accepted = QInputDialog.getDouble(
+            self, "Open time range", "Start, s from the beginning of the log:",
+            0.0, 0.0, 1e9, 3
+        )
+        if not accepted:
+            return False
+        duration, accepted = QInputDialog.getDouble(
+            self, "Open time range", "Duration, s:", 30.0, 0.0, 1e9, 3
+        )
+        if not accepted:
+            return False
+        self._time_range = (start_time + start, start_time + start + duration)
+        return True
+
+    @pyqtSlot()
+    def file_open(self) -> None:
+        """
+        Performs select and open file according to current application mode
+        """
+        self.__select_file()
+        self._time_range = None
+        self.__import()
+        self.__update()
+
+    @pyqtSlot()
+    def file_open_range(self) -> None:
+        """
+        Performs select and open a time range of a J1939 dump file
+        """
+        self.__select_file()
+        if self._file and not self.__select_time_range():
+            self._file = ""
+            self._files = []
         self.__import()
         self.__update()
 
@@ -401,6 +549,8 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
         """
         Repeats import from previously opened self._file
         """
+        # Opened plot windows aren't updated from the new import
+        self._followed_windows.clear()
         self.__import()
         self.__update()
 
@@ -409,12 +559,52 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
         """
         Closes previously opened self._file
         """
-        logging.info("Closed: %s", self._file)
+        logging.info("Closed: %s", ", ".join(self._files))
         self._file = ""
+        self._files = []
         self._plotter = None
         self._ready = False
+        self._follow_action.setChecked(False)
         self.__update()
 
+    @pyqtSlot(bool)
+    def follow_toggled(self, checked: bool) -> None:
+        """
+        Re-imports previously opened self._file in (or out of) follow mode
+        """
+        self._follow_timer.stop()
+        if not self._file:
+            return
+        self._ready = False
+        self.file_refresh()
+        if checked and self._ready:
+            self._follow_timer.start()
+
+    @pyqtSlot()
+    def follow_update(self) -> None:
+        """
+        Appends new data of the followed log-file to the plot windows
+        """
+        if not self._ready:
+            return
+        try:
+            updated = self._plotter.update()
+        except OSError as err:
+            logging.error(err, exc_info=True)
+            self._follow_timer.stop()
+            return
+        if not updated:
+            return
+        plot_vars = set(self._plotter.plot_vars)
+        self._plot_items.add_items(
+            [x for x in self._plotter.plot_vars if x not in self._plot_items]
+        )
+        for title, plot_vars_list in self._followed_windows.items():
+            self._plot_windows[title].append_data(
+                [self._plotter.new_samples(x) for x in plot_vars_list
+                 if x in plot_vars]
+            )
+
     @pyqtSlot()
     def about_dialog_open(self) -> None:
         """
@@ -458,6 +648,8 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
         if dialog.exec() == QDialog.DialogCode.Accepted:
             ret = dialog.get_settings()
             mode_changed = self._settings["mode"] != ret.mode
+            db_changed = \
+                self._settings["j1939_dump"]["db"] != ret.j1939_dump.databases
             self._settings["mode"] = ret.mode
             self._settings["plot"]["style"] = ret.appearance.plotstyle
             self._settings["plot"]["linestyle"] = ret.appearance.linestyle
@@ -484,8 +676,29 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
             if mode_changed and self._ready:
                 self.file_close()
             else:
+                if db_changed and self._ready and \
+                        isinstance(self._plotter, J1939DumpPlotter):
+                    self.__redecode()
                 self.__update()
 
+    def __redecode(self) -> None:
+        """
+        Decodes the opened J1939 logs with the current databases from the
+        kept raw frames. The logs are imported again if the raw frames
+        aren't kept.
+        """
+        try:
+            self._plotter.redecode(self._settings["j1939_dump"]["db"])
+            logging.info("Decoded with the new databases: %s",
+                         ", ".join(self._files))
+        except PlotterPlotError as err:
+            logging.info("Importing again with the new databases: %s", err)
+            self._ready = False
+            self.file_refresh()
+        except PlotterInitError as err:
+            logging.error(err, exc_info=True)
+            QMessageBox.critical(None, "Critical error", str(err))
+
     @pyqtSlot()
     def plot(self) -> None:
         """
@@ -519,6 +732,10 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
                 self._plot_windows[title].closed.connect(
                     self.del_plot_window
                 )
+                if not spectrum:
+                    self._followed_windows[title] = pwin.signals
+                else:
+                    self._followed_windows.pop(title, None)
 
                 # Add action to Window menu
                 if not title in self._plot_windows_actions:
@@ -543,6 +760,7 @@ class MainWindow(QMainWindow): # pylint: disable=too-many-instance-attributes
             self._ui.menuWindow.removeAction(self._plot_windows_actions[title])
             del self._plot_windows_actions[title]
             del self._plot_windows[title]
+            self._followed_windows.pop(title, None)
         if len(self._plot_windows) == 0:
             self._ui.actionCloseAll.setEnabled(False)
 
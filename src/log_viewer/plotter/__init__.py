@@ -1,7 +1,31 @@
+from .accumulator import ColumnAccumulator, GrowableArray, \
+                          PayloadAccumulator
+from .csv_readers import CSV_ENGINES, LimitedReader, read_csv_chunks
+from .derived_signals import DerivedExpression, DerivedSignals, \
+                             align_samples, compile_derived_signals
+from .dtypes import column_dtype, fits_ns_timestamps, from_ns_timestamps, \
+                    signal_dtype, to_ns_timestamps
 from .exceptions import PlotterInvalidData, PlotterInitError, \
                         PlotterPlotError
-from .plotter import BasePlotter, LogOpenProgress, SimpleCsvPlotter, \
-                     J1939DumpPlotter
+from .j1939_decoder import J1939Decoder, J1939DecodePlan, J1939FrameGroups, \
+                            J1939ImportFilter, J1939LogStream, \
+                            J1939RawFrames, changed_frame_ids, load_j1939_database, \
+                            merge_timestamps
+from .j1939_transport import J1939TransportReassembler
+from .log_cache import LogCache
+from .log_index import LogIndex, build_log_index, join_chunks, \
+                       load_log_index
+from .log_parsers import FrameBlock, LogTail, iter_frame_blocks, \
+                         iter_message_blocks, open_log_tail
+from .log_readers import LogChunk, open_log_reader, read_log_chunk, split_log
+from .parallel import ParallelJ1939Import
+from .pipeline import ImportPipeline
+from .raw_frames import RawFrameStore, raw_frame_dtype
+from .plotter import BasePlotter, LogOpenProgress, J1939DumpPlotter
+from .csv_plotter import SimpleCsvPlotter
 from .plotter_utils import prepare_merged_plot, get_plot_minmax, get_plot_rms
 from .plot_window import PlotWindow, PlotProperty, PlotProperties, \
                          PlotPropertiesHeader
+from .signal_samples import SignalSamples
+from .signal_decoder import decode_message, decode_message_signal, \
+                            decode_signal
@@ -0,0 +1,173 @@
+""" Plotter data accumulators module """
+
+import array
+
+import numpy as np
+
+class GrowableArray:
+    """
+    Typed one-dimensional array with amortized O(1) appending
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, dtype: np.dtype = np.float64) -> None:
+        """
+        Constructs an empty array of 'dtype' items
+        """
+        self._data = np.empty(self.INITIAL_CAPACITY, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value) -> None:
+        """
+        Appends a single 'value' to the end of the array
+        """
+        if self._size == self._data.size:
+            self.reserve(self._size * 2)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        """
+        Appends all items of 'values' to the end of the array
+        """
+        size = self._size + len(values)
+        if size > self._data.size:
+            self.reserve(max(size, self._data.size * 2))
+        self._data[self._size:size] = values
+        self._size = size
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Makes room for at least 'capacity' items without further reallocation
+        """
+        if capacity > self._data.size:
+            data = np.empty(capacity, dtype=self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+    @property
+    def data(self) -> np.ndarray:
+        """
+        Returns a view of the filled part of the array
+        """
+        return self._data[:self._size]
+
+class PayloadAccumulator:
+    """
+    Accumulates raw frame payloads of a fixed width into a contiguous buffer
+    """
+
+    def __init__(self, width: int) -> None:
+        """
+        Constructs an empty accumulator of 'width' bytes long payloads.
+        Shorter payloads are padded with zeros, longer ones are truncated.
+        """
+        self._width = width
+        self._rows = GrowableArray(np.int64)
+        # Transport protocol messages are up to 1785 bytes long
+        self._lengths = array.array("H")
+        self._payloads = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def append(self, row: int, data: bytes) -> None:
+        """
+        Appends payload 'data' of the frame placed in 'row' row
+        """
+        self._rows.append(row)
+        self._lengths.append(len(data))
+        if len(data) >= self._width:
+            self._payloads += data[:self._width]
+        else:
+            self._payloads += data
+            self._payloads += bytes(self._width - len(data))
+
+    def extend(self,
+               rows: np.ndarray,
+               lengths: np.ndarray,
+               payloads: np.ndarray) -> None:
+        """
+        Appends frames given as arrays of 'rows', actual data 'lengths' and 2D
+        'payloads' (padded with zeros or truncated to the accumulator width)
+        """
+        if payloads.shape[1] > self._width:
+            payloads = payloads[:, :self._width]
+        elif payloads.shape[1] < self._width:
+            payloads = np.pad(payloads,
+                              ((0, 0), (0, self._width - payloads.shape[1])))
+        self._rows.extend(rows)
+        self._lengths.frombytes(lengths.astype(np.uint16).tobytes())
+        self._payloads += np.ascontiguousarray(payloads, np.uint8).tobytes()
+
+    @property
+    def rows(self) -> np.ndarray:
+        """
+        Returns row numbers of the accumulated frames
+        """
+        return self._rows.data
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """
+        Returns actual data lengths of the accumulated frames
+        """
+        return np.frombuffer(self._lengths, dtype=np.uint16)
+
+    @property
+    def payloads(self) -> np.ndarray:
+        """
+        Returns accumulated payloads as a 2D uint8 array (frame per row)
+        """
+        return np.frombuffer(self._payloads, dtype=np.uint8).reshape(
+            -1, self._width
+        )
+
+class ColumnAccumulator:
+    """
+    Accumulates the timestamp column of decoded rows (the signal columns are
+    decoded from the payloads referring to the row numbers on request)
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs an empty accumulator
+        """
+        self._timestamps = GrowableArray(np.float64)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def append_row(self, timestamp: float) -> int:
+        """
+        Appends a new row sampled at 'timestamp'. Returns the row number.
+        """
+        self._timestamps.append(timestamp)
+        return len(self._timestamps) - 1
+
+    def extend_rows(self, timestamps: np.ndarray) -> int:
+        """
+        Appends new rows sampled at 'timestamps'. Returns the number of the
+        first appended row.
+        """
+        first = len(self._timestamps)
+        self._timestamps.extend(timestamps)
+        return first
+
+    def reserve_rows(self, rows: int) -> None:
+        """
+        Makes room for at least 'rows' rows in total without further
+        reallocation
+        """
+        self._timestamps.reserve(rows)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """
+        Returns timestamps of the accumulated rows
+        """
+        return self._timestamps.data
@@ -0,0 +1,576 @@
+""" CSV plotter module """
+
+from dataclasses import dataclass
+import io
+import json
+import mmap
+import os
+import time
+from typing import Iterator, Optional
+
+import numpy
+import pandas as pd
+
+from .csv_readers import CSV_ENGINES, LimitedReader, read_csv_chunks
+from .dtypes import column_dtype, fits_ns_timestamps
+from .exceptions import PlotterInitError
+from .log_cache import LogCache
+from .plotter import BasePlotter, LogOpenProgress
+from .signal_samples import SignalSamples
+
+
+@dataclass
+class _CsvOptions:
+    """
+    Parsing settings of a CSV file. 'engine' is switched to "c" once the
+    pyarrow reader fails to parse the file.
+    """
+    delimiter: str
+    scales: dict[str, float]
+    follow: bool
+    compact: bool
+    engine: str
+
+
+class _ChunkedReader:
+    """
+    Chunked reading of a CSV file: the columns of the read chunks are kept
+    as lists of arrays until the end of file. In follow mode only complete
+    lines are read, 'offset' is the end of the read ones and 'header' is
+    the header line of the file.
+    """
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.offset = 0
+        self.header = b""
+        self._source = None
+        self._size = 0
+        self._reader = None
+        self._chunks = {}
+
+    @property
+    def progress(self) -> float:
+        """
+        Returns the read fraction of the file
+        """
+        if self._source is None or self._source.closed or self._size == 0:
+            return 0.0
+        return min(self._source.tell() / self._size, 1.0)
+
+    def start(self,
+              filename: os.PathLike[str],
+              options: _CsvOptions,
+              chunk_rows: int) -> None:
+        """
+        Opens the file to read it by chunks of 'chunk_rows' rows
+        """
+        # pylint: disable-next=consider-using-with
+        self._source = open(filename, "rb")
+        self._size = os.fstat(self._source.fileno()).st_size
+        if options.follow:
+            # Only complete lines are read, the rest is left for update()
+            self.header = self._source.readline()
+            self._source.seek(0)
+            self.offset = 0
+            if self._size > 0:
+                with mmap.mmap(self._source.fileno(), 0,
+                               access=mmap.ACCESS_READ) as data:
+                    self.offset = data.rfind(b"\n") + 1
+            self._source = LimitedReader(self._source, self.offset)
+            self._size = self.offset
+        self._chunks = {}
+        self.rows = 0
+        self._reader = read_csv_chunks(self._source, options.delimiter,
+                                       chunk_rows, options.engine)
+
+    def read(self) -> Optional[pd.DataFrame]:
+        """
+        Returns the next chunk of rows (None at the end of file)
+        """
+        return next(self._reader, None)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Appends the columns of chunk 'df' to the read ones
+        """
+        for var in df.columns:
+            self._chunks.setdefault(var, []).append(df[var].to_numpy())
+        self.rows += len(df)
+
+    def take_chunks(self) -> dict[str, list[numpy.ndarray]]:
+        """
+        Returns the read columns releasing them
+        """
+        chunks, self._chunks = self._chunks, {}
+        return chunks
+
+    def close(self) -> None:
+        """
+        Closes the file
+        """
+        self._reader = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+
+# pylint: disable-next=too-few-public-methods
+class _LazyColumns:
+    """
+    Columns of a file read on the first request of their samples (lazy
+    mode). The timestamps and their sort order are read along with the
+    first column and kept.
+    """
+
+    def __init__(self, cached: int) -> None:
+        """
+        Up to 'cached' recently requested columns are kept in memory
+        """
+        self.cached = cached
+        self.header = []
+        self.columns = []
+        self.timestamps = None
+        self.order = None
+
+    def reset(self, header: list[str], timestamp: str) -> None:
+        """
+        Sets the 'header' columns of the file with 'timestamp' column
+        """
+        self.header = header
+        self.columns = [x for x in header if x != timestamp]
+        self.timestamps = None
+        self.order = None
+
+
+class _CacheEntry:
+    """
+    Entry of the signals of a file in the log cache
+    """
+
+    def __init__(self, cache: LogCache) -> None:
+        self._cache = cache
+        self._key = None
+
+    def load(self,
+             paths: list[os.PathLike[str]],
+             params: list) -> Optional[dict[str, numpy.ndarray]]:
+        """
+        Memory-maps the arrays stored with the key of the files 'paths' read
+        with the settings 'params' (see LogCache.make_key()). Returns None
+        if there is no entry.
+        """
+        self._key = LogCache.make_key(paths, params)
+        return self._cache.load(self._key, mmap=True)
+
+    def store(self, arrays: dict[str, numpy.ndarray]) -> None:
+        """
+        Stores 'arrays' with the key of the last load()
+        """
+        if self._key is not None:
+            self._cache.store(self._key, arrays)
+
+
+class SimpleCsvPlotter(BasePlotter):
+    """
+    Plotter to plot CSV data
+    """
+
+    # Rows parsed at once while opening
+    CHUNK_ROWS = 100000
+
+    # Columns kept in memory in lazy mode
+    CACHE_COLUMNS = 32
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(self,
+                 filename: os.PathLike[str],
+                 delimiter: str,
+                 timestamp: str,
+                 scales: dict[str, float],
+                 follow: bool = False,
+                 compact: bool = False,
+                 engine: str = "c",
+                 lazy: bool = False,
+                 cache_columns: int = CACHE_COLUMNS,
+                 cache: Optional[LogCache] = None,
+                 derived: Optional[dict[str, str]] = None) -> None:
+        """
+        In 'follow' mode a trailing line without a line break is considered
+        incomplete and is read by update() once it's completed. In 'compact'
+        mode the values of every column are stored in the narrowest dtype
+        which holds them and float timestamps are stored as int64
+        nanoseconds. The file is parsed while opening by 'engine' (see
+        read_csv_chunks()): if the pyarrow reader fails to parse it, the
+        file is parsed by the pandas C parser from the beginning. In 'lazy'
+        mode only the header is read while opening, a column is read on the
+        first request of its samples and up to 'cache_columns' recently
+        requested columns are kept in memory (not in 'follow' mode). The
+        signals of a file read at once are stored to 'cache' if given and
+        are memory-mapped from it by the next openings of the same file
+        with the same settings (except for 'follow' mode). 'derived' maps
+        names of derived signals to their expressions (see BasePlotter).
+        """
+        super().__init__(filename, derived, timestamp)
+
+        if not delimiter or not timestamp or engine not in CSV_ENGINES:
+            raise PlotterInitError
+
+        if lazy and (follow or cache_columns < 1):
+            raise PlotterInitError
+
+        self._options = _CsvOptions(delimiter, scales, follow, compact, engine)
+        self._ns_timestamps = False
+        self._lazy = _LazyColumns(cache_columns) if lazy else None
+        self._cache = _CacheEntry(cache) if cache is not None else None
+        self._reader = _ChunkedReader()
+        self._open_progress = LogOpenProgress.OPEN_NOT_STARTED
+
+    @property
+    def _log_vars(self) -> list[str]:
+        """
+        Returns a list of the columns of the opened file
+        """
+        if self._lazy is not None:
+            return list(self._lazy.columns)
+        return super()._log_vars
+
+    @property
+    def processed(self) -> int:
+        """
+        Returns a number of currently processed rows while opening
+        """
+        return self._reader.rows
+
+    @property
+    def progress(self) -> Optional[float]:
+        """
+        Returns the read fraction of the file while opening
+        """
+        if self._opened:
+            return 1.0
+        return self._reader.progress
+
+    def __prepare(self, df: pd.DataFrame, first_row: int) -> pd.DataFrame:
+        """
+        Adds the timestamp column (row numbers starting from 'first_row') if
+        there is no one and applies scales to the columns of 'df'
+        """
+        columns = list(df.columns)
+        if self._timestamp not in columns:
+            df[self._timestamp] = range(first_row, first_row + len(df))
+
+        # Apply scales
+        for var, scale in self._options.scales.items():
+            if var in columns:
+                df[var] = df[var] * scale
+        return df
+
+    def __store(self, df: pd.DataFrame) -> None:
+        """
+        Appends the sampled values of every column of 'df' to the samples
+        of the corresponding signal
+        """
+        self.__store_columns(df[self._timestamp].to_numpy(),
+                             ((var, df[var].to_numpy()) for var in df.columns
+                              if var != self._timestamp))
+        self._reader.rows += len(df)
+
+    def __samples(self,
+                  timestamps: numpy.ndarray,
+                  values: numpy.ndarray) -> SignalSamples:
+        """
+        Returns the sampled 'values' with given 'timestamps'
+        """
+        sampled = pd.notna(values)
+        samples = SignalSamples(timestamps[sampled], values[sampled])
+        if self._options.compact:
+            samples = samples.compact(column_dtype(samples.values),
+                                      self._ns_timestamps)
+        return samples
+
+    def __store_columns(self,
+                        timestamps: numpy.ndarray,
+                        columns: Iterator[tuple[str, numpy.ndarray]]) -> None:
+        """
+        Appends the sampled values of (var, values) 'columns' with given
+        'timestamps' to the samples of the corresponding signals
+        """
+        for var, values in columns:
+            samples = self.__samples(timestamps, values)
+            if var in self._signals:
+                old = self._signals[var]
+                self._update_starts[var] = len(old)
+                samples = SignalSamples(
+                    numpy.concatenate([old.timestamps, samples.timestamps]),
+                    numpy.concatenate([old.values, samples.values]),
+                    samples.ns_timestamps
+                )
+            self._signals[var] = samples
+
+    def __read_columns(self, usecols: list[str]) -> pd.DataFrame:
+        """
+        Reads 'usecols' columns of the file (the pyarrow reader skips
+        conversion of the other ones)
+        """
+        options = self._options
+        with open(self._filename, "rb") as csv_file:
+            try:
+                chunks = list(read_csv_chunks(csv_file, options.delimiter,
+                                              self.CHUNK_ROWS, options.engine,
+                                              usecols))
+            except ValueError:
+                if options.engine == "c":
+                    raise
+                options.engine = "c"
+                csv_file.seek(0)
+                chunks = list(read_csv_chunks(csv_file, options.delimiter,
+                                              self.CHUNK_ROWS, options.engine,
+                                              usecols))
+        if not chunks:
+            return pd.DataFrame(columns=usecols)
+        return pd.concat(chunks, ignore_index=True)
+
+    def __load_column(self, var: str) -> SignalSamples:
+        """
+        Reads the samples of column 'var' (lazy mode). The timestamps and
+        their sort order are read along with the first column and kept.
+        """
+        lazy = self._lazy
+        usecols = [var]
+        if lazy.timestamps is None and self._timestamp in lazy.header:
+            usecols.append(self._timestamp)
+        df = self.__prepare(self.__read_columns(usecols), 0)
+        if lazy.timestamps is None:
+            timestamps = df[self._timestamp].to_numpy()
+            if len(timestamps) > 1 and \
+                    not numpy.all(timestamps[1:] >= timestamps[:-1]):
+                lazy.order = numpy.argsort(timestamps, kind="stable")
+                timestamps = timestamps[lazy.order]
+            self._ns_timestamps = self._options.compact and \
+                fits_ns_timestamps(timestamps)
+            lazy.timestamps = timestamps
+        values = df[var].to_numpy()
+        if lazy.order is not None:
+            values = values[lazy.order]
+        return self.__samples(lazy.timestamps, values)
+
+    def _signal(self, var: str) -> SignalSamples:
+        """
+        Returns the samples of signal 'var' reading its column in lazy mode
+        (see __init__())
+        """
+        if self._lazy is None:
+            return self._signals[var]
+        if var not in self._lazy.columns:
+            raise KeyError(var)
+        try:
+            samples = self._signals.pop(var)
+        except KeyError:
+            samples = self.__load_column(var)
+            while len(self._signals) >= self._lazy.cached:
+                del self._signals[next(iter(self._signals))]
+        # Recently requested columns are kept at the end
+        self._signals[var] = samples
+        return samples
+
+    def __open_header(self) -> None:
+        """
+        Reads the columns of the file (lazy mode)
+        """
+        self._lazy.reset(list(pd.read_csv(
+            self._filename, delimiter=self._options.delimiter, nrows=0
+        ).columns), self._timestamp)
+        self._signals.clear()
+        self._set_opened()
+        self._open_progress = LogOpenProgress.OPEN_COMPLETED
+
+    def __start_open(self) -> None:
+        """
+        Prepares the chunked reading of the file
+        """
+        self._signals.clear()
+        self._reader.start(self._filename, self._options, self.CHUNK_ROWS)
+
+    def __read_chunk(self) -> bool:
+        """
+        Reads the next chunk of rows and appends its columns to the read
+        ones. Returns False at the end of file.
+        """
+        try:
+            df = self._reader.read()
+        except ValueError:
+            if self._options.engine == "c":
+                raise
+            # Column types inferred by pyarrow from the first block don't
+            # fit the file: fall back to the pandas C parser
+            self._reader.close()
+            self._options.engine = "c"
+            self.__start_open()
+            df = self._reader.read()
+        if df is None:
+            return False
+        self._reader.append(self.__prepare(df, self._reader.rows))
+        return True
+
+    def __finish_open(self) -> None:
+        """
+        Joins the read chunks into the signals sorted by timestamps. The
+        chunks are released column by column.
+        """
+        self._reader.close()
+        chunks = self._reader.take_chunks()
+        timestamps = numpy.concatenate(chunks.pop(self._timestamp, [[]]))
+        order = None
+        if len(timestamps) > 1 and \
+                not numpy.all(timestamps[1:] >= timestamps[:-1]):
+            order = numpy.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+        self._ns_timestamps = self._options.compact and \
+            fits_ns_timestamps(timestamps)
+
+        def columns() -> Iterator[tuple[str, numpy.ndarray]]:
+            for var in list(chunks):
+                values = numpy.concatenate(chunks.pop(var))
+                yield var, values if order is None else values[order]
+
+        self.__store_columns(timestamps, columns())
+        self._set_opened()
+        self._open_progress = LogOpenProgress.OPEN_COMPLETED
+        if self._cache is not None and not self._options.follow:
+            self.__store_cache()
+
+    def __store_cache(self) -> None:
+        """
+        Stores the signals to the cache. Timestamps of the signals sampled
+        in every row are stored once. Files with non-numeric columns aren't
+        cached.
+        """
+        arrays = {"timestamps": numpy.empty(0)}
+        index = []
+        for i, (var, samples) in enumerate(self._signals.items()):
+            if samples.values.dtype.hasobject:
+                return
+            arrays[f"values{i}"] = samples.values
+            own_timestamps = len(samples) != self._reader.rows
+            if own_timestamps:
+                arrays[f"timestamps{i}"] = samples.timestamps
+            else:
+                arrays["timestamps"] = samples.timestamps
+            index.append([var, own_timestamps])
+        arrays["signals"] = numpy.array(json.dumps(index))
+        arrays["ns_timestamps"] = numpy.array(self._ns_timestamps)
+        arrays["rows"] = numpy.array(self._reader.rows)
+        self._cache.store(arrays)
+
+    def __open_cached(self) -> bool:
+        """
+        Memory-maps the signals stored to the cache. Returns False if there
+        is no entry.
+        """
+        options = self._options
+        arrays = self._cache.load(
+            [self._filename],
+            ["simple_csv", options.delimiter, self._timestamp,
+             sorted(options.scales.items()), options.compact]
+        )
+        if arrays is None:
+            return False
+        try:
+            index = json.loads(str(arrays["signals"]))
+            self._ns_timestamps = bool(arrays["ns_timestamps"])
+            # Plain array views of the mapped buffers are used by pandas
+            arrays = {name: array.view(numpy.ndarray)
+                      for name, array in arrays.items()}
+            self._signals.update({
+                var: SignalSamples(
+                    arrays[f"timestamps{i}" if own_timestamps
+                           else "timestamps"],
+                    arrays[f"values{i}"],
+                    self._ns_timestamps
+                )
+                for i, (var, own_timestamps) in enumerate(index)
+            })
+            self._reader.rows = int(arrays["rows"])
+        except (KeyError, ValueError):
+            self._signals.clear()
+            return False
+        # All columns are mapped, so they aren't read in lazy mode
+        self._lazy = None
+        self._set_opened()
+        self._open_progress = LogOpenProgress.OPEN_COMPLETED
+        return True
+
+    def open(self,
+             max_rows: Optional[int] = None,
+             time_budget: Optional[float] = None) -> LogOpenProgress:
+        """
+        Performs an opening step. A single step reads chunks of rows (see
+        CHUNK_ROWS) until 'max_rows' rows are read or 'time_budget' (in
+        seconds) is exceeded if given, otherwise the whole file is read at
+        once. The columns of the chunks are joined and sorted by timestamps
+        at the end of file. In lazy mode only the header is read. Cached
+        signals are mapped within a single step.
+        """
+        if self._open_progress == LogOpenProgress.OPEN_COMPLETED:
+            return self._open_progress
+        if self._open_progress == LogOpenProgress.OPEN_NOT_STARTED and \
+                self._cache is not None and not self._options.follow and \
+                self.__open_cached():
+            return self._open_progress
+        if self._lazy is not None:
+            self.__open_header()
+            return self._open_progress
+        if self._open_progress == LogOpenProgress.OPEN_NOT_STARTED:
+            self.__start_open()
+            self._open_progress = LogOpenProgress.OPEN_IN_PROGRESS
+
+        deadline = None
+        if time_budget is not None:
+            deadline = time.monotonic() + time_budget
+        first_row = self._reader.rows
+        try:
+            while max_rows is None or self._reader.rows - first_row < max_rows:
+                if not self.__read_chunk():
+                    self.__finish_open()
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        except Exception:
+            self.cancel_open()
+            raise
+        return self._open_progress
+
+    def cancel_open(self) -> None:
+        """
+        Aborts the opening process in progress
+        """
+        self._reader.close()
+        self._reader.take_chunks()
+        if self._open_progress == LogOpenProgress.OPEN_IN_PROGRESS:
+            self._signals.clear()
+            self._reader.rows = 0
+            self._open_progress = LogOpenProgress.OPEN_NOT_STARTED
+
+    def update(self) -> bool:
+        """
+        Reads rows appended to the file since the opening or the previous
+        update (follow mode only). The rows are expected to be appended in
+        the timestamp order.
+        """
+        self._start_update()
+        if not self._opened or not self._options.follow:
+            return False
+        with open(self._filename, "rb") as csv_file:
+            csv_file.seek(self._reader.offset)
+            data = csv_file.read()
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return False
+        self._reader.offset += end
+        df = pd.read_csv(io.BytesIO(self._reader.header + data[:end]),
+                         delimiter=self._options.delimiter)
+        if df.empty:
+            return False
+        self.__store(self.__prepare(df, self._reader.rows))
+        return True
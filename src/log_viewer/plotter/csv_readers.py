@@ -0,0 +1,93 @@
+""" CSV files readers module """
+
+import io
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as arrow_csv
+
+# CSV parsing engines: the single-threaded pandas C parser and the
+# multi-threaded pyarrow reader
+CSV_ENGINES = ("c", "pyarrow")
+
+# Size of the blocks parsed by the pyarrow reader at once (bytes)
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+class LimitedReader(io.RawIOBase):
+    """
+    Binary file 'source' read from its current position up to the 'end'
+    offset (e.g. the complete lines of a growing file). The source is
+    closed along with the reader.
+    """
+
+    def __init__(self, source: BinaryIO, end: int) -> None:
+        super().__init__()
+        self._source = source
+        self._end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._end - self._source.tell())
+        if size <= 0:
+            return 0
+        return self._source.readinto(memoryview(buffer)[:size])
+
+    def tell(self) -> int:
+        return self._source.tell()
+
+    def close(self) -> None:
+        self._source.close()
+        super().close()
+
+def _arrow_values(column) -> np.ndarray:
+    """
+    Returns the values of an Arrow 'column' as a NumPy array. Numeric
+    columns without nulls are not copied, nulls of other numeric columns
+    are converted to NaN.
+    """
+    if pa.types.is_null(column.type):
+        return np.full(len(column), np.nan)
+    return column.to_numpy(zero_copy_only=False)
+
+def _read_arrow_chunks(source: BinaryIO,
+                       delimiter: str,
+                       usecols: Optional[list[str]]) -> Iterator[pd.DataFrame]:
+    """
+    Parses CSV 'source' with the pyarrow streaming reader using all CPU
+    cores. Yields a DataFrame per parsed block.
+    """
+    reader = arrow_csv.open_csv(
+        source,
+        read_options=arrow_csv.ReadOptions(use_threads=True,
+                                           block_size=ARROW_BLOCK_SIZE),
+        parse_options=arrow_csv.ParseOptions(delimiter=delimiter),
+        convert_options=arrow_csv.ConvertOptions(include_columns=usecols)
+    )
+    for batch in reader:
+        yield pd.DataFrame({
+            name: _arrow_values(column)
+            for name, column in zip(batch.schema.names, batch.columns)
+        }, copy=False)
+
+def read_csv_chunks(source: BinaryIO,
+                    delimiter: str,
+                    chunk_rows: int,
+                    engine: str = "c",
+                    usecols: Optional[list[str]] = None) \
+                    -> Iterator[pd.DataFrame]:
+    """
+    Returns an iterator over the chunks of CSV 'source' parsed by 'engine'
+    (see CSV_ENGINES). Only 'usecols' columns are converted if given. The
+    pandas C parser yields chunks of 'chunk_rows' rows, the pyarrow reader
+    yields blocks of ARROW_BLOCK_SIZE bytes. The pyarrow reader infers the
+    column types from the first block, so a later block which doesn't fit
+    them raises ValueError (pyarrow.ArrowInvalid).
+    """
+    if engine == "pyarrow":
+        return _read_arrow_chunks(source, delimiter, usecols)
+    return iter(pd.read_csv(source, delimiter=delimiter, usecols=usecols,
+                            chunksize=chunk_rows))
@@ -0,0 +1,369 @@
+""" Derived signals module """
+
+import ast
+from typing import Callable, Iterator
+
+import numpy as np
+
+from .signal_samples import SignalSamples
+
+def _integers(values: np.ndarray) -> np.ndarray:
+    """
+    Returns 'values' as integers (float values are truncated)
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "biu":
+        return values
+    return values.astype(np.int64)
+
+def _bitwise(operation: Callable) -> Callable:
+    """
+    Returns the bitwise 'operation' applied to the operands converted to
+    integers
+    """
+    return lambda x, y: operation(_integers(x), _integers(y))
+
+def _bits(values: np.ndarray, start: int, length: int) -> np.ndarray:
+    """
+    Returns 'length' bits of 'values' starting from the bit 'start'
+    """
+    return (_integers(values) >> int(start)) & ((1 << int(length)) - 1)
+
+_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+    ast.BitAnd: _bitwise(np.bitwise_and),
+    ast.BitOr: _bitwise(np.bitwise_or),
+    ast.BitXor: _bitwise(np.bitwise_xor),
+    ast.LShift: _bitwise(np.left_shift),
+    ast.RShift: _bitwise(np.right_shift)
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: np.positive,
+    ast.USub: np.negative,
+    ast.Invert: lambda x: np.invert(_integers(x)),
+    ast.Not: np.logical_not
+}
+
+_COMPARISONS = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal
+}
+
+_BOOL_OPERATORS = {
+    ast.And: np.logical_and,
+    ast.Or: np.logical_or
+}
+
+# Functions available in expressions: name -> (function, number of arguments)
+FUNCTIONS = {
+    "abs": (np.abs, 1),
+    "sqrt": (np.sqrt, 1),
+    "exp": (np.exp, 1),
+    "log": (np.log, 1),
+    "log10": (np.log10, 1),
+    "sin": (np.sin, 1),
+    "cos": (np.cos, 1),
+    "tan": (np.tan, 1),
+    "floor": (np.floor, 1),
+    "ceil": (np.ceil, 1),
+    "round": (np.round, 1),
+    "min": (np.minimum, 2),
+    "max": (np.maximum, 2),
+    "clip": (np.clip, 3),
+    "where": (np.where, 3),
+    "bits": (_bits, 3)
+}
+
+class DerivedExpression:
+    """
+    Expression of a derived signal compiled once to a tree of NumPy
+    operations over whole sample arrays. Expressions consist of numbers,
+    signal names, arithmetic, bitwise, comparison and boolean operators,
+    conditional expressions ('a if condition else b') and FUNCTIONS
+    calls. Dotted signal names (e.g. EEC1.EngSpeed) are written as is,
+    other ones are referred as signal("name").
+    """
+
+    def __init__(self, expression: str) -> None:
+        """
+        Compiles 'expression'. Raises ValueError if it's invalid or refers
+        to no signals.
+        """
+        self._expression = expression
+        self._inputs = []
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as err:
+            raise ValueError(
+                f"Invalid expression {expression!r}: {err.msg}"
+            ) from err
+        self._evaluate = self.__compile(tree.body)
+        if not self._inputs:
+            raise ValueError(f"Expression {expression!r} refers to no signals")
+
+    def __repr__(self) -> str:
+        return f"DerivedExpression({self._expression!r})"
+
+    @property
+    def inputs(self) -> list[str]:
+        """
+        Returns the names of the signals referred by the expression
+        """
+        return self._inputs
+
+    def __input(self, name: str) -> Callable:
+        """
+        Returns the getter of the input signal 'name'
+        """
+        if name not in self._inputs:
+            self._inputs.append(name)
+        return lambda values: values[name]
+
+    @staticmethod
+    def __dotted_name(node: ast.AST) -> str:
+        """
+        Returns the dotted name of an attribute chain 'node'
+        """
+        if isinstance(node, ast.Attribute):
+            return f"{DerivedExpression.__dotted_name(node.value)}.{node.attr}"
+        if isinstance(node, ast.Name):
+            return node.id
+        raise ValueError(f"Unsupported signal name: {ast.dump(node)}")
+
+    # pylint: disable-next=too-many-return-statements
+    def __compile(self, node: ast.AST) -> Callable:
+        """
+        Returns the function evaluating 'node' from a dict of input values
+        """
+        if isinstance(node, ast.Constant) and \
+                isinstance(node.value, (bool, int, float)):
+            value = node.value
+            return lambda values: value
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            return self.__input(self.__dotted_name(node))
+        if isinstance(node, ast.BinOp) and \
+                type(node.op) in _BINARY_OPERATORS:
+            operation = _BINARY_OPERATORS[type(node.op)]
+            left = self.__compile(node.left)
+            right = self.__compile(node.right)
+            return lambda values: operation(left(values), right(values))
+        if isinstance(node, ast.UnaryOp) and \
+                type(node.op) in _UNARY_OPERATORS:
+            operation = _UNARY_OPERATORS[type(node.op)]
+            operand = self.__compile(node.operand)
+            return lambda values: operation(operand(values))
+        if isinstance(node, ast.BoolOp):
+            operation = _BOOL_OPERATORS[type(node.op)]
+            operands = [self.__compile(x) for x in node.values]
+            def bool_operation(values):
+                result = operands[0](values)
+                for operand in operands[1:]:
+                    result = operation(result, operand(values))
+                return result
+            return bool_operation
+        if isinstance(node, ast.Compare):
+            return self.__compile_compare(node)
+        if isinstance(node, ast.IfExp):
+            test = self.__compile(node.test)
+            body = self.__compile(node.body)
+            orelse = self.__compile(node.orelse)
+            return lambda values: np.where(test(values), body(values),
+                                           orelse(values))
+        if isinstance(node, ast.Call):
+            return self.__compile_call(node)
+        raise ValueError(
+            f"Unsupported syntax in {self._expression!r}: "
+            f"{type(node).__name__}"
+        )
+
+    def __compile_compare(self, node: ast.Compare) -> Callable:
+        """
+        Returns the function evaluating a (chained) comparison 'node'
+        """
+        if not all(type(x) in _COMPARISONS for x in node.ops):
+            raise ValueError(f"Unsupported comparison in {self._expression!r}")
+        operations = [_COMPARISONS[type(x)] for x in node.ops]
+        operands = [self.__compile(x)
+                    for x in [node.left] + list(node.comparators)]
+        def compare(values):
+            left = operands[0](values)
+            result = True
+            for operation, operand in zip(operations, operands[1:]):
+                right = operand(values)
+                result = np.logical_and(result, operation(left, right))
+                left = right
+            return result
+        return compare
+
+    def __compile_call(self, node: ast.Call) -> Callable:
+        """
+        Returns the function evaluating a function call 'node'
+        """
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ValueError(f"Unsupported call in {self._expression!r}")
+        name = node.func.id
+        if name == "signal":
+            if len(node.args) != 1 or \
+                    not isinstance(node.args[0], ast.Constant) or \
+                    not isinstance(node.args[0].value, str):
+                raise ValueError("signal() takes a single signal name string")
+            return self.__input(node.args[0].value)
+        if name not in FUNCTIONS:
+            raise ValueError(f"Unknown function {name}() in "
+                             f"{self._expression!r}")
+        function, args_count = FUNCTIONS[name]
+        if len(node.args) != args_count:
+            raise ValueError(f"{name}() takes {args_count} argument(s)")
+        args = [self.__compile(x) for x in node.args]
+        return lambda values: function(*[x(values) for x in args])
+
+    def evaluate(self, values: dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Returns the expression evaluated with the aligned 'values' of the
+        input signals
+        """
+        length = len(next(iter(values.values())))
+        with np.errstate(all="ignore"):
+            result = np.asarray(self._evaluate(values))
+        if result.shape != (length,):
+            result = np.broadcast_to(result, (length,))
+        return result
+
+def compile_derived_signals(
+        expressions: dict[str, str]) -> dict[str, DerivedExpression]:
+    """
+    Compiles the expressions of derived signals (name -> expression).
+    Expressions may refer to other derived signals. Raises ValueError if an
+    expression is invalid or derived signals refer to each other in a cycle.
+    """
+    compiled = {name: DerivedExpression(expression)
+                for name, expression in expressions.items()}
+    checked = set()
+    def check(name: str, path: list[str]) -> None:
+        if name in path:
+            raise ValueError("Derived signals refer to each other: " +
+                             " -> ".join(path + [name]))
+        if name in checked or name not in compiled:
+            return
+        for input_name in compiled[name].inputs:
+            check(input_name, path + [name])
+        checked.add(name)
+    for name in compiled:
+        check(name, [])
+    return compiled
+
+def align_samples(
+        samples: list[tuple[np.ndarray, np.ndarray]]) \
+        -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    Aligns (timestamps, values) 'samples' of several signals to a common
+    time grid. Signals sampled at the same timestamps are returned as is.
+    Otherwise the grid is the union of all timestamps starting from the
+    first sample of the latest starting signal and every signal holds its
+    last value until its next sample. Returns (grid, aligned values).
+    """
+    grid = samples[0][0]
+    if all(len(x) == len(grid) and (x is grid or np.array_equal(x, grid))
+           for x, _ in samples[1:]):
+        return grid, [x for _, x in samples]
+    if any(len(x) == 0 for x, _ in samples):
+        return np.empty(0), [np.empty(0, x.dtype) for _, x in samples]
+    start = max(x[0] for x, _ in samples)
+    grid = np.unique(np.concatenate([x for x, _ in samples]))
+    grid = grid[grid >= start]
+    return grid, [values[np.searchsorted(timestamps, grid, "right") - 1]
+                  for timestamps, values in samples]
+
+class DerivedSignals:
+    """
+    Derived signals of a log: the expressions compiled once (see
+    compile_derived_signals()) and the samples evaluated from the samples
+    of their inputs, which are kept until the inputs change
+    """
+
+    def __init__(self, expressions: dict[str, str]) -> None:
+        """
+        Compiles the 'expressions' of derived signals (name -> expression).
+        Raises ValueError if they are invalid.
+        """
+        self._expressions = compile_derived_signals(expressions)
+        self._samples = {}
+        self._starts = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._expressions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._expressions)
+
+    def inputs(self, name: str) -> list[str]:
+        """
+        Returns the names of the input signals of derived signal 'name'
+        """
+        return self._expressions[name].inputs
+
+    def available(self, log_vars: list[str]) -> list[str]:
+        """
+        Returns the derived signals whose inputs are either 'log_vars' or
+        other available derived signals in the order of their evaluation
+        """
+        available = set(log_vars)
+        derived_vars = []
+        pending = list(self._expressions)
+        # Derived signals may refer to each other in any order
+        while pending:
+            added = [x for x in pending
+                     if all(y in available for y in self.inputs(x))]
+            if not added:
+                break
+            derived_vars.extend(added)
+            available.update(added)
+            pending = [x for x in pending if x not in available]
+        return derived_vars
+
+    def evaluate(self, name: str, inputs: list[SignalSamples]) -> SignalSamples:
+        """
+        Returns the samples of derived signal 'name' evaluated from the
+        samples of its 'inputs'. The signal is evaluated again only if the
+        inputs are changed since the previous evaluation.
+        """
+        cached = self._samples.get(name)
+        if cached is not None and \
+                all(x is y for x, y in zip(cached[0], inputs)):
+            return cached[1]
+        expanded = [x.expand() for x in inputs]
+        timestamps, values = align_samples(
+            [(x.timestamps, x.values) for x in expanded]
+        )
+        expression = self._expressions[name]
+        samples = SignalSamples(timestamps, expression.evaluate(
+            dict(zip(expression.inputs, values))
+        ))
+        self._samples[name] = (inputs, samples)
+        return samples
+
+    def start_update(self) -> None:
+        """
+        Marks the samples evaluated so far as the ones preceding an update
+        of the log
+        """
+        self._starts = {name: len(samples)
+                        for name, (_, samples) in self._samples.items()}
+
+    def update_start(self, name: str) -> int:
+        """
+        Returns the number of the samples of derived signal 'name' preceding
+        the last update of the log
+        """
+        return self._starts.get(name, 0)
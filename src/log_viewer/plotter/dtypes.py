@@ -0,0 +1,88 @@
+""" Compact dtypes selection module """
+
+import cantools
+import numpy as np
+
+# Integer types in order of preference for compact values
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+# The largest timestamp stored as int64 nanoseconds
+_MAX_NS_TIMESTAMP = np.iinfo(np.int64).max / 1e9
+
+def _int_dtype(vmin: float, vmax: float) -> np.dtype:
+    """
+    Returns the narrowest integer dtype which holds values from 'vmin' to
+    'vmax'
+    """
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= vmin and vmax <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.float64)
+
+def signal_dtype(signal: cantools.database.can.Signal) -> np.dtype:
+    """
+    Returns the narrowest dtype which holds all physical values of the DBC
+    'signal' according to its length, scale and offset
+    """
+    if signal.is_float:
+        return np.dtype(np.float32 if signal.length <= 32 else np.float64)
+    if signal.is_signed:
+        raw_min, raw_max = -(1 << (signal.length - 1)), \
+                           (1 << (signal.length - 1)) - 1
+    else:
+        raw_min, raw_max = 0, (1 << signal.length) - 1
+    scale, offset = float(signal.scale), float(signal.offset)
+    if scale.is_integer() and offset.is_integer():
+        phys = (raw_min * scale + offset, raw_max * scale + offset)
+        vmin, vmax = min(phys), max(phys)
+        if vmin == 0 and vmax == 1:
+            return np.dtype(np.bool_)
+        return _int_dtype(vmin, vmax)
+    # float32 represents every raw value of up to 24 bits exactly
+    return np.dtype(np.float32 if signal.length <= 24 else np.float64)
+
+def column_dtype(values: np.ndarray) -> np.dtype:
+    """
+    Returns the narrowest dtype which holds all 'values' (without NaN) of a
+    column read from a CSV file. Non-numeric columns keep their dtype.
+    """
+    if values.dtype.kind not in "biuf" or len(values) == 0:
+        return values.dtype
+    if values.dtype.kind == "b":
+        return np.dtype(np.bool_)
+    vmin, vmax = values.min(), values.max()
+    integral = values.dtype.kind in "iu" or (
+        np.all(np.isfinite(values)) and np.all(values == np.round(values))
+    )
+    if integral:
+        if vmin >= 0 and vmax <= 1:
+            return np.dtype(np.bool_)
+        return _int_dtype(vmin, vmax)
+    # float32 is used if its rounding error is negligible in the value range
+    error = np.abs(values.astype(np.float32) - values).max()
+    if error <= 1e-6 * (vmax - vmin):
+        return np.dtype(np.float32)
+    return values.dtype
+
+def fits_ns_timestamps(timestamps: np.ndarray) -> bool:
+    """
+    Checks whether float 'timestamps' in seconds can be stored as int64
+    nanoseconds
+    """
+    return timestamps.dtype.kind == "f" and (
+        len(timestamps) == 0 or
+        np.nanmax(np.abs(timestamps)) < _MAX_NS_TIMESTAMP
+    )
+
+def to_ns_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Returns 'timestamps' in seconds as int64 nanoseconds
+    """
+    return np.round(timestamps * 1e9).astype(np.int64)
+
+def from_ns_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Returns int64 nanoseconds 'timestamps' as float64 seconds
+    """
+    return timestamps / 1e9
@@ -0,0 +1,852 @@
+""" J1939 frames decoder module """
+
+from dataclasses import dataclass
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import tempfile
+from typing import Iterator, Optional, Union
+
+import can
+import cantools
+import numpy as np
+
+from .accumulator import ColumnAccumulator, PayloadAccumulator
+from .j1939_transport import TP_CM_PDU_FORMAT, TP_DT_PDU_FORMAT, \
+                             J1939TransportReassembler
+from .log_parsers import FrameBlock
+from .raw_frames import RawFrameStore
+from .signal_decoder import decode_message_signal
+
+MASK_WO_SA = 0xffffff00
+
+# Rows taken from every timeline per step of the k-way merge
+MERGE_BLOCK_ROWS = 65536
+
+# Databases loaded in the current session by their cache keys
+_databases = {}
+
+# File and size of the secret key signing the pickled databases
+_SIGNING_KEY_FILE = "db.key"
+_SIGNING_KEY_SIZE = 32
+
+def _database_key(dbc_files: list[str]) -> str:
+    """
+    Returns a cache key of the database built from 'dbc_files' contents
+    """
+    digest = hashlib.sha256(cantools.__version__.encode())
+    for dbc_file_path in dbc_files:
+        with open(dbc_file_path, "rb") as dbc_file:
+            digest.update(hashlib.sha256(dbc_file.read()).digest())
+    return digest.hexdigest()
+
+def _signing_key(cache_dir: os.PathLike[str]) -> Optional[bytes]:
+    """
+    Returns the secret key of the databases pickled to 'cache_dir'. The key
+    is created on first use readable by the current user only. Returns None
+    if it can't be read or created, or it's accessible by other users.
+    """
+    path = os.path.join(cache_dir, _SIGNING_KEY_FILE)
+    try:
+        os.makedirs(cache_dir, 0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(path, "rb") as key_file:
+                if os.name == "posix" and \
+                        os.fstat(key_file.fileno()).st_mode & 0o077:
+                    return None
+                key = key_file.read()
+            return key if len(key) == _SIGNING_KEY_SIZE else None
+        key = os.urandom(_SIGNING_KEY_SIZE)
+        with os.fdopen(fd, "wb") as key_file:
+            key_file.write(key)
+        return key
+    except OSError:
+        return None
+
+def _signature(key: bytes, data: bytes) -> bytes:
+    """
+    Returns the HMAC of the pickled database 'data'
+    """
+    return hmac.new(key, data, hashlib.sha256).digest()
+
+def _read_database(path: str, key: bytes) -> Optional[cantools.db.Database]:
+    """
+    Returns the database pickled to 'path' (None if it can't be read or its
+    signature doesn't match 'key', so foreign files are never unpickled)
+    """
+    try:
+        with open(path, "rb") as db_file:
+            signature = db_file.read(hashlib.sha256().digest_size)
+            data = db_file.read()
+        if not hmac.compare_digest(signature, _signature(key, data)):
+            return None
+        db = pickle.loads(data)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+            ImportError):
+        return None
+    return db if isinstance(db, cantools.db.Database) else None
+
+def _write_database(path: str, db: cantools.db.Database, key: bytes) -> None:
+    """
+    Pickles 'db' signed with 'key' to 'path' (errors are ignored as the file
+    is a cache only)
+    """
+    data = pickle.dumps(db, pickle.HIGHEST_PROTOCOL)
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp",
+                                        dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as db_file:
+                db_file.write(_signature(key, data))
+                db_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+def load_j1939_database(dbc_files: list[str],
+                        cache_dir: Optional[os.PathLike[str]] = None) \
+                        -> cantools.db.Database:
+    """
+    Loads 'dbc_files' into a database which matches J1939 frame ids
+    regardless of the source address. The database is reused within the
+    session while the files contents remain the same and also saved to
+    'cache_dir' (if given) to be reused across sessions. Saved databases
+    are signed with a per-user secret key kept in 'cache_dir' and the ones
+    with a wrong signature are ignored.
+    """
+    key = _database_key(dbc_files)
+    path = None
+    signing_key = None
+    if cache_dir is not None:
+        signing_key = _signing_key(cache_dir)
+    if signing_key is not None:
+        path = os.path.join(cache_dir, "db-" + key + ".pickle")
+
+    db = _databases.get(key)
+    if db is not None:
+        if path is not None and not os.path.isfile(path):
+            _write_database(path, db, signing_key)
+        return db
+
+    if path is not None:
+        db = _read_database(path, signing_key)
+
+    if db is None:
+        db = cantools.db.Database(frame_id_mask=MASK_WO_SA)
+        for dbc_file_path in dbc_files:
+            db.add_dbc_file(dbc_file_path)
+        # pylint: disable-next=protected-access
+        for msg in db._messages:
+            msg._frame_id &= MASK_WO_SA
+        db.refresh()
+        if path is not None:
+            _write_database(path, db, signing_key)
+
+    _databases[key] = db
+    return db
+
+@dataclass(frozen=True)
+class J1939ImportFilter:
+    """
+    Allow/deny lists of J1939 frames parameters checked before decoding: a
+    sorted tuple of values per parameter in the PARAMS order. An empty allow
+    list allows all values. Destination address of PDU2 frames is 255
+    (global).
+    """
+    # Parameters of the frames in the order of the lists
+    PARAMS = ("pgn", "sa", "da", "channel")
+
+    allow: tuple[tuple, ...] = ((),) * len(PARAMS)
+    deny: tuple[tuple, ...] = ((),) * len(PARAMS)
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> Optional["J1939ImportFilter"]:
+        """
+        Constructs a filter from the "filter" settings section, e.g.
+        {"pgn": {"allow": [61444]}, "sa": {"deny": [0, 3]}}. Returns None if
+        the filter is empty.
+        """
+        def lists(kind: str) -> tuple[tuple, ...]:
+            return tuple(
+                tuple(sorted({str(x) if param == "channel" else x
+                              for x in settings.get(param, {}).get(kind, [])}))
+                for param in cls.PARAMS
+            )
+
+        import_filter = cls(lists("allow"), lists("deny"))
+        return import_filter if import_filter != cls() else None
+
+    def accepts(self,
+                channel: Optional[Union[int, str]],
+                arbitration_id: int) -> bool:
+        """
+        Checks whether frames with given 'channel' and 'arbitration_id'
+        should be imported
+        """
+        pdu_format = (arbitration_id >> 16) & 0xff
+        pgn = (arbitration_id >> 8) & 0x3ffff
+        if pdu_format < 240:
+            pgn &= 0x3ff00
+            da = (arbitration_id >> 8) & 0xff
+        else:
+            da = 0xff
+        sa = arbitration_id & 0xff
+        for value, allow, deny in zip((pgn, sa, da, str(channel)),
+                                      self.allow, self.deny):
+            if (allow and value not in allow) or value in deny:
+                return False
+        return True
+
+@dataclass(frozen=True)
+class J1939DecodePlan:
+    """ Resolved decoding data for a single J1939 frame id """
+    message: cantools.database.can.Message
+    data_key: str
+    columns: dict[str, str]
+
+@dataclass
+class J1939RawFrames:
+    """
+    Raw frames exported from J1939Decoder: timestamps of all decoded rows,
+    frames grouped by data key as (channel, arbitration_id, rows, lengths,
+    payloads), where the first two are taken from a frame of the group, and
+    the store of all frames read from the log if they are kept (see
+    J1939LogStream)
+    """
+    timestamps: np.ndarray
+    groups: dict[str, tuple]
+    raw: Optional[RawFrameStore] = None
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Returns the frames as a flat dict of arrays (e.g. to be saved with
+        numpy.savez())
+        """
+        arrays = {"timestamps": self.timestamps}
+        index = []
+        for i, (data_key, (channel, arbitration_id, rows, lengths,
+                           payloads)) in enumerate(self.groups.items()):
+            index.append([data_key, channel, arbitration_id])
+            arrays[f"rows{i}"] = rows
+            arrays[f"lengths{i}"] = lengths
+            arrays[f"payloads{i}"] = payloads
+        arrays["groups"] = np.array(json.dumps(index))
+        if self.raw is not None:
+            arrays.update(self.raw.to_arrays())
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "J1939RawFrames":
+        """
+        Constructs the frames from a dict of arrays returned by to_arrays()
+        """
+        groups = {}
+        for i, (data_key, channel, arbitration_id) in \
+                enumerate(json.loads(str(arrays["groups"]))):
+            groups[data_key] = (channel, arbitration_id, arrays[f"rows{i}"],
+                                arrays[f"lengths{i}"], arrays[f"payloads{i}"])
+        raw = None
+        if "raw_frames" in arrays:
+            raw = RawFrameStore.from_arrays(arrays)
+        return cls(arrays["timestamps"], groups, raw)
+
+    def subset(self, data_keys: list[str]) -> "J1939RawFrames":
+        """
+        Returns the groups of 'data_keys' with the timestamps of their rows
+        only (without the raw frames)
+        """
+        groups = {x: self.groups[x] for x in data_keys}
+        used = np.unique(np.concatenate(
+            [x[2] for x in groups.values()] or [np.empty(0, np.int64)]
+        ))
+        return J1939RawFrames(
+            self.timestamps[used],
+            {data_key: (channel, arbitration_id,
+                        np.searchsorted(used, rows), lengths, payloads)
+             for data_key, (channel, arbitration_id, rows, lengths,
+                            payloads) in groups.items()}
+        )
+
+@dataclass
+class J1939FrameGroups:
+    """
+    Frames of a block grouped by data key (see J1939Decoder.prepare_block()):
+    timestamps of the matched frames and groups as (plan, channel,
+    arbitration_id, rows, lengths, payloads), where rows are relative to
+    the first matched frame
+    """
+    timestamps: np.ndarray
+    groups: list[tuple]
+
+def _message_definition(message: cantools.database.can.Message) -> tuple:
+    """
+    Returns the message properties which affect decoding of its frames
+    """
+    return (message.name, message.length, tuple(
+        (sig.name, sig.start, sig.length, sig.byte_order, sig.is_signed,
+         sig.is_float, sig.scale, sig.offset, sig.minimum, sig.maximum,
+         sig.unit, repr(sig.choices), sig.is_multiplexer,
+         sig.multiplexer_ids, sig.multiplexer_signal)
+        for sig in message.signals
+    ))
+
+def changed_frame_ids(old_db: cantools.db.Database,
+                      new_db: cantools.db.Database) -> set[int]:
+    """
+    Returns frame ids of the messages which are defined differently in the
+    SA-masked databases 'old_db' and 'new_db' (including the messages
+    defined in one of them only)
+    """
+    old = {x.frame_id: _message_definition(x) for x in old_db.messages}
+    new = {x.frame_id: _message_definition(x) for x in new_db.messages}
+    return {x for x in old.keys() | new.keys() if old.get(x) != new.get(x)}
+
+def merge_timestamps(timelines: list[np.ndarray],
+                     block_rows: int = MERGE_BLOCK_ROWS) \
+                     -> Iterator[tuple[np.ndarray, list[np.ndarray]]]:
+    """
+    Performs a streaming k-way merge of sorted 'timelines'. Every step takes
+    up to 'block_rows' rows of every timeline which precede the earliest
+    block end of all timelines. Yields blocks of merged timestamps along
+    with the positions of the taken rows of every timeline within the
+    block. Rows of every timeline keep their order (equal timestamps are
+    taken in the timelines order), so an unsorted timeline is merged as is.
+    """
+    taken = [0] * len(timelines)
+    while True:
+        active = [i for i, x in enumerate(timelines) if taken[i] < len(x)]
+        if not active:
+            return
+        ends = {i: min(taken[i] + block_rows, len(timelines[i]))
+                for i in active}
+        cutoff = min(timelines[i][ends[i] - 1] for i in active)
+        sizes = [0] * len(timelines)
+        for i in active:
+            sizes[i] = int(np.searchsorted(timelines[i][taken[i]:ends[i]],
+                                           cutoff, "right"))
+        if not any(sizes):
+            # Unsorted timelines: take the block which defines the cutoff
+            first = min(active, key=lambda i: timelines[i][ends[i] - 1])
+            sizes[first] = ends[first] - taken[first]
+
+        block = np.concatenate([x[taken[i]:taken[i] + sizes[i]]
+                                for i, x in enumerate(timelines)])
+        order = np.argsort(block, kind="stable")
+        positions = np.empty(len(order), np.int64)
+        positions[order] = np.arange(len(order))
+        bounds = np.concatenate([[0], np.cumsum(sizes)])
+        yield block[order], [positions[bounds[i]:bounds[i + 1]]
+                             for i in range(len(timelines))]
+        for i, size in enumerate(sizes):
+            taken[i] += size
+
+# pylint: disable-next=too-few-public-methods
+class J1939LogStream:
+    """
+    State of the reading of a log kept outside of the decoders of its
+    frames: the transport protocol sessions in progress (see
+    J1939TransportReassembler) and the store of all frames read from the
+    log if they are kept (see J1939Decoder.redecode())
+    """
+
+    def __init__(self,
+                 db: cantools.db.Database,
+                 raw: Optional[RawFrameStore] = None) -> None:
+        """
+        Constructs the state of a log decoded with the SA-masked database
+        'db' which keeps the read frames in 'raw' store if given
+        """
+        self.transport = J1939TransportReassembler(
+            J1939TransportReassembler.priorities_of(
+                [x.frame_id for x in db.messages]
+            )
+        )
+        self.raw = raw
+
+class J1939Decoder:
+    """
+    Accumulates raw J1939 frames and decodes their signals in bulk.
+    Multi-packet messages sent with the transport protocol are reassembled
+    and accumulated as single frames, all frames read from the log may be
+    kept as well, so the log is decoded with another database without
+    parsing it again (see J1939LogStream).
+    """
+
+    PDU1_TEMPLATE = "{can}SA{sa}.PDU1.DA{da}.{msg}"
+    PDU2_TEMPLATE = "{can}SA{sa}.PDU2.GE{ge}.{msg}"
+
+    def __init__(self,
+                 db: cantools.db.Database,
+                 timestamp: str,
+                 import_filter: Optional[J1939ImportFilter] = None,
+                 time_range: Optional[tuple[float, float]] = None) -> None:
+        """
+        Constructs an empty decoder of the frames described in the SA-masked
+        database 'db' (see load_j1939_database()). Frames rejected by
+        'import_filter' or with timestamps out of 'time_range' (start, end)
+        are skipped.
+        """
+        self._db = db
+        self._timestamp = timestamp
+        self._import_filter = import_filter
+        self._time_range = time_range
+        self._plans = {}
+        self._rows = ColumnAccumulator()
+        self._payloads = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __make_plan(self,
+                    channel: Optional[Union[int, str]],
+                    arbitration_id: int) -> Optional[J1939DecodePlan]:
+        """
+        Resolves the database message and the data keys for the frames with
+        given 'channel' and 'arbitration_id'. Returns None if the frames
+        can't be decoded with the current database or are rejected by the
+        import filter.
+        """
+        if (self._import_filter is not None and
+                not self._import_filter.accepts(channel, arbitration_id)):
+            return None
+        try:
+            message = self._db.get_message_by_frame_id(
+                arbitration_id & MASK_WO_SA
+            )
+        except KeyError:
+            return None
+
+        if channel:
+            if isinstance(channel, str):
+                can_ch = channel + "."
+            else:
+                can_ch = "CAN" + str(channel) + "."
+        else:
+            can_ch = ""
+        frame_unp = cantools.j1939.frame_id_unpack(arbitration_id)
+        if cantools.j1939.is_pdu_format_1(frame_unp.pdu_format):
+            data_key = self.PDU1_TEMPLATE.format(
+                can=can_ch,
+                sa=str(frame_unp.source_address),
+                da=str(frame_unp.pdu_specific),
+                msg=message.name
+            )
+        else:
+            data_key = self.PDU2_TEMPLATE.format(
+                can=can_ch,
+                sa=str(frame_unp.source_address),
+                ge=str(frame_unp.pdu_specific),
+                msg=message.name
+            )
+        return J1939DecodePlan(
+            message,
+            data_key,
+            {sig.name: data_key + "." + sig.name for sig in message.signals}
+        )
+
+    def decode_plan(self,
+                    channel: Optional[Union[int, str]],
+                    arbitration_id: int) -> Optional[J1939DecodePlan]:
+        """
+        Returns the cached decode plan for the frames with given 'channel'
+        and 'arbitration_id' (None if the frames can't be decoded)
+        """
+        plan_key = (channel, arbitration_id)
+        try:
+            return self._plans[plan_key]
+        except KeyError:
+            plan = self.__make_plan(channel, arbitration_id)
+            self._plans[plan_key] = plan
+            return plan
+
+    def append(self,
+               msg: can.Message,
+               stream: Optional[J1939LogStream] = None) -> None:
+        """
+        Appends CAN message 'msg' to the raw payloads of its data key. If
+        the log 'stream' is given, transport protocol messages are
+        reassembled and the message is kept in its raw frame store.
+        """
+        if stream is None:
+            self.__append(msg)
+            return
+        if stream.raw is not None and (
+                self._time_range is None or
+                self._time_range[0] <= msg.timestamp <= self._time_range[1]):
+            stream.raw.append(msg)
+        if (msg.arbitration_id >> 16) & 0xff in (TP_CM_PDU_FORMAT,
+                                                 TP_DT_PDU_FORMAT):
+            message = stream.transport.feed(msg.channel, msg.timestamp,
+                                            msg.arbitration_id,
+                                            bytes(msg.data))
+            self.__append(msg)
+            if message is not None:
+                self.__append(can.Message(
+                    timestamp=message[0], arbitration_id=message[1],
+                    data=message[2], channel=msg.channel, is_fd=True
+                ))
+            return
+        self.__append(msg)
+
+    def __append(self, msg: can.Message) -> None:
+        """
+        Appends CAN message 'msg' as is (see append())
+        """
+        if self._time_range is not None and not \
+                self._time_range[0] <= msg.timestamp <= self._time_range[1]:
+            return
+        plan_key = (msg.channel, msg.arbitration_id)
+        try:
+            plan = self._plans[plan_key]
+        except KeyError:
+            plan = self.decode_plan(msg.channel, msg.arbitration_id)
+        if plan is not None:
+            row = self._rows.append_row(msg.timestamp)
+            try:
+                group = self._payloads[plan.data_key]
+            except KeyError:
+                group = (msg.channel, msg.arbitration_id,
+                         PayloadAccumulator(plan.message.length))
+                self._payloads[plan.data_key] = group
+            group[2].append(row, msg.data)
+
+    def __payload_group(self,
+                        plan: J1939DecodePlan,
+                        channel: Optional[Union[int, str]],
+                        arbitration_id: int) -> tuple:
+        """
+        Returns the raw payloads group of 'plan' data key (created from
+        given 'channel' and 'arbitration_id' if there is no one yet)
+        """
+        try:
+            return self._payloads[plan.data_key]
+        except KeyError:
+            group = (channel, arbitration_id,
+                     PayloadAccumulator(plan.message.length))
+            self._payloads[plan.data_key] = group
+            return group
+
+    def __key_groups(self, channels: list, keys: np.ndarray,
+                     first: np.ndarray) -> tuple[np.ndarray, list]:
+        """
+        Maps every distinct (channel index << 32 | arbitration id) of 'keys'
+        to a data key group (-1 if not decodable). Groups are created in the
+        order of the 'first' frames as by append(). Returns the group indexes
+        of 'keys' and the groups as (plan, channel, arbitration id).
+        """
+        key_groups = np.full(len(keys), -1, np.int64)
+        groups = []
+        group_index = {}
+        for i in np.argsort(first).tolist():
+            key = int(keys[i])
+            channel = channels[key >> 32]
+            plan = self.decode_plan(channel, key & 0xffffffff)
+            if plan is None:
+                continue
+            if plan.data_key not in group_index:
+                group_index[plan.data_key] = len(groups)
+                groups.append((plan, channel, key & 0xffffffff))
+            key_groups[i] = group_index[plan.data_key]
+        return key_groups, groups
+
+    def __group_frames(self, block: FrameBlock) -> tuple[np.ndarray, list]:
+        """
+        Groups frames of 'block' by their data keys with vectorized
+        operations, so the per-frame work is done for distinct channel and
+        arbitration id pairs only. Returns the indexes of the matched frames
+        and the groups as (plan, channel, arbitration id, indexes of the
+        group frames among the matched ones).
+        """
+        keys = (block.channel_index << 32) | \
+            block.arbitration_ids.astype(np.int64)
+        unique, first, inverse = np.unique(keys, return_index=True,
+                                           return_inverse=True)
+        key_groups, groups = self.__key_groups(block.channels, unique, first)
+        frame_groups = key_groups[inverse]
+        if self._time_range is not None:
+            frame_groups[(block.timestamps < self._time_range[0]) |
+                         (block.timestamps > self._time_range[1])] = -1
+        matched = np.flatnonzero(frame_groups >= 0)
+        frame_groups = frame_groups[matched]
+        order = np.argsort(frame_groups, kind="stable")
+        bounds = np.searchsorted(frame_groups[order], np.arange(len(groups) + 1))
+        return matched, [(plan, channel, arbitration_id,
+                          order[bounds[i]:bounds[i + 1]])
+                         for i, (plan, channel, arbitration_id)
+                         in enumerate(groups)]
+
+    @staticmethod
+    def __merge_groups(groups: list[tuple]) -> list[tuple]:
+        """
+        Merges prepared groups of the same data key (frames and reassembled
+        messages of the same PGN) into a single group in the rows order
+        """
+        merged = {}
+        for group in groups:
+            merged.setdefault(group[0].data_key, []).append(group)
+        result = []
+        for same in merged.values():
+            if len(same) == 1:
+                result.append(same[0])
+                continue
+            rows = np.concatenate([x[3] for x in same])
+            order = np.argsort(rows, kind="stable")
+            width = max(x[5].shape[1] for x in same)
+            payloads = np.concatenate([
+                np.pad(x[5], ((0, 0), (0, width - x[5].shape[1])))
+                for x in same
+            ])
+            result.append(same[0][:3] + (
+                rows[order],
+                np.concatenate([x[4] for x in same])[order],
+                payloads[order]
+            ))
+        return result
+
+    def prepare_block(self,
+                      block: FrameBlock,
+                      stream: Optional[J1939LogStream] = None) \
+            -> Optional[J1939FrameGroups]:
+        """
+        Groups frames of 'block' by their data keys (see append_prepared()).
+        If the log 'stream' is given, the frames are kept in its raw frame
+        store and transport protocol messages reassembled from the block
+        are grouped separately and placed after the frames which complete
+        them. Returns None if there are no frames to accumulate. Only the
+        decode plans and 'stream' are updated, so a block may be prepared
+        in another thread while the previous one is appended.
+        """
+        if len(block) == 0:
+            return None
+        reassembled = None
+        if stream is not None:
+            if stream.raw is not None:
+                stream.raw.extend(block, None if self._time_range is None else
+                                  (block.timestamps >= self._time_range[0]) &
+                                  (block.timestamps <= self._time_range[1]))
+            reassembled = stream.transport.feed_block(block)
+        matched, groups = self.__group_frames(block)
+        prepared = [(plan, channel, arbitration_id, selected,
+                     block.lengths[matched[selected]],
+                     block.payloads[matched[selected]])
+                    for plan, channel, arbitration_id, selected in groups]
+        timestamps = block.timestamps[matched]
+        if reassembled is not None:
+            completing, messages = reassembled
+            messages_matched, messages_groups = self.__group_frames(messages)
+            completing = completing[messages_matched]
+            # Positions of the frames and of the messages among both
+            frame_positions = np.arange(len(matched)) + \
+                np.searchsorted(completing, matched, "left")
+            message_positions = np.arange(len(completing)) + \
+                np.searchsorted(matched, completing, "right")
+            timestamps = np.empty(len(matched) + len(completing))
+            timestamps[frame_positions] = block.timestamps[matched]
+            timestamps[message_positions] = \
+                messages.timestamps[messages_matched]
+            prepared = [x[:3] + (frame_positions[x[3]],) + x[4:]
+                        for x in prepared]
+            prepared += [
+                (plan, channel, arbitration_id, message_positions[selected],
+                 messages.lengths[messages_matched[selected]],
+                 messages.payloads[messages_matched[selected]])
+                for plan, channel, arbitration_id, selected in messages_groups
+            ]
+            prepared = self.__merge_groups(prepared)
+        if len(timestamps) == 0:
+            return None
+        return J1939FrameGroups(timestamps, prepared)
+
+    def append_prepared(self, prepared: J1939FrameGroups) -> None:
+        """
+        Appends frames grouped by prepare_block() to the raw payloads of
+        their data keys
+        """
+        first_row = self._rows.extend_rows(prepared.timestamps)
+        for plan, channel, arbitration_id, rows, lengths, payloads in \
+                prepared.groups:
+            group = self.__payload_group(plan, channel, arbitration_id)
+            group[2].extend(rows + first_row, lengths, payloads)
+
+    def append_block(self,
+                     block: FrameBlock,
+                     stream: Optional[J1939LogStream] = None) -> None:
+        """
+        Appends frames of 'block' to the raw payloads of their data keys
+        (see prepare_block())
+        """
+        prepared = self.prepare_block(block, stream)
+        if prepared is not None:
+            self.append_prepared(prepared)
+
+    def export_frames(self,
+                      raw: Optional[RawFrameStore] = None) -> J1939RawFrames:
+        """
+        Returns all accumulated raw frames along with the store of all
+        frames read from the log 'raw' if given
+        """
+        return J1939RawFrames(
+            self._rows.timestamps,
+            {data_key: (channel, arbitration_id, payloads.rows,
+                        payloads.lengths, payloads.payloads)
+             for data_key, (channel, arbitration_id, payloads)
+             in self._payloads.items()},
+            raw
+        )
+
+    def merge_frames(self, frames: J1939RawFrames) -> None:
+        """
+        Appends raw 'frames' exported from another decoder after the frames
+        accumulated so far (the store of all read frames isn't merged)
+        """
+        first_row = self._rows.extend_rows(frames.timestamps)
+        for channel, arbitration_id, rows, lengths, payloads in \
+                frames.groups.values():
+            plan = self.decode_plan(channel, arbitration_id)
+            if plan is None:
+                continue
+            group = self.__payload_group(plan, channel, arbitration_id)
+            group[2].extend(rows + first_row, lengths, payloads)
+
+    def merge_timelines(self, sources: list[J1939RawFrames]) -> None:
+        """
+        Appends raw frames exported from the decoders of several logs after
+        the frames accumulated so far merging them into one timeline (see
+        merge_timestamps()). The frames of 'sources' are released while
+        merged, so the memory is taken by a single copy of the frames. The
+        stores of all read frames aren't merged.
+        """
+        mappings = self.__merge_rows(sources)
+        for data_key in list(dict.fromkeys(x for source in sources
+                                           for x in source.groups)):
+            self.__merge_group([(mappings[i], source.groups.pop(data_key))
+                                for i, source in enumerate(sources)
+                                if data_key in source.groups])
+
+    def __merge_rows(self, sources: list[J1939RawFrames]) -> list[np.ndarray]:
+        """
+        Appends the timestamps of 'sources' merged into one timeline and
+        releases them. Returns the mappings of the source rows to the rows
+        of the decoder.
+        """
+        self._rows.reserve_rows(len(self._rows) +
+                                sum(len(x.timestamps) for x in sources))
+        mappings = [np.empty(len(x.timestamps), np.int64) for x in sources]
+        taken = [0] * len(sources)
+        for block, positions in merge_timestamps([x.timestamps
+                                                  for x in sources]):
+            row = self._rows.extend_rows(block)
+            for i, source_positions in enumerate(positions):
+                mappings[i][taken[i]:taken[i] + len(source_positions)] = \
+                    source_positions + row
+                taken[i] += len(source_positions)
+        for source in sources:
+            source.timestamps = None
+        return mappings
+
+    def __merge_group(self, parts: list[tuple[np.ndarray, tuple]]) -> None:
+        """
+        Appends the frames of a data key group exported from several
+        sources. 'parts' are (mapping of the source rows, group) pairs.
+        """
+        channel, arbitration_id = parts[0][1][:2]
+        plan = self.decode_plan(channel, arbitration_id)
+        if plan is None:
+            return
+        group = self.__payload_group(plan, channel, arbitration_id)
+        if len(parts) == 1:
+            mapping, (_, _, rows, lengths, payloads) = parts[0]
+            group[2].extend(mapping[rows], lengths, payloads)
+            return
+        rows = np.concatenate([mapping[x[2]] for mapping, x in parts])
+        order = np.argsort(rows, kind="stable")
+        group[2].extend(rows[order],
+                        np.concatenate([x[3] for _, x in parts])[order],
+                        np.concatenate([x[4] for _, x in parts])[order])
+
+    def redecode(self,
+                 db: cantools.db.Database,
+                 raw: RawFrameStore) -> "J1939Decoder":
+        """
+        Returns a decoder of the accumulated frames with the SA-masked
+        database 'db'. Groups of the messages defined the same way in both
+        databases are taken as is, only the frames of the changed messages
+        are decoded again from the store of all frames read from the log
+        'raw' (see J1939LogStream).
+        """
+        changed = changed_frame_ids(self._db, db)
+        frames = self.export_frames()
+        sources = [frames.subset([
+            data_key for data_key, group in frames.groups.items()
+            if group[1] & MASK_WO_SA not in changed
+        ])]
+        arbitration_ids = raw.frames["arbitration_id"]
+        selected = np.isin(arbitration_ids & MASK_WO_SA, list(changed))
+        if selected.any():
+            # Reassembled messages require their transport protocol frames
+            selected |= J1939TransportReassembler.is_transport(arbitration_ids)
+            decoder = J1939Decoder(db, self._timestamp, self._import_filter)
+            decoder.append_block(raw.select(selected), J1939LogStream(db))
+            decoded = decoder.export_frames()
+            sources.append(decoded.subset([
+                data_key for data_key, group in decoded.groups.items()
+                if group[1] & MASK_WO_SA in changed
+            ]))
+
+        decoder = J1939Decoder(db, self._timestamp, self._import_filter,
+                               self._time_range)
+        decoder.merge_timelines(sources)
+        return decoder
+
+    @property
+    def signal_keys(self) -> list[str]:
+        """
+        Returns keys of all signals of the accumulated frames
+        """
+        return [
+            key
+            for channel, arbitration_id, _ in self._payloads.values()
+            for key in self.decode_plan(channel, arbitration_id).columns.values()
+        ]
+
+    def message(self, key: str) -> cantools.database.can.Message:
+        """
+        Returns the database definition of the message of the signal 'key'
+        (see signal_keys)
+        """
+        channel, arbitration_id, _ = self._payloads[key.rsplit(".", 1)[0]]
+        return self.decode_plan(channel, arbitration_id).message
+
+    def signal(self, key: str) -> cantools.database.can.Signal:
+        """
+        Returns the database definition of the signal 'key' (see
+        signal_keys)
+        """
+        return self.message(key).get_signal_by_name(key.rsplit(".", 1)[1])
+
+    def decode_signal(self,
+                      key: str,
+                      start_row: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Decodes the signal 'key' (see signal_keys) from the frames accumulated
+        starting from 'start_row' row. Returns timestamps and values of the
+        frames where the signal is present.
+        """
+        data_key, name = key.rsplit(".", 1)
+        channel, arbitration_id, payloads = self._payloads[data_key]
+        plan = self.decode_plan(channel, arbitration_id)
+        rows = payloads.rows
+        first = int(np.searchsorted(rows, start_row)) if start_row else 0
+        values = decode_message_signal(
+            plan.message, name, payloads.payloads[first:],
+            payloads.lengths[first:]
+        )
+        sampled = ~np.isnan(values)
+        return self._rows.timestamps[rows[first:][sampled]], values[sampled]
@@ -0,0 +1,220 @@
+""" J1939 transport protocol reassembly module """
+
+from typing import Optional, Union
+
+import numpy as np
+
+from .log_parsers import FrameBlock
+
+# PDU formats of the transport protocol frames
+TP_CM_PDU_FORMAT = 0xec
+TP_DT_PDU_FORMAT = 0xeb
+
+# Control bytes of TP.CM frames
+TP_CM_RTS = 16
+TP_CM_BAM = 32
+TP_CM_ABORT = 255
+
+# Largest message transferred by the transport protocol (bytes)
+TP_MAX_SIZE = 1785
+
+# Maximum intervals between the frames of a session (seconds): T1 for
+# broadcast sessions, T2/T3 for connection mode sessions
+BAM_TIMEOUT = 0.75
+CMDT_TIMEOUT = 1.25
+
+# Priority of reassembled messages which aren't found in the database
+DEFAULT_PRIORITY = 6
+
+# pylint: disable-next=too-few-public-methods
+class _Session:
+    """
+    State of a single transfer: the payload buffer allocated once for the
+    announced size and a bitmap of the received packets
+    """
+
+    __slots__ = ("pgn", "size", "payload", "received", "count", "timeout",
+                 "last")
+
+    def __init__(self, pgn: int, size: int, packets: int, timeout: float,
+                 timestamp: float) -> None:
+        self.pgn = pgn
+        self.size = size
+        self.payload = bytearray(packets * 7)
+        self.received = bytearray(packets)
+        self.count = 0
+        self.timeout = timeout
+        self.last = timestamp
+
+class J1939TransportReassembler:
+    """
+    Streaming reassembler of multi-packet J1939 messages sent with the
+    transport protocol (BAM and CMDT). Sessions are tracked per (channel,
+    SA, DA): a TP.CM BAM/RTS frame starts a session, TP.DT frames fill it
+    in by their sequence numbers and the session is completed once all
+    packets are received. Sessions are dropped on TP.CM Abort, when a new
+    session of the same addresses starts or when the interval between their
+    frames exceeds the protocol timeout. Completed messages are returned as
+    regular frames with the PGN of the transfer, so they are decoded with
+    the database like single frames.
+    """
+
+    def __init__(self, priorities: Optional[dict[int, int]] = None) -> None:
+        """
+        Constructs a reassembler. 'priorities' maps PGNs (with zero PDU
+        specific field for PDU1) to the priorities of the reassembled
+        messages (see priorities_of()).
+        """
+        self._priorities = priorities or {}
+        self._sessions = {}
+
+    @staticmethod
+    def priorities_of(frame_ids: list[int]) -> dict[int, int]:
+        """
+        Returns the priorities of PGNs of database 'frame_ids'
+        """
+        priorities = {}
+        for frame_id in frame_ids:
+            pgn = (frame_id >> 8) & 0x3ffff
+            if (pgn >> 8) & 0xff < 240:
+                pgn &= 0x3ff00
+            priorities[pgn] = (frame_id >> 26) & 0x7
+        return priorities
+
+    @staticmethod
+    def is_transport(arbitration_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns a mask of transport protocol frames among 'arbitration_ids'
+        """
+        pdu_format = (arbitration_ids >> 16) & 0xff
+        return (pdu_format == TP_CM_PDU_FORMAT) | \
+            (pdu_format == TP_DT_PDU_FORMAT)
+
+    def __complete(self,
+                   session: _Session,
+                   sa: int,
+                   da: int,
+                   timestamp: float) -> tuple[float, int, bytes]:
+        """
+        Returns the reassembled message of 'session' as (timestamp,
+        arbitration id, data)
+        """
+        pgn = session.pgn
+        pdu1 = (pgn >> 8) & 0xff < 240
+        if pdu1:
+            pgn &= 0x3ff00
+        priority = self._priorities.get(pgn, DEFAULT_PRIORITY)
+        if pdu1:
+            pgn |= da
+        arbitration_id = (priority << 26) | (pgn << 8) | sa
+        return timestamp, arbitration_id, bytes(session.payload[:session.size])
+
+    def __control(self,
+                  key: tuple[Optional[Union[int, str]], int, int],
+                  timestamp: float,
+                  data: bytes) -> None:
+        """
+        Processes a TP.CM frame of the session 'key' (channel, SA, DA)
+        """
+        if len(data) < 8:
+            return
+        control = data[0]
+        if control in (TP_CM_BAM, TP_CM_RTS):
+            size = data[1] | (data[2] << 8)
+            packets = data[3]
+            if size > TP_MAX_SIZE or not 0 < size <= packets * 7:
+                self._sessions.pop(key, None)
+                return
+            pgn = data[5] | (data[6] << 8) | (data[7] << 16)
+            timeout = BAM_TIMEOUT if control == TP_CM_BAM else CMDT_TIMEOUT
+            self._sessions[key] = _Session(pgn, size, packets, timeout,
+                                           timestamp)
+        elif control == TP_CM_ABORT:
+            self._sessions.pop(key, None)
+            # Connection mode aborts are sent by either side
+            self._sessions.pop((key[0], key[2], key[1]), None)
+
+    def __packet(self,
+                 key: tuple[Optional[Union[int, str]], int, int],
+                 timestamp: float,
+                 data: bytes) -> Optional[tuple[float, int, bytes]]:
+        """
+        Processes a TP.DT frame of the session 'key' (channel, SA, DA).
+        Returns the reassembled message if the frame completes it.
+        """
+        session = self._sessions.get(key)
+        if session is None or not data:
+            return None
+        if timestamp - session.last > session.timeout:
+            del self._sessions[key]
+            return None
+        session.last = timestamp
+        index = data[0] - 1
+        if not 0 <= index < len(session.received):
+            return None
+        chunk = data[1:8]
+        session.payload[index * 7:index * 7 + len(chunk)] = chunk
+        if not session.received[index]:
+            session.received[index] = 1
+            session.count += 1
+        if session.count < len(session.received):
+            return None
+        del self._sessions[key]
+        return self.__complete(session, key[1], key[2], timestamp)
+
+    def feed(self,
+             channel: Optional[Union[int, str]],
+             timestamp: float,
+             arbitration_id: int,
+             data: bytes) -> Optional[tuple[float, int, bytes]]:
+        """
+        Processes a transport protocol frame. Returns the reassembled message
+        as (timestamp, arbitration id, data) if the frame completes it.
+        """
+        key = (channel, arbitration_id & 0xff, (arbitration_id >> 8) & 0xff)
+        if (arbitration_id >> 16) & 0xff == TP_CM_PDU_FORMAT:
+            self.__control(key, timestamp, data)
+            return None
+        return self.__packet(key, timestamp, data)
+
+    def feed_block(self,
+                   block: FrameBlock) -> Optional[tuple[np.ndarray,
+                                                        FrameBlock]]:
+        """
+        Processes the transport protocol frames of 'block'. Returns the
+        reassembled messages as a separate block (as wide as the longest
+        message) along with the rows of the frames of 'block' which complete
+        them, or None if there are no ones. Blocks without transport
+        protocol frames are checked with a single vectorized operation.
+        """
+        transport = np.flatnonzero(self.is_transport(block.arbitration_ids))
+        if len(transport) == 0:
+            return None
+        rows = []
+        messages = []
+        for row in transport.tolist():
+            message = self.feed(
+                block.channels[block.channel_index[row]],
+                float(block.timestamps[row]),
+                int(block.arbitration_ids[row]),
+                block.payloads[row, :block.lengths[row]].tobytes()
+            )
+            if message is not None:
+                rows.append(row)
+                messages.append(message)
+        if not messages:
+            return None
+
+        rows = np.array(rows, np.int64)
+        lengths = np.array([len(x[2]) for x in messages], np.uint16)
+        payloads = np.zeros((len(messages), int(lengths.max())), np.uint8)
+        for i, (_, _, data) in enumerate(messages):
+            payloads[i, :len(data)] = np.frombuffer(data, np.uint8)
+        return rows, FrameBlock(
+            np.array([x[0] for x in messages], np.float64),
+            block.channels,
+            block.channel_index[rows],
+            np.array([x[1] for x in messages], np.uint32),
+            lengths,
+            payloads
+        )
@@ -0,0 +1,194 @@
+""" Decoded logs cache module """
+
+import hashlib
+import os
+import struct
+import tempfile
+import zipfile
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Size of the fixed part of a ZIP local file header
+_LOCAL_HEADER_SIZE = 30
+
+def _map_arrays(path: os.PathLike[str]) -> dict[str, np.ndarray]:
+    """
+    Memory-maps the arrays of the uncompressed .npz file 'path' as read-only
+    arrays (the data is read by the OS on access)
+    """
+    readers = {(1, 0): np.lib.format.read_array_header_1_0,
+               (2, 0): np.lib.format.read_array_header_2_0}
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as entry_file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED or \
+                    not info.filename.endswith(".npy"):
+                raise ValueError(f"Can't map {info.filename}")
+            entry_file.seek(info.header_offset)
+            header = entry_file.read(_LOCAL_HEADER_SIZE)
+            name_size, extra_size = struct.unpack("<HH", header[26:30])
+            entry_file.seek(info.header_offset + _LOCAL_HEADER_SIZE +
+                            name_size + extra_size)
+            version = np.lib.format.read_magic(entry_file)
+            if version not in readers:
+                raise ValueError(f"Can't map {info.filename}")
+            shape, fortran_order, dtype = readers[version](entry_file)
+            if dtype.hasobject:
+                raise ValueError(f"Can't map {info.filename}")
+            name = info.filename[:-len(".npy")]
+            if 0 in shape:
+                arrays[name] = np.empty(shape, dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype, "r",
+                                         entry_file.tell(), shape,
+                                         "F" if fortran_order else "C")
+    return arrays
+
+class LogCache:
+    """
+    On-disk cache of imported log data. Every entry is an uncompressed NumPy
+    .npz file with a set of named arrays, so the arrays may be memory-mapped
+    instead of being read. The least recently used entries are removed when
+    the total size of the cache exceeds the limit.
+    """
+
+    # Size of the log parts (at the start and at the end) hashed as a
+    # content fingerprint in addition to the log size and modification time
+    FINGERPRINT_SIZE = 1024 * 1024
+
+    SUFFIX = ".npz"
+
+    # Default size limit of the caches configured in the settings (MiB)
+    DEFAULT_SIZE_MB = 1024
+
+    def __init__(self, directory: os.PathLike[str], max_size: int) -> None:
+        """
+        Constructs a cache stored in 'directory' and limited by 'max_size'
+        bytes
+        """
+        self._directory = directory
+        self._max_size = max_size
+
+    @classmethod
+    def from_megabytes(cls,
+                       directory: os.PathLike[str],
+                       max_size_mb: int) -> "LogCache":
+        """
+        Constructs a cache stored in 'directory' and limited by 'max_size_mb'
+        MiB (the unit of the cache size settings)
+        """
+        return cls(directory, max_size_mb * 1024 * 1024)
+
+    @property
+    def directory(self) -> os.PathLike[str]:
+        """
+        Returns the cache directory
+        """
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        """
+        Returns the size limit of the cache (bytes)
+        """
+        return self._max_size
+
+    @classmethod
+    def make_key(cls,
+                 paths: list[os.PathLike[str]],
+                 params: Iterable = ()) -> str:
+        """
+        Returns a cache key of the data read from the files 'paths' (e.g. a
+        log and its DBC files) with the settings 'params'. A file is
+        identified by its size, modification time and contents of its start
+        and end (see FINGERPRINT_SIZE), a missing file by its path. Settings
+        are identified by their repr(), so strings are never read as files.
+        """
+        digest = hashlib.sha256()
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                digest.update(f"missing:{os.fspath(path)}".encode())
+                continue
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+            with open(path, "rb") as data_file:
+                digest.update(data_file.read(cls.FINGERPRINT_SIZE))
+                if stat.st_size > cls.FINGERPRINT_SIZE:
+                    data_file.seek(max(cls.FINGERPRINT_SIZE,
+                                       stat.st_size - cls.FINGERPRINT_SIZE))
+                    digest.update(data_file.read())
+        for param in params:
+            digest.update(repr(param).encode())
+        return digest.hexdigest()
+
+    def __entry_path(self, key: str) -> str:
+        """
+        Returns path to the entry file with given 'key'
+        """
+        return os.path.join(self._directory, key + self.SUFFIX)
+
+    def load(self,
+             key: str,
+             mmap: bool = False) -> Optional[dict[str, np.ndarray]]:
+        """
+        Returns the arrays cached with given 'key' (None if there is no
+        entry or it can't be read). If 'mmap', the arrays are memory-mapped
+        read-only instead.
+        """
+        path = self.__entry_path(key)
+        try:
+            if mmap:
+                arrays = _map_arrays(path)
+            else:
+                with np.load(path, allow_pickle=False) as entry:
+                    arrays = {name: entry[name] for name in entry.files}
+            # Modification time marks the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            return None
+        return arrays
+
+    def store(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        """
+        Stores 'arrays' as the entry with given 'key' and evicts the least
+        recently used entries if the cache size limit is exceeded
+        """
+        if self._max_size <= 0:
+            return
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self._directory)
+            try:
+                with os.fdopen(fd, "wb") as entry_file:
+                    np.savez(entry_file, **arrays)
+                os.replace(tmp_path, self.__entry_path(key))
+            except OSError:
+                os.remove(tmp_path)
+                raise
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits the
+        size limit. Entries which can't be removed (e.g. mapped ones on
+        Windows) are skipped.
+        """
+        entries = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
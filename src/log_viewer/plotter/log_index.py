@@ -0,0 +1,168 @@
+""" Sparse time index of CAN logs module """
+
+from dataclasses import dataclass
+import os
+from typing import Optional
+
+import numpy as np
+
+from .log_cache import LogCache
+from .log_readers import BLFChunkReader, LogChunk, read_log_chunk, split_log
+
+# Indexes built in the current session by their cache keys
+_indexes = {}
+
+@dataclass
+class LogIndex:
+    """
+    Sparse index of a log: the log split into independently readable chunks
+    (see split_log()) with the timestamp of the first message of every chunk
+    (the previous chunk timestamp for chunks without messages). Messages are
+    expected to be logged in the timestamp order.
+    """
+    chunks: list[LogChunk]
+    timestamps: np.ndarray
+
+    @property
+    def start_time(self) -> float:
+        """
+        Returns timestamp of the first message of the log (NaN if there is
+        no one)
+        """
+        valid = self.timestamps[np.isfinite(self.timestamps)]
+        return float(valid[0]) if len(valid) else np.nan
+
+    def select(self, start: float, end: float) -> list[LogChunk]:
+        """
+        Returns the chunks which may contain messages with timestamps from
+        'start' to 'end'
+        """
+        first = max(int(np.searchsorted(self.timestamps, start, "left")) - 1,
+                    0)
+        last = int(np.searchsorted(self.timestamps, end, "right"))
+        return self.chunks[first:last]
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Returns the index as a flat dict of arrays (e.g. to be saved with
+        numpy.savez())
+        """
+        return {
+            "timestamps": self.timestamps,
+            "starts": np.array([x.start for x in self.chunks], np.int64),
+            "ends": np.array([x.end for x in self.chunks], np.int64),
+            "prefixes": np.frombuffer(b"".join(x.prefix for x in self.chunks),
+                                      np.uint8),
+            "prefix_sizes": np.array([len(x.prefix) for x in self.chunks],
+                                     np.int64)
+        }
+
+    @classmethod
+    def from_arrays(cls,
+                    filename: str,
+                    arrays: dict[str, np.ndarray]) -> "LogIndex":
+        """
+        Constructs the index of the log 'filename' from a dict of arrays
+        returned by to_arrays()
+        """
+        prefixes = arrays["prefixes"].tobytes()
+        bounds = np.concatenate([[0], np.cumsum(arrays["prefix_sizes"])])
+        chunks = [
+            LogChunk(filename, int(start), int(end),
+                     prefixes[bounds[i]:bounds[i + 1]])
+            for i, (start, end) in enumerate(zip(arrays["starts"],
+                                                 arrays["ends"]))
+        ]
+        return cls(chunks, arrays["timestamps"])
+
+def join_chunks(chunks: list[LogChunk], chunk_size: int) -> list[LogChunk]:
+    """
+    Joins adjacent 'chunks' of a log into chunks of about 'chunk_size' bytes
+    """
+    joined = []
+    for chunk in chunks:
+        if joined and joined[-1].end == chunk.start and \
+                joined[-1].end - joined[-1].start < chunk_size:
+            joined[-1] = LogChunk(chunk.filename, joined[-1].start, chunk.end,
+                                  joined[-1].prefix)
+        else:
+            joined.append(chunk)
+    return joined
+
+def _first_timestamp(chunk: LogChunk,
+                     asc_base: str,
+                     asc_rel_timestamp: bool) -> float:
+    """
+    Returns timestamp of the first message of the log 'chunk' (NaN if there
+    is no one). Only the beginning of the chunk is read.
+    """
+    _, ext = os.path.splitext(chunk.filename)
+    if ext == ".blf":
+        reader = BLFChunkReader(chunk)
+        try:
+            for msg in reader:
+                return msg.timestamp
+        finally:
+            reader.stop()
+        return np.nan
+
+    size = 4096
+    with open(chunk.filename, "rb") as log_file:
+        while True:
+            log_file.seek(min(chunk.start + size, chunk.end))
+            log_file.readline()
+            end = min(log_file.tell(), chunk.end)
+            head = LogChunk(chunk.filename, chunk.start, end, chunk.prefix)
+            for msg in read_log_chunk(head, asc_base, asc_rel_timestamp):
+                return msg.timestamp
+            if end >= chunk.end:
+                return np.nan
+            size *= 4
+
+def build_log_index(filename: os.PathLike[str],
+                    asc_base: str = "hex",
+                    asc_rel_timestamp: bool = True,
+                    step: int = 1024 * 1024) -> LogIndex:
+    """
+    Builds a sparse index of the log 'filename' with chunks of about 'step'
+    bytes. Only the first message of every chunk is read.
+    """
+    chunks = split_log(filename, step)
+    timestamps = np.array([_first_timestamp(x, asc_base, asc_rel_timestamp)
+                           for x in chunks], np.float64)
+    # Chunks without messages take the timestamp of the previous chunk
+    valid = np.where(np.isnan(timestamps), 0, np.arange(len(timestamps)))
+    valid = np.maximum.accumulate(valid) if len(valid) else valid
+    timestamps = np.where(np.isnan(timestamps[valid]), -np.inf,
+                          timestamps[valid])
+    return LogIndex(chunks, timestamps)
+
+def load_log_index(filename: os.PathLike[str],
+                   asc_base: str = "hex",
+                   asc_rel_timestamp: bool = True,
+                   cache: Optional[LogCache] = None,
+                   step: int = 1024 * 1024) -> LogIndex:
+    """
+    Returns a sparse index of the log 'filename' (see build_log_index()).
+    The index is reused within the session while the log remains the same
+    and also saved to 'cache' (if given) to be reused across sessions.
+    """
+    filename = str(filename)
+    key = LogCache.make_key([filename],
+                            ["index", step, asc_base, asc_rel_timestamp])
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    if cache is not None:
+        arrays = cache.load(key)
+        if arrays is not None:
+            index = LogIndex.from_arrays(filename, arrays)
+
+    if index is None:
+        index = build_log_index(filename, asc_base, asc_rel_timestamp, step)
+        if cache is not None:
+            cache.store(key, index.to_arrays())
+
+    _indexes[key] = index
+    return index
@@ -0,0 +1,407 @@
+""" Fast CAN text log parsers module """
+
+from dataclasses import dataclass
+from datetime import datetime
+import io
+import mmap
+import os
+import re
+from typing import Iterable, Iterator, Optional, Union
+
+import can
+from can.io.asc import ASC_MESSAGE_REGEX, ASC_TRIGGER_REGEX
+from can.util import dlc2len
+import numpy as np
+
+from .log_readers import LogChunk
+
+# Flags of the candump id field (see can.CanutilsLogReader)
+_CAN_ERR_FLAG = 0x20000000
+
+_ASC_DATE_REGEX = re.compile(r"date\s+\w+\s+(?P<datetime_string>.+)",
+                             re.IGNORECASE)
+_ASC_BASE_REGEX = re.compile(r"base\s+(?P<base>hex|dec)", re.IGNORECASE)
+_ASC_START_REGEX = re.compile(r"^\d+\.\d+\s+Start of measurement")
+_ASC_TIMESTAMP_REGEX = re.compile(r"\d+\.\d*|\.\d+")
+
+# Month names of ASC dates (English and German ones as python-can accepts)
+_ASC_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6, "Jul": 7,
+    "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+    "Mär": 3, "Mai": 5, "Okt": 10, "Dez": 12
+}
+_ASC_DATETIME_FORMATS = (
+    "%m %d %I:%M:%S.%f %p %Y",
+    "%m %d %I:%M:%S %p %Y",
+    "%m %d %H:%M:%S.%f %Y",
+    "%m %d %H:%M:%S %Y"
+)
+
+def _asc_datetime_to_timestamp(datetime_string: str) -> float:
+    """
+    Returns the POSIX timestamp of an ASC date 'datetime_string' as
+    can.ASCReader converts it. Raises ValueError if the format is unknown.
+    """
+    for name, number in _ASC_MONTHS.items():
+        datetime_string = datetime_string.replace(name, f"{number:02}")
+    for format_str in _ASC_DATETIME_FORMATS:
+        try:
+            return datetime.strptime(datetime_string, format_str).timestamp()
+        except ValueError:
+            continue
+    raise ValueError(f"Incompatible datetime string {datetime_string}")
+
+@dataclass
+class FrameBlock:
+    """
+    Frames parsed from a block of log lines: 'channel_index' refers to the
+    unique 'channels' of the block, 'payloads' is a 2D uint8 array padded
+    with zeros up to the longest frame of the block
+    """
+    timestamps: np.ndarray
+    channels: list[Optional[Union[int, str]]]
+    channel_index: np.ndarray
+    arbitration_ids: np.ndarray
+    lengths: np.ndarray
+    payloads: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+class _BlockBuilder:
+    """
+    Collects parsed frames into a FrameBlock
+    """
+
+    def __init__(self) -> None:
+        self.timestamps = []
+        self.channel_index = []
+        self.arbitration_ids = []
+        self.datas = []
+        self.channels = {}
+
+    def channel(self, channel: Optional[Union[int, str]]) -> int:
+        """
+        Returns the index of 'channel' in the block
+        """
+        try:
+            return self.channels[channel]
+        except KeyError:
+            index = len(self.channels)
+            self.channels[channel] = index
+            return index
+
+    def add_message(self, msg: can.Message) -> None:
+        """
+        Adds a message parsed by python-can
+        """
+        self.timestamps.append(msg.timestamp)
+        self.channel_index.append(self.channel(msg.channel))
+        self.arbitration_ids.append(msg.arbitration_id)
+        self.datas.append(bytes(msg.data))
+
+    def build(self) -> FrameBlock:
+        """
+        Returns the collected frames
+        """
+        count = len(self.datas)
+        lengths = np.fromiter(map(len, self.datas), np.uint8, count)
+        width = int(lengths.max()) if count else 0
+        if count and int(lengths.min()) == width:
+            payloads = np.frombuffer(b"".join(self.datas), np.uint8)
+            payloads = payloads.reshape(count, width)
+        else:
+            payloads = np.zeros((count, width), np.uint8)
+            for row, data in enumerate(self.datas):
+                payloads[row, :len(data)] = np.frombuffer(data, np.uint8)
+        return FrameBlock(
+            np.array(self.timestamps, np.float64),
+            list(self.channels),
+            np.array(self.channel_index, np.int64),
+            np.array(self.arbitration_ids, np.uint32),
+            lengths,
+            payloads
+        )
+
+# pylint: disable-next=too-few-public-methods
+class _CandumpParser:
+    """
+    Parser of candump -L lines. Classic data frames are parsed directly,
+    other lines are passed to can.CanutilsLogReader.
+    """
+
+    def __init__(self) -> None:
+        self._channels = {}
+
+    def __channel(self, token: str) -> Union[int, str]:
+        """
+        Returns the channel value of 'token' as python-can does it
+        """
+        try:
+            return self._channels[token]
+        except KeyError:
+            channel = int(token) if token.isdigit() else token
+            self._channels[token] = channel
+            return channel
+
+    def parse(self, lines: list[str], builder: _BlockBuilder) -> None:
+        """
+        Parses 'lines' into 'builder'
+        """
+        timestamps = builder.timestamps
+        channel_index = builder.channel_index
+        arbitration_ids = builder.arbitration_ids
+        datas = builder.datas
+        for line in lines:
+            tokens = line.split()
+            if len(tokens) == 3 or (len(tokens) == 4 and
+                                    tokens[3].lower() in ("r", "t")):
+                can_id, _, data = tokens[2].partition("#")
+                try:
+                    if data[:1] in ("#", "r", "R"):
+                        raise ValueError
+                    arbitration_id = int(can_id, 16)
+                    if arbitration_id & _CAN_ERR_FLAG:
+                        raise ValueError
+                    payload = bytes.fromhex(data)
+                    timestamp = float(tokens[0][1:-1])
+                except ValueError:
+                    pass
+                else:
+                    timestamps.append(timestamp)
+                    channel_index.append(
+                        builder.channel(self.__channel(tokens[1]))
+                    )
+                    arbitration_ids.append(arbitration_id & 0x1fffffff)
+                    datas.append(payload)
+                    continue
+            if not tokens:
+                continue
+            for msg in can.CanutilsLogReader(io.StringIO(line)):
+                builder.add_message(msg)
+
+# pylint: disable-next=too-few-public-methods
+class _AscParser:
+    """
+    Parser of ASC lines. Classic data frames are parsed directly, other
+    frames are passed to can.ASCReader.
+    """
+
+    def __init__(self, base: str, relative_timestamp: bool) -> None:
+        self._base = 10 if base == "dec" else 16
+        self._relative_timestamp = relative_timestamp
+        self._start_time = 0.0
+        self._header = True
+
+    def __set_start_time(self, datetime_string: str) -> None:
+        """
+        Sets the start time from 'datetime_string' unless the timestamps are
+        relative
+        """
+        if not self._relative_timestamp:
+            self._start_time = _asc_datetime_to_timestamp(datetime_string)
+
+    def __parse_header(self, line: str) -> None:
+        """
+        Parses a header 'line' as can.ASCReader does it. The first line which
+        doesn't belong to the header ends the header and is skipped.
+        """
+        line = line.strip()
+        if match := _ASC_DATE_REGEX.match(line):
+            self.__set_start_time(match.group("datetime_string"))
+        elif match := _ASC_BASE_REGEX.match(line):
+            self._base = 10 if match.group("base").lower() == "dec" else 16
+        elif not line.startswith("//"):
+            self._header = False
+
+    def __parse_other(self, line: str, builder: _BlockBuilder) -> None:
+        """
+        Parses a line which isn't a classic data frame
+        """
+        line = line.strip()
+        if match := ASC_TRIGGER_REGEX.match(line):
+            self.__set_start_time(match.group("datetime_string"))
+            return
+        if _ASC_START_REGEX.match(line) or not ASC_MESSAGE_REGEX.match(line):
+            return
+        # The events line ends the header of the reader
+        reader = can.ASCReader(
+            io.StringIO("no internal events logged\n" + line),
+            "dec" if self._base == 10 else "hex"
+        )
+        for msg in reader:
+            msg.timestamp += self._start_time
+            builder.add_message(msg)
+
+    def parse(self, lines: list[str], builder: _BlockBuilder) -> None:
+        """
+        Parses 'lines' into 'builder'
+        """
+        timestamps = builder.timestamps
+        channel_index = builder.channel_index
+        arbitration_ids = builder.arbitration_ids
+        datas = builder.datas
+        base = self._base
+        for line in lines:
+            if self._header:
+                self.__parse_header(line)
+                base = self._base
+                continue
+            tokens = line.split()
+            if (len(tokens) >= 6 and tokens[3] in ("Rx", "Tx") and
+                    tokens[1].isdigit() and tokens[4][:1].lower() != "r" and
+                    _ASC_TIMESTAMP_REGEX.fullmatch(tokens[0])):
+                can_id = tokens[2]
+                if can_id[-1:] in ("x", "X"):
+                    can_id = can_id[:-1]
+                try:
+                    arbitration_id = int(can_id, base)
+                    size = min(8, dlc2len(int(tokens[5], base)))
+                    if base == 16:
+                        payload = bytes.fromhex(
+                            " ".join(tokens[6:6 + size])
+                        )
+                        if len(payload) != len(tokens[6:6 + size]):
+                            raise ValueError
+                    else:
+                        payload = bytes(int(x) for x in tokens[6:6 + size])
+                except ValueError:
+                    pass
+                else:
+                    timestamps.append(float(tokens[0]) + self._start_time)
+                    channel_index.append(builder.channel(int(tokens[1]) - 1))
+                    arbitration_ids.append(arbitration_id)
+                    datas.append(payload)
+                    continue
+            self.__parse_other(line, builder)
+
+def _make_parser(filename: str,
+                 asc_base: str,
+                 asc_rel_timestamp: bool) \
+                 -> Optional[Union[_CandumpParser, _AscParser]]:
+    """
+    Returns a parser for the log 'filename' (None if there is no fast parser
+    for the log format)
+    """
+    _, ext = os.path.splitext(filename)
+    if ext == ".log":
+        return _CandumpParser()
+    if ext == ".asc":
+        return _AscParser(asc_base, asc_rel_timestamp)
+    return None
+
+def iter_frame_blocks(chunk: LogChunk,
+                      asc_base: str = "hex",
+                      asc_rel_timestamp: bool = True,
+                      block_size: int = 1024 * 1024) \
+                      -> Optional[Iterator[FrameBlock]]:
+    """
+    Returns an iterator over frames of the log 'chunk' parsed in blocks of
+    about 'block_size' bytes. The file is memory-mapped and lines are parsed
+    with minimal per-line work, falling back to python-can for lines other
+    than classic data frames. Returns None if there is no fast parser for the
+    log format.
+    """
+    parser = _make_parser(chunk.filename, asc_base, asc_rel_timestamp)
+    if parser is None:
+        return None
+    return _iter_blocks(chunk, parser, block_size)
+
+def iter_message_blocks(messages: Iterable[can.Message],
+                        block_size: int = 10000) -> Iterator[FrameBlock]:
+    """
+    Collects 'messages' read by python-can into frame blocks of up to
+    'block_size' messages
+    """
+    builder = _BlockBuilder()
+    for msg in messages:
+        builder.add_message(msg)
+        if len(builder.datas) >= block_size:
+            yield builder.build()
+            builder = _BlockBuilder()
+    if builder.datas:
+        yield builder.build()
+
+# pylint: disable-next=too-few-public-methods
+class LogTail:
+    """
+    Incremental reader of a growing text log. Every read() parses the lines
+    appended since the previous one.
+    """
+
+    def __init__(self,
+                 filename: str,
+                 parser: Union[_CandumpParser, _AscParser],
+                 block_size: int) -> None:
+        """
+        Constructs a reader of 'filename' starting from its beginning (see
+        open_log_tail())
+        """
+        self._filename = filename
+        self._parser = parser
+        self._block_size = block_size
+        self._offset = 0
+
+    def read(self, final: bool = False) -> Iterator[FrameBlock]:
+        """
+        Returns an iterator over frames of the lines appended since the
+        previous read. A trailing line without a line break is considered
+        incomplete and is left for the next read unless 'final' is True.
+        """
+        start = self._offset
+        end = os.path.getsize(self._filename)
+        if end <= start:
+            return iter(())
+        if not final:
+            with open(self._filename, "rb") as log_file, \
+                    mmap.mmap(log_file.fileno(), 0,
+                              access=mmap.ACCESS_READ) as data:
+                end = data.rfind(b"\n", start, end) + 1
+            if end <= 0:
+                return iter(())
+        self._offset = end
+        return _iter_blocks(LogChunk(self._filename, start, end),
+                            self._parser, self._block_size)
+
+def open_log_tail(filename: os.PathLike[str],
+                  asc_base: str = "hex",
+                  asc_rel_timestamp: bool = True,
+                  block_size: int = 1024 * 1024) -> Optional[LogTail]:
+    """
+    Returns an incremental reader of the log 'filename' with the fast
+    parsers (see iter_frame_blocks()). Returns None if there is no fast
+    parser for the log format.
+    """
+    parser = _make_parser(str(filename), asc_base, asc_rel_timestamp)
+    if parser is None:
+        return None
+    return LogTail(str(filename), parser, block_size)
+
+def _iter_blocks(chunk: LogChunk,
+                 parser: Union[_CandumpParser, _AscParser],
+                 block_size: int) -> Iterator[FrameBlock]:
+    """
+    Yields frame blocks of 'chunk' parsed by 'parser'
+    """
+    if chunk.prefix:
+        builder = _BlockBuilder()
+        parser.parse(chunk.prefix.decode("utf-8", "replace").splitlines(),
+                     builder)
+        if builder.datas:
+            yield builder.build()
+
+    if chunk.end <= chunk.start:
+        return
+    with open(chunk.filename, "rb") as log_file, \
+            mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        pos = chunk.start
+        while pos < chunk.end:
+            end = data.find(b"\n", min(pos + block_size, chunk.end) - 1,
+                            chunk.end)
+            end = chunk.end if end == -1 else end + 1
+            builder = _BlockBuilder()
+            parser.parse(data[pos:end].decode("utf-8", "replace").splitlines(),
+                         builder)
+            pos = end
+            if builder.datas:
+                yield builder.build()
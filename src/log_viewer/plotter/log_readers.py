@@ -0,0 +1,266 @@
+""" CAN log readers module """
+
+from dataclasses import dataclass
+import io
+import os
+import struct
+import zlib
+from typing import Iterable, Iterator
+
+import can
+from can.io import blf
+
+TEXT_FORMATS = (".asc", ".csv", ".log")
+
+@dataclass(frozen=True)
+class LogChunk:
+    """
+    Independently readable part of a log file: bytes from 'start' to 'end'
+    which must be preceded by the 'prefix' bytes (e.g. a file header) to be
+    read
+    """
+    filename: str
+    start: int
+    end: int
+    prefix: bytes = b""
+
+def open_log_reader(filename: os.PathLike[str],
+                    asc_base: str = "hex",
+                    asc_rel_timestamp: bool = True) -> Iterable[can.Message]:
+    """
+    Returns a python-can reader for the log file 'filename' selected by the
+    file extension
+    """
+    _, ext = os.path.splitext(filename)
+    if ext == ".log":
+        return can.CanutilsLogReader(filename)
+    if ext == ".asc":
+        return can.ASCReader(filename, asc_base, asc_rel_timestamp)
+    if ext == ".blf":
+        return can.BLFReader(filename)
+    if ext == ".csv":
+        return can.CSVReader(filename)
+    raise ImportError("Format is not supported", path=filename)
+
+def _text_chunks(filename: str, chunk_size: int) -> list[LogChunk]:
+    """
+    Splits a text log into chunks at line boundaries. The lines before the
+    first data line (a line starting with a digit or "(") form the header
+    which is prepended to every chunk but the first one.
+    """
+    _, ext = os.path.splitext(filename)
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as log_file:
+        header_end = 0
+        for line in log_file:
+            if ext == ".csv" and header_end == 0:
+                header_end = len(line)
+                continue
+            if line.lstrip()[:1].isdigit() or line.lstrip()[:1] == b"(":
+                break
+            header_end += len(line)
+        log_file.seek(0)
+        header = log_file.read(header_end)
+
+        chunks = []
+        start = header_end
+        while start < size:
+            log_file.seek(min(start + chunk_size, size))
+            log_file.readline()
+            end = min(log_file.tell(), size)
+            chunk_prefix = header if chunks else b""
+            if ext == ".asc" and chunks:
+                chunk_prefix += _asc_trigger_line(log_file, header_end, start)
+            chunks.append(LogChunk(filename, start, end, chunk_prefix))
+            start = end
+        if chunks:
+            chunks[0] = LogChunk(filename, 0, chunks[0].end)
+    return chunks
+
+def _asc_trigger_line(log_file: io.BufferedReader,
+                      header_end: int,
+                      offset: int) -> bytes:
+    """
+    Returns the last "Begin Triggerblock" line of the ASC file placed
+    between 'header_end' and 'offset' positions (empty if there is no one)
+    """
+    window = 1 << 20
+    pos = offset
+    while pos > header_end:
+        begin = max(header_end, pos - window)
+        log_file.seek(begin)
+        data = log_file.read(pos - begin)
+        found = data.rfind(b"Begin Triggerblock")
+        if found != -1:
+            log_file.seek(begin + found)
+            return log_file.readline()
+        # Keep an overlap in case the keyword crosses the window border
+        pos = begin + len(b"Begin Triggerblock")
+        if begin == header_end:
+            break
+    return b""
+
+def _blf_chunks(filename: str, chunk_size: int) -> list[LogChunk]:
+    """
+    Splits a BLF file into chunks at LOG_CONTAINER object boundaries
+    """
+    chunks = []
+    with open(filename, "rb") as log_file:
+        header = log_file.read(blf.FILE_HEADER_STRUCT.size)
+        if header[:4] != b"LOGG":
+            raise blf.BLFParseError("Unexpected file format")
+        start = pos = blf.FILE_HEADER_STRUCT.unpack(header)[1]
+        while True:
+            log_file.seek(pos)
+            data = log_file.read(blf.OBJ_HEADER_BASE_STRUCT.size)
+            if len(data) < blf.OBJ_HEADER_BASE_STRUCT.size:
+                break
+            signature, _, _, obj_size, _ = \
+                blf.OBJ_HEADER_BASE_STRUCT.unpack(data)
+            if signature != b"LOBJ":
+                raise blf.BLFParseError()
+            pos += obj_size + obj_size % 4
+            if pos - start >= chunk_size:
+                chunks.append(LogChunk(filename, start, pos))
+                start = pos
+        end = os.path.getsize(filename)
+        if start < end or not chunks:
+            chunks.append(LogChunk(filename, start, end))
+    return chunks
+
+def split_log(filename: os.PathLike[str],
+              chunk_size: int) -> list[LogChunk]:
+    """
+    Splits log file 'filename' into chunks of about 'chunk_size' bytes which
+    can be read independently with read_log_chunk()
+    """
+    filename = str(filename)
+    _, ext = os.path.splitext(filename)
+    if ext in TEXT_FORMATS:
+        return _text_chunks(filename, chunk_size)
+    if ext == ".blf":
+        return _blf_chunks(filename, chunk_size)
+    raise ImportError("Format is not supported", path=filename)
+
+class BLFChunkReader(can.BLFReader):
+    """
+    Reader of a BLF file chunk. Objects which continue from the previous
+    chunk are skipped, the object which continues in the next chunk is
+    completed by reading the next container.
+    """
+
+    def __init__(self, chunk: LogChunk) -> None:
+        super().__init__(chunk.filename)
+        self._chunk = chunk
+        self._skip_head = chunk.start > self.file.tell()
+
+    def _read_container(self):
+        """
+        Returns the uncompressed data of the next container (b"" for other
+        objects) or None at the end of file
+        """
+        data = self.file.read(blf.OBJ_HEADER_BASE_STRUCT.size)
+        if len(data) < blf.OBJ_HEADER_BASE_STRUCT.size:
+            return None
+        signature, _, _, obj_size, obj_type = \
+            blf.OBJ_HEADER_BASE_STRUCT.unpack(data)
+        if signature != b"LOBJ":
+            raise blf.BLFParseError()
+        obj_data = self.file.read(obj_size - blf.OBJ_HEADER_BASE_STRUCT.size)
+        self.file.read(obj_size % 4)
+        if obj_type != blf.LOG_CONTAINER:
+            return b""
+        method, _ = blf.LOG_CONTAINER_STRUCT.unpack_from(obj_data)
+        container_data = obj_data[blf.LOG_CONTAINER_STRUCT.size:]
+        if method == blf.NO_COMPRESSION:
+            return container_data
+        if method == blf.ZLIB_DEFLATE:
+            return zlib.decompressobj().decompress(container_data)
+        return b""
+
+    @staticmethod
+    def _first_object(data: bytes) -> int:
+        """
+        Returns the position of the first complete object in the container
+        'data' which may start with the tail of an object from the previous
+        container. Candidates are verified by walking the chain of objects up
+        to the end of the container.
+        """
+        pos = data.find(b"LOBJ")
+        while pos != -1:
+            obj_pos = pos
+            while True:
+                try:
+                    signature, header_size, header_version, obj_size, _ = \
+                        blf.OBJ_HEADER_BASE_STRUCT.unpack_from(data, obj_pos)
+                except struct.error:
+                    return pos
+                if (signature != b"LOBJ" or header_version not in (1, 2) or
+                        obj_size < header_size or
+                        header_size < blf.OBJ_HEADER_BASE_STRUCT.size):
+                    break
+                next_pos = obj_pos + obj_size
+                if next_pos + 8 > len(data):
+                    return pos
+                obj_pos = data.find(b"LOBJ", next_pos, next_pos + 8)
+                if obj_pos == -1:
+                    break
+            pos = data.find(b"LOBJ", pos + 1)
+        return len(data)
+
+    def __iter__(self) -> Iterator[can.Message]:
+        self.file.seek(self._chunk.start)
+        skip_head = self._skip_head
+        while self.file.tell() < self._chunk.end:
+            data = self._read_container()
+            if data is None:
+                break
+            if not data:
+                continue
+            if skip_head:
+                data = data[self._first_object(data):]
+                skip_head = False
+            yield from self._parse_container(data)
+
+        # Complete the object which continues in the next chunk
+        while self._tail:
+            data = self._read_container()
+            if data is None:
+                break
+            if not data:
+                continue
+            tail_size = len(self._tail)
+            data = self._tail + data
+            self._tail = b""
+            self._pos = 0
+            try:
+                for msg in self._parse_data(data):
+                    if self._pos >= tail_size:
+                        break
+                    yield msg
+            except struct.error:
+                pass
+            if self._pos < tail_size:
+                self._tail = data[self._pos:]
+        self.stop()
+
+def read_log_chunk(chunk: LogChunk,
+                   asc_base: str = "hex",
+                   asc_rel_timestamp: bool = True) -> Iterator[can.Message]:
+    """
+    Returns an iterator over CAN messages of the log 'chunk'
+    """
+    _, ext = os.path.splitext(chunk.filename)
+    if ext == ".blf":
+        return iter(BLFChunkReader(chunk))
+
+    with open(chunk.filename, "rb") as log_file:
+        log_file.seek(chunk.start)
+        data = log_file.read(chunk.end - chunk.start)
+    text = io.StringIO((chunk.prefix + data).decode("utf-8", "replace"),
+                       newline=None)
+    if ext == ".log":
+        return iter(can.CanutilsLogReader(text))
+    if ext == ".asc":
+        return iter(can.ASCReader(text, asc_base, asc_rel_timestamp))
+    return iter(can.CSVReader(text))
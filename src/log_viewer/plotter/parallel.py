@@ -0,0 +1,143 @@
+""" Parallel log import module """
+
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing
+from typing import Optional
+
+import cantools
+
+from .j1939_decoder import J1939Decoder, J1939ImportFilter, J1939LogStream, \
+                           J1939RawFrames
+from .log_parsers import iter_frame_blocks
+from .log_readers import LogChunk, read_log_chunk
+from .raw_frames import RawFrameStore
+
+# State of a pool worker process (see _init_worker())
+_worker_state = {}
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def _init_worker(db: cantools.db.Database,
+                 asc_base: str,
+                 asc_rel_timestamp: bool,
+                 timestamp: str,
+                 import_filter: Optional[J1939ImportFilter],
+                 time_range: Optional[tuple[float, float]],
+                 keep_raw: bool) -> None:
+    """
+    Initializes a pool worker process with the database passed once per
+    process
+    """
+    _worker_state["db"] = db
+    _worker_state["import_filter"] = import_filter
+    _worker_state["time_range"] = time_range
+    _worker_state["asc_base"] = asc_base
+    _worker_state["asc_rel_timestamp"] = asc_rel_timestamp
+    _worker_state["timestamp"] = timestamp
+    _worker_state["keep_raw"] = keep_raw
+
+def _decode_chunk(chunk: LogChunk) -> tuple[int, J1939RawFrames]:
+    """
+    Reads all messages of the log 'chunk'. Returns the number of the read
+    messages and the raw frames matched by the database (with all read
+    frames in 'keep_raw' mode).
+    """
+    decoder = J1939Decoder(_worker_state["db"], _worker_state["timestamp"],
+                           _worker_state["import_filter"],
+                           _worker_state["time_range"])
+    stream = J1939LogStream(
+        _worker_state["db"],
+        RawFrameStore() if _worker_state["keep_raw"] else None
+    )
+    processed = 0
+    blocks = iter_frame_blocks(chunk,
+                               _worker_state["asc_base"],
+                               _worker_state["asc_rel_timestamp"])
+    if blocks is not None:
+        for block in blocks:
+            decoder.append_block(block, stream)
+            processed += len(block)
+    else:
+        for msg in read_log_chunk(chunk,
+                                  _worker_state["asc_base"],
+                                  _worker_state["asc_rel_timestamp"]):
+            decoder.append(msg, stream)
+            processed += 1
+    return processed, decoder.export_frames(stream.raw)
+
+class ParallelJ1939Import:
+    """
+    Reads chunks of a J1939 log across a pool of processes. The results are
+    collected in the order of the chunks, i.e. in the order of the log.
+    """
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(self,
+                 chunks: list[LogChunk],
+                 workers: int,
+                 db: cantools.db.Database,
+                 asc_base: str,
+                 asc_rel_timestamp: bool,
+                 timestamp: str,
+                 import_filter: Optional[J1939ImportFilter] = None,
+                 time_range: Optional[tuple[float, float]] = None,
+                 keep_raw: bool = False) -> None:
+        """
+        Starts reading of log 'chunks' by 'workers' processes with the
+        SA-masked database 'db' (see load_j1939_database()), the frames
+        filter 'import_filter', the frames 'time_range' and 'keep_raw' mode
+        (see J1939Decoder)
+        """
+        # Spawned processes are safe to start from a Qt application thread
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(db, asc_base, asc_rel_timestamp, timestamp,
+                      import_filter, time_range, keep_raw)
+        )
+        self._futures = [self._executor.submit(_decode_chunk, chunk)
+                         for chunk in chunks]
+        self._next = 0
+
+    @property
+    def done(self) -> bool:
+        """
+        Returns True if results of all chunks are already collected
+        """
+        return self._next == len(self._futures)
+
+    def next_result(self,
+                    timeout: Optional[float] = None) \
+                    -> Optional[tuple[int, J1939RawFrames]]:
+        """
+        Waits up to 'timeout' seconds for the result of the next chunk (see
+        _decode_chunk()). Returns None if the result isn't ready yet.
+        Exceptions raised while reading the chunk are re-raised here, an
+        abruptly terminated worker process (e.g. killed when out of memory)
+        raises ImportError.
+        """
+        try:
+            result = self._futures[self._next].result(timeout)
+        except concurrent.futures.TimeoutError:
+            return None
+        except concurrent.futures.process.BrokenProcessPool as err:
+            self.cancel()
+            raise ImportError(
+                "A process reading the log terminated abruptly (e.g. out of "
+                "memory)"
+            ) from err
+        except Exception:
+            self.cancel()
+            raise
+        self._futures[self._next] = None
+        self._next += 1
+        if self.done:
+            self._executor.shutdown()
+        return result
+
+    def cancel(self) -> None:
+        """
+        Cancels reading of all pending chunks
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
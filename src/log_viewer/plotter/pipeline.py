@@ -0,0 +1,147 @@
+""" Pipelined J1939 import module """
+
+from dataclasses import dataclass
+import queue
+import threading
+from typing import Iterator, Optional
+
+from .j1939_decoder import J1939Decoder, J1939FrameGroups, J1939LogStream
+from .log_parsers import FrameBlock
+
+# End of the stage input
+_END = object()
+
+@dataclass
+class _StageError:
+    """
+    Exception raised by a stage passed down the pipeline
+    """
+    error: BaseException
+
+class ImportPipeline:
+    """
+    Reads a log in a pipeline of threads connected by bounded queues: the
+    reader stage parses frame blocks, the decode stage groups frames of a
+    block by data keys (see J1939Decoder.prepare_block()) and the consumer
+    (the thread calling next_groups()) accumulates them with
+    J1939Decoder.append_prepared(). The stages run concurrently, so I/O and
+    parsing of the next blocks overlap with decoding and accumulation.
+    """
+
+    # Number of blocks queued between the stages
+    QUEUE_SIZE = 4
+
+    # Interval of cancellation checks of blocked stages (seconds)
+    POLL_INTERVAL = 0.1
+
+    def __init__(self,
+                 blocks: Iterator[FrameBlock],
+                 decoder: J1939Decoder,
+                 queue_size: int = QUEUE_SIZE,
+                 stream: Optional[J1939LogStream] = None) -> None:
+        """
+        Starts reading of frame 'blocks' of the log 'stream' to be prepared
+        by 'decoder' (see J1939Decoder.prepare_block())
+        """
+        self._decoder = decoder
+        self._stream = stream
+        self._stop = threading.Event()
+        self._blocks = queue.Queue(queue_size)
+        self._groups = queue.Queue(queue_size)
+        self._done = False
+        self._threads = [
+            threading.Thread(target=self.__read, args=(blocks,),
+                             daemon=True),
+            threading.Thread(target=self.__decode, daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def done(self) -> bool:
+        """
+        Returns True if all blocks are already collected
+        """
+        return self._done
+
+    def __put(self, output: queue.Queue, item) -> bool:
+        """
+        Puts 'item' to 'output' queue waiting for a free slot until the
+        pipeline is cancelled. Returns False if it's cancelled.
+        """
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __read(self, blocks: Iterator[FrameBlock]) -> None:
+        """
+        Reader stage: parses frame blocks of the log
+        """
+        try:
+            for block in blocks:
+                if not self.__put(self._blocks, block):
+                    return
+        # pylint: disable-next=broad-exception-caught
+        except Exception as err:
+            self.__put(self._blocks, _StageError(err))
+            return
+        self.__put(self._blocks, _END)
+
+    def __decode(self) -> None:
+        """
+        Decode stage: groups frames of the read blocks by data keys
+        """
+        while not self._stop.is_set():
+            try:
+                block = self._blocks.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if block is _END or isinstance(block, _StageError):
+                self.__put(self._groups, block)
+                return
+            try:
+                item = (len(block),
+                        self._decoder.prepare_block(block, self._stream))
+            # pylint: disable-next=broad-exception-caught
+            except Exception as err:
+                self.__put(self._groups, _StageError(err))
+                return
+            if not self.__put(self._groups, item):
+                return
+
+    def next_groups(self, timeout: Optional[float] = None) \
+            -> Optional[tuple[int, Optional[J1939FrameGroups]]]:
+        """
+        Waits up to 'timeout' seconds for the next prepared block. Returns
+        the number of frames of the block and its frames grouped by data
+        keys (None if there are no frames to accumulate), or None if the
+        block isn't ready yet or all blocks are collected (see done).
+        Exceptions raised by the stages are re-raised here.
+        """
+        if self._done:
+            return None
+        try:
+            item = self._groups.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is _END:
+            self._done = True
+            return None
+        if isinstance(item, _StageError):
+            self._done = True
+            self.cancel()
+            raise item.error
+        return item
+
+    def cancel(self) -> None:
+        """
+        Stops all stages
+        """
+        self._stop.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
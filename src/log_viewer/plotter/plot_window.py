@@ -3,7 +3,7 @@
 import enum
 
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, \
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg, \
                                                NavigationToolbar2QT
 from matplotlib.figure import Figure
 import numpy as np
@@ -13,6 +13,7 @@ from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import QHeaderView, QMenu, QSplitter, QTreeWidget, \
                             QTreeWidgetItem, QVBoxLayout, QWidget
 
+from .accumulator import GrowableArray
 from .exceptions import PlotterInvalidData
 from .plotter_utils import prepare_merged_plot, get_plot_minmax, get_plot_rms
 from .toolbar import PlotterToolbar
@@ -152,6 +153,101 @@ class PlotProperties(QTreeWidget):
                 prop.value, value
             )
 
+# pylint: disable-next=too-few-public-methods
+class _PlotData:
+    """
+    Data of a plot window: plotted lines of every signal, merged plot points
+    and running totals (max, min, sum of squares) of every signal. Samples
+    appended by append() are kept in capacity-doubling buffers, so an update
+    doesn't copy the whole data.
+    """
+
+    def __init__(self, lines: dict[str, list], plot_points: pd.DataFrame) \
+            -> None:
+        """
+        Constructs the data of 'lines' (signal name -> lines of the signal)
+        and merged 'plot_points'
+        """
+        self.lines = lines
+        self.plot_points = plot_points
+        self.totals = {
+            col: self.__totals(plot_points[col].to_numpy(np.float64))
+            for col in plot_points.columns[1:]
+        }
+        # Buffers created on the first append()
+        self._line_data = {}
+        self._points = None
+        self._size = len(plot_points)
+
+    @staticmethod
+    def __totals(values: np.ndarray) -> tuple[float, float, float]:
+        """
+        Returns maximum, minimum and sum of squares of 'values' (NaN are
+        skipped)
+        """
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return np.nan, np.nan, 0.0
+        return values.max(), values.min(), np.square(values).sum()
+
+    def __extend_line(self, plot: pd.DataFrame) -> None:
+        """
+        Appends samples of 'plot' (a timestamp and a signal column) to the
+        lines of the signal
+        """
+        lines = self.lines[plot.columns[1]]
+        if plot.columns[1] not in self._line_data:
+            line_x, line_y = GrowableArray(), GrowableArray()
+            line_x.extend(lines[0].get_xdata())
+            line_y.extend(lines[0].get_ydata())
+            self._line_data[plot.columns[1]] = line_x, line_y
+        line_x, line_y = self._line_data[plot.columns[1]]
+        line_x.extend(plot.iloc[:, 0].to_numpy(np.float64))
+        line_y.extend(plot.iloc[:, 1].to_numpy(np.float64))
+        for line in lines:
+            line.set_data(line_x.data, line_y.data)
+
+    def __extend_points(self, tail: np.ndarray) -> None:
+        """
+        Appends rows of 'tail' to the merged plot points
+        """
+        size = self._size + len(tail)
+        if self._points is None or size > len(self._points):
+            points = np.empty((max(size, self._size * 2),
+                               len(self.plot_points.columns)))
+            points[:self._size] = self.plot_points.to_numpy(np.float64) \
+                if self._points is None else self._points[:self._size]
+            self._points = points
+        self._points[self._size:size] = tail
+        self._size = size
+        self.plot_points = pd.DataFrame(self._points[:size], copy=False,
+                                        columns=self.plot_points.columns)
+
+    def append(self, plots: list[pd.DataFrame]) -> None:
+        """
+        Appends new samples of the plotted signals (see
+        PlotWindow.append_data()) and adds them to the totals
+        """
+        for plot in plots:
+            self.__extend_line(plot)
+
+        # Merge new samples with the last plot point to interpolate them
+        columns = self.plot_points.columns
+        new_points = prepare_merged_plot([plots])
+        new_points.columns = [columns[0]] + list(new_points.columns[1:])
+        tail = pd.concat([self.plot_points.iloc[-1:], new_points],
+                         ignore_index=True)
+        tail = tail.reindex(columns=columns).interpolate(
+            method="linear", axis="index"
+        ).iloc[min(1, self._size):]
+        self.__extend_points(tail.to_numpy(np.float64))
+
+        for col in columns[1:]:
+            pmax, pmin, psq = self.totals[col]
+            tmax, tmin, tsq = self.__totals(tail[col].to_numpy(np.float64))
+            self.totals[col] = np.fmax(pmax, tmax), np.fmin(pmin, tmin), \
+                psq + tsq
+
 class PlotWindow(QWidget):
     """
     Class of separate window with a plot
@@ -197,6 +293,7 @@ class PlotWindow(QWidget):
         fig_rows = len(plot_set)
         ax1 = fig.add_subplot(fig_rows, 1, 1)
         cursor_axes = [ax1]
+        lines = {}
 
         for plots_idx, plots in enumerate(plot_set):
             if plots_idx > 0:
@@ -216,8 +313,11 @@ class PlotWindow(QWidget):
                     grid=True,
                     marker=marker
                 )
+                lines.setdefault(plot.columns[1], []).append(
+                    ax.get_lines()[-1]
+                )
 
-        self.plot_points = prepare_merged_plot(plot_set)
+        self._data = _PlotData(lines, prepare_merged_plot(plot_set))
 
         self.canvas = FigureCanvasQTAgg(fig)
         self.canvas.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
@@ -256,6 +356,64 @@ class PlotWindow(QWidget):
         self.setWindowTitle(title)
         self.show()
 
+    @property
+    def signals(self) -> list[str]:
+        """
+        Returns names of the plotted signals
+        """
+        return list(self._data.lines)
+
+    @property
+    def plot_points(self) -> pd.DataFrame:
+        """
+        Returns the merged plot points of all signals
+        """
+        return self._data.plot_points
+
+    def append_data(self, plots: list[pd.DataFrame]) -> None:
+        """
+        Appends new samples to the plotted signals. Every item of 'plots' is
+        a dataframe with a timestamp and a signal column (see plot_set in
+        the constructor) with samples following the plotted ones. The max,
+        min and RMS properties include the new samples unless the view is
+        zoomed (then they describe the view, see refresh_properties()).
+        """
+        plots = [x for x in plots
+                 if len(x) and x.columns[1] in self._data.lines]
+        if not plots:
+            return
+        self._data.append(plots)
+
+        zoomed = False
+        if isinstance(self.toolbar, PlotterToolbar):
+            self.toolbar.set_plot_points(self.plot_points)
+            zoomed = self.toolbar.view_changed
+        for ax in self.canvas.figure.get_axes():
+            ax.relim()
+            if not zoomed:
+                ax.autoscale_view()
+        self.canvas.draw_idle()
+
+        if not zoomed:
+            self.__show_totals()
+
+    def __show_totals(self) -> None:
+        """
+        Shows the max, min and RMS properties of the whole data of the
+        plotted signals
+        """
+        count = len(self.plot_points)
+        for col, (pmax, pmin, psq) in self._data.totals.items():
+            self.plot_properties.set_property(
+                col, PlotProperty.Max, "N/A" if np.isnan(pmax) else str(pmax)
+            )
+            self.plot_properties.set_property(
+                col, PlotProperty.Min, "N/A" if np.isnan(pmin) else str(pmin)
+            )
+            self.plot_properties.set_property(
+                col, PlotProperty.RMS, str(np.sqrt(psq / count))
+            )
+
     @pyqtSlot()
     def refresh_properties(self) -> None:
         """
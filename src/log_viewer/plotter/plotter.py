@@ -2,18 +2,32 @@
 
 from abc import ABC, abstractmethod
 import enum
-import json
+import itertools
 import os
-import tempfile
+import time
+from typing import Optional, Union
 
-import can
-import cantools
 import numpy
 import pandas as pd
 from scipy import fft
 
+from .derived_signals import DerivedSignals
+from .dtypes import signal_dtype
 from .exceptions import PlotterInitError, PlotterPlotError
+from .j1939_decoder import J1939Decoder, J1939ImportFilter, J1939LogStream, \
+                           J1939RawFrames, changed_frame_ids, \
+                           load_j1939_database
+from .log_cache import LogCache
+from .log_index import join_chunks, load_log_index
+from .log_parsers import iter_frame_blocks, iter_message_blocks, \
+                         open_log_tail
+from .log_readers import LogChunk, open_log_reader, read_log_chunk, \
+                         split_log
+from .parallel import ParallelJ1939Import
+from .pipeline import ImportPipeline
 from .plot_window import PlotWindow
+from .raw_frames import RawFrameStore
+from .signal_samples import SignalSamples
 
 class LogOpenProgress(enum.Enum):
     """
@@ -26,33 +40,57 @@ class LogOpenProgress(enum.Enum):
 
 class BasePlotter(ABC):
     """
-    Abstract base plotter
+    Abstract base plotter. Signals are stored separately as SignalSamples,
+    so signals sampled at different times don't need NaN padding. Derived
+    signals are evaluated from the log signals by the expressions compiled
+    once and are kept until their input signals change (see
+    DerivedSignals).
     """
 
     TIMESTAMP_DEFAULT = "timestamp"
 
     def __init__(self,
-                 filename: os.PathLike[str]) -> None:
-
+                 filename: os.PathLike[str],
+                 derived: Optional[dict[str, str]] = None,
+                 timestamp: str = TIMESTAMP_DEFAULT) -> None:
+        """
+        'derived' maps names of derived signals to their expressions. A
+        derived signal hides a log signal of the same name. 'timestamp' is
+        the label of the timestamps in the frames of samples.
+        """
         if not os.path.isfile(filename):
             raise PlotterInitError
 
+        try:
+            self._derived = DerivedSignals(derived or {})
+        except ValueError as err:
+            raise PlotterInitError(str(err)) from err
+
         self._filename = filename
         self._opened = False
-        self._df = pd.DataFrame()
-        self._timestamp = self.TIMESTAMP_DEFAULT
+        self._signals = {}
+        self._timestamp = timestamp
+        self._update_starts = {}
 
     @property
     def plot_vars(self) -> list[str]:
         """
-        Returns a list of plot vars labels
+        Returns a list of plot vars labels: the log signals followed by the
+        derived signals whose inputs are available
         """
-        if self._opened:
-            pvars = list(self._df)
-            if self._timestamp in pvars:
-                pvars.remove(self._timestamp)
-            return pvars
-        return []
+        if not self._opened:
+            return []
+        log_vars = [x for x in self._log_vars if x not in self._derived]
+        return log_vars + self._derived.available(log_vars)
+
+    @property
+    def _log_vars(self) -> list[str]:
+        """
+        Returns a list of the log signals of the opened log. Can be
+        overriden by the child classes which don't keep all signals in
+        self._signals.
+        """
+        return list(self._signals)
 
     @property
     def is_opened(self) -> bool:
@@ -61,6 +99,22 @@ class BasePlotter(ABC):
         """
         return self._opened
 
+    @property
+    def processed(self) -> int:
+        """
+        Returns a number of currently processed messages while opening.
+        Should be overriden by the child classes which are opened in steps.
+        """
+        return 0
+
+    @property
+    def progress(self) -> Optional[float]:
+        """
+        Returns the read fraction of the log while opening (None if it's
+        unknown). Can be overriden by the child classes.
+        """
+        return None
+
     @abstractmethod
     def open(self) -> LogOpenProgress:
         """
@@ -68,6 +122,111 @@ class BasePlotter(ABC):
         """
         return LogOpenProgress.OPEN_FAILED
 
+    def cancel_open(self) -> None:
+        """
+        Aborts the opening process in progress. Should be overriden by the
+        child classes which are opened in steps.
+        """
+
+    def update(self) -> bool:
+        """
+        Reads data appended to the file since the opening or the previous
+        update (follow mode). Returns True if there is new data. Should be
+        overriden by the child classes which support the follow mode.
+        """
+        return False
+
+    def new_samples(self, var: str) -> pd.DataFrame:
+        """
+        Returns a DataFrame with the timestamp and 'var' columns of the 'var'
+        samples read by the last update()
+        """
+        if var in self._derived:
+            return self._samples_frame(var, self.__derived_signal(var).tail(
+                self._derived.update_start(var)
+            ))
+        return self._samples_frame(
+            var, self._signal(var).tail(self._update_starts.get(var, 0))
+        )
+
+    def samples(self, var: str) -> SignalSamples:
+        """
+        Returns the samples of signal 'var' of the opened log
+        """
+        if not self._opened:
+            raise PlotterPlotError
+        return self.__any_signal(var)
+
+    def _set_opened(self) -> None:
+        """
+        Marks the log as opened with the signals read so far preceding the
+        first update
+        """
+        self._start_update()
+        self._opened = True
+
+    def _start_update(self) -> None:
+        """
+        Marks the log signals read and the derived signals evaluated so far
+        as the ones preceding the update. Should be called by update() of
+        the child classes.
+        """
+        self._update_starts = {var: len(samples)
+                               for var, samples in self._signals.items()}
+        self._derived.start_update()
+
+    def __any_signal(self, var: str) -> SignalSamples:
+        """
+        Returns the samples of either derived or log signal 'var'
+        """
+        if var in self._derived:
+            return self.__derived_signal(var)
+        return self._signal(var)
+
+    def __derived_signal(self, var: str) -> SignalSamples:
+        """
+        Returns the samples of derived signal 'var'. The signal is evaluated
+        again only if the samples of its inputs are changed since the
+        previous evaluation. Raises PlotterPlotError if an input is missing
+        or the expression can't be evaluated.
+        """
+        try:
+            inputs = [self.__any_signal(x) for x in self._derived.inputs(var)]
+        except KeyError as err:
+            raise PlotterPlotError(
+                f"Signal {err} of derived signal {var} not found"
+            ) from err
+        try:
+            return self._derived.evaluate(var, inputs)
+        except (TypeError, ValueError) as err:
+            raise PlotterPlotError(
+                f"Failed to evaluate derived signal {var}: {err}"
+            ) from err
+
+    def _signal(self, var: str) -> SignalSamples:
+        """
+        Returns the samples of signal 'var'. Can be overriden by the child
+        classes which don't keep all signals in self._signals.
+        """
+        return self._signals[var]
+
+    def _samples_frame(self, var: str, samples: SignalSamples) -> pd.DataFrame:
+        """
+        Returns a DataFrame with the timestamp and 'var' columns of 'samples'
+        which refers to the sample arrays without copying unless compact
+        samples are promoted to float
+        """
+        samples = samples.expand()
+        return pd.DataFrame({self._timestamp: samples.timestamps,
+                             var: samples.values}, copy=False)
+
+    def _signal_frame(self, var: str) -> pd.DataFrame:
+        """
+        Returns a DataFrame with the timestamp and 'var' columns of the 'var'
+        samples
+        """
+        return self._samples_frame(var, self.__any_signal(var))
+
     # pylint: disable-next=too-many-locals,too-many-arguments,too-many-positional-arguments
     def plot(self,
              vars_set: list[list[str]],
@@ -94,19 +253,13 @@ class BasePlotter(ABC):
             if spectrum:
                 for var in pvars:
                     fft_df = pd.DataFrame()
-                    df = self._df.dropna(subset=var)
-                    sig_len = df[self._timestamp].size
-                    fft_df["freqs"] = fft.rfftfreq(sig_len)
-                    fft_df[var] = fft.rfft(df[var].values)
-                    fft_df[var] = fft_df[var].apply(numpy.abs)
+                    samples = self.__any_signal(var).expand()
+                    fft_df["freqs"] = fft.rfftfreq(len(samples))
+                    fft_df[var] = numpy.abs(fft.rfft(samples.values))
                     plots.append(fft_df)
             else:
                 for var in pvars:
-                    plots.append(
-                        self._df.filter([self._timestamp, var]).dropna(
-                            subset=var
-                        )
-                    )
+                    plots.append(self._signal_frame(var))
             if plots:
                 plot_set.append(plots)
 
@@ -123,83 +276,99 @@ class BasePlotter(ABC):
             marker=marker
         )
 
-class SimpleCsvPlotter(BasePlotter):
-    """
-    Plotter to plot CSV data
-    """
-
-    def __init__(self,
-                 filename: os.PathLike[str],
-                 delimiter: str,
-                 timestamp: str,
-                 scales: dict[str, float]) -> None:
-        super().__init__(filename)
-
-        if not delimiter or not timestamp:
-            raise PlotterInitError
-
-        self._timestamp = timestamp
-        self._delimiter = delimiter
-        self._scales = scales
-
-    def open(self) -> LogOpenProgress:
-        """
-        Performs an opening process
-        """
-        self._df = pd.read_csv(self._filename, delimiter=self._delimiter)
-        columns = list(self._df.columns)
-        if self._timestamp in columns:
-            self._df = self._df.sort_values(by=[self._timestamp])
-        else:
-            self._df[self._timestamp] = range(0, len(self._df))
-
-        # Apply scales
-        for var, scale in self._scales.items():
-            if var in columns:
-                # pylint: disable-next=cell-var-from-loop
-                self._df[var] = self._df[var].apply(lambda x: x * scale)
-
-        self._opened = True
-        return LogOpenProgress.OPEN_COMPLETED
-
 # pylint: disable-next=too-many-instance-attributes
 class J1939DumpPlotter(BasePlotter):
     """
     Plotter to plot various J1939 dump data
     """
 
-    MASK_WO_SA = 0xffffff00
-    PDU1_TEMPLATE = "{can}SA{sa}.PDU1.DA{da}.{msg}"
-    PDU2_TEMPLATE = "{can}SA{sa}.PDU2.GE{ge}.{msg}"
+    # Size of the log chunks read in parallel. Logs smaller than two chunks
+    # are always read in the current process.
+    PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024
 
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
     def __init__(self,
-                 filename: os.PathLike[str],
+                 filename: Union[os.PathLike[str], list[os.PathLike[str]]],
                  dbc_files: list[str],
                  asc_base: str = "hex",
-                 asc_rel_timestamp: bool = True) -> None:
-        super().__init__(filename)
+                 asc_rel_timestamp: bool = True,
+                 workers: int = 1,
+                 cache: Optional[LogCache] = None,
+                 follow: bool = False,
+                 import_filter: Optional[J1939ImportFilter] = None,
+                 time_range: Optional[tuple[float, float]] = None,
+                 compact: bool = False,
+                 pipelined: bool = False,
+                 keep_raw: bool = False,
+                 derived: Optional[dict[str, str]] = None) -> None:
+        """
+        'filename' is either a log or a list of logs (e.g. consecutive parts
+        of a test run or logs of different CAN channels) opened as a single
+        log: the logs are read separately (in parallel if 'workers' allow) and
+        their frames are merged into one timeline in the timestamp order.
+        'workers' is a number of processes used to read the logs (0 - use all
+        CPU cores). Decoded data and the parsed database are reused from/saved
+        to 'cache' if given. In 'follow' mode .log and .asc logs are read
+        sequentially, a trailing line without a line break is considered
+        incomplete and is read by update() once it's completed (a single log
+        only). Frames rejected by 'import_filter' are skipped before decoding.
+        If 'time_range' (start, end) is given, only the frames with timestamps
+        within it are read: the log parts to read are found with a sparse
+        index of the log which is kept in 'cache' along with decoded data. In
+        'compact' mode decoded values are stored in the narrowest dtype which
+        holds the signal range and timestamps are stored as int64 nanoseconds.
+        If 'pipelined', a log read in the current process is parsed and its
+        frames are grouped in background threads (see ImportPipeline) while
+        open() accumulates them. If 'keep_raw', all read frames are kept in
+        memory (and in 'cache'), so redecode() applies other databases without
+        parsing the logs again. 'derived' maps names of derived signals to
+        their expressions (see BasePlotter).
+        """
+        filenames = list(filename) if isinstance(filename, (list, tuple)) \
+            else [filename]
+        if not filenames or not all(os.path.isfile(x) for x in filenames):
+            raise PlotterInitError
+
+        super().__init__(filenames[0], derived)
 
-        if not dbc_files:
+        if not dbc_files or (follow and len(filenames) > 1):
             raise PlotterInitError
 
         if not any(os.path.isfile(x) for x in dbc_files):
             raise PlotterInitError
 
-        self._db = cantools.db.Database(frame_id_mask=self.MASK_WO_SA)
-        for dbc_file_path in dbc_files:
-            self._db.add_dbc_file(dbc_file_path)
-        for msg in self._db._messages:
-            msg._frame_id &= self.MASK_WO_SA
-        self._db.refresh()
+        self._filenames = filenames
+        self._dbc_files = dbc_files
+        self._db = load_j1939_database(
+            dbc_files, cache.directory if cache is not None else None
+        )
 
         self._asc_base = asc_base
         self._asc_rel_timestamp = asc_rel_timestamp
+        self._workers = workers if workers > 0 else os.cpu_count() or 1
+        self._cache = cache
+        self._cache_key = None
+        self._follow = follow
+        self._tail = None
+        self._import_filter = import_filter
+        self._time_range = time_range
+        self._compact = compact
+        self._pipelined = pipelined
+        self._keep_raw = keep_raw
 
         self._open_progress = LogOpenProgress.OPEN_NOT_STARTED
         self._processed = 0
-        self._reader = None
         self._msg_iterator = None
-        self._temp_file = None
+        self._block_iterator = None
+        self._parallel = None
+        self._parallel_decoders = []
+        self._pipeline = None
+        self._decoder = None
+        self._decoders = []
+        self._stream = None
+        self._raw = None
+        self._plot_vars = []
+        self._update_start = 0
 
     @property
     def processed(self) -> int:
@@ -208,22 +377,361 @@ class J1939DumpPlotter(BasePlotter):
         """
         return self._processed
 
-    def __decode_message(self, msg: can.Message) -> tuple:
+    @property
+    def _log_vars(self) -> list[str]:
         """
-        Returns a tuple of message name and message data for the given
-        CAN message 'msg'
+        Returns a list of the signals decoded from the opened logs
         """
-        frame_id = msg.arbitration_id & self.MASK_WO_SA
-        # pylint: disable-next=protected-access
-        if frame_id in self._db._frame_id_to_message:
-            _msg = self._db.get_message_by_frame_id(frame_id)
-            return (_msg.name, _msg.decode(msg.data, decode_choices=False))
-        return (None, None)
+        return self._plot_vars
 
-    # pylint: disable-next=too-many-branches,too-many-statements
-    def open(self) -> LogOpenProgress:
+    def update(self) -> bool:
+        """
+        Reads frames appended to the file since the opening or the previous
+        update (follow mode only, .log and .asc logs)
+        """
+        if not self._opened or self._tail is None:
+            return False
+        self._start_update()
+        self._update_start = len(self._decoder)
+        for block in self._tail.read():
+            self._decoder.append_block(block, self._stream)
+            self._processed += len(block)
+        if len(self._decoder) == self._update_start:
+            return False
+        self._plot_vars = self._decoder.signal_keys
+        self._signals = {}
+        return True
+
+    def new_samples(self, var: str) -> pd.DataFrame:
+        """
+        Decodes signal 'var' from the frames read by the last update()
+        """
+        if var in self._derived:
+            return super().new_samples(var)
+        return self._samples_frame(var, SignalSamples(
+            *self._decoder.decode_signal(var, self._update_start)
+        ))
+
+    def _signal(self, var: str) -> SignalSamples:
+        """
+        Decodes signal 'var' from the raw frames on the first request
+        """
+        try:
+            return self._signals[var]
+        except KeyError:
+            samples = SignalSamples(*self._decoder.decode_signal(var))
+            if self._compact:
+                samples = samples.compact(
+                    signal_dtype(self._decoder.signal(var)), True
+                )
+            self._signals[var] = samples
+            return samples
+
+    def __make_cache_key(self) -> str:
+        """
+        Returns the cache key of the decoded data
         """
-        Performs an opening step
+        return self._cache.make_key(
+            self._filenames + list(self._dbc_files),
+            [
+                len(self._filenames),
+                self._asc_base,
+                self._asc_rel_timestamp,
+                repr(self._import_filter),
+                repr(self._time_range),
+                self._keep_raw
+            ]
+        )
+
+    def __start_open(self) -> bool:
+        """
+        Prepares the reading of the logs either in the current process or
+        across a pool of processes. Returns True if the decoded data is
+        loaded from the cache instead.
+        """
+        self._processed = 0
+        self._signals = {}
+        self._raw = RawFrameStore() if self._keep_raw else None
+        self._decoders = [
+            J1939Decoder(self._db, self._timestamp, self._import_filter,
+                         self._time_range)
+            for _ in self._filenames
+        ]
+        self._decoder = self._decoders[0]
+        if self._cache is not None and not self._follow:
+            self._cache_key = self.__make_cache_key()
+            arrays = self._cache.load(self._cache_key)
+            if arrays is not None:
+                self._decoders = []
+                self.__merge_frames(self._decoder,
+                                    J1939RawFrames.from_arrays(arrays))
+                self.__finish_open(store=False)
+                return True
+
+        if self._workers > 1 and not self._follow:
+            chunks = []
+            self._parallel_decoders = []
+            for decoder, filename in zip(self._decoders, self._filenames):
+                file_chunks = self.__selected_chunks(filename)
+                if file_chunks is None:
+                    file_chunks = split_log(filename, self.PARALLEL_CHUNK_SIZE)
+                chunks += file_chunks
+                self._parallel_decoders += [decoder] * len(file_chunks)
+            if len(chunks) > 1:
+                self._parallel = ParallelJ1939Import(
+                    chunks,
+                    min(self._workers, len(chunks)),
+                    self._db,
+                    self._asc_base,
+                    self._asc_rel_timestamp,
+                    self._timestamp,
+                    self._import_filter,
+                    self._time_range,
+                    self._keep_raw
+                )
+                return False
+
+        self.__start_file(0)
+        return False
+
+    def __selected_chunks(self, filename: str) -> Optional[list[LogChunk]]:
+        """
+        Returns the chunks of the log 'filename' which may contain frames of
+        the time range (None if the whole log is read)
+        """
+        if self._time_range is None or self._follow:
+            return None
+        index = load_log_index(filename, self._asc_base,
+                               self._asc_rel_timestamp, self._cache)
+        return join_chunks(index.select(*self._time_range),
+                           self.PARALLEL_CHUNK_SIZE)
+
+    def __merge_frames(self,
+                       decoder: J1939Decoder,
+                       frames: J1939RawFrames) -> None:
+        """
+        Appends raw 'frames' (e.g. read by a worker process) to 'decoder'
+        and their read frames to the raw frame store if they are kept
+        """
+        if self._raw is not None and frames.raw is not None:
+            self._raw.merge(frames.raw)
+        decoder.merge_frames(frames)
+
+    def __start_file(self, file_index: int) -> None:
+        """
+        Prepares the reading of the log 'file_index' in the current process
+        """
+        filename = self._filenames[file_index]
+        self._decoder = self._decoders[file_index]
+        self._stream = J1939LogStream(self._db, self._raw)
+        chunks = self.__selected_chunks(filename)
+        if chunks is not None:
+            blocks = [iter_frame_blocks(x, self._asc_base,
+                                        self._asc_rel_timestamp)
+                      for x in chunks]
+            if all(x is not None for x in blocks):
+                self._block_iterator = itertools.chain.from_iterable(blocks)
+            else:
+                self._msg_iterator = itertools.chain.from_iterable(
+                    read_log_chunk(x, self._asc_base, self._asc_rel_timestamp)
+                    for x in chunks
+                )
+        else:
+            self._tail = open_log_tail(filename,
+                                       self._asc_base,
+                                       self._asc_rel_timestamp)
+            if self._tail is not None:
+                self._block_iterator = self._tail.read(final=not self._follow)
+            else:
+                self._msg_iterator = iter(open_log_reader(
+                    filename, self._asc_base, self._asc_rel_timestamp
+                ))
+        if self._pipelined:
+            self._pipeline = ImportPipeline(
+                self._block_iterator or iter_message_blocks(self._msg_iterator),
+                self._decoder,
+                stream=self._stream
+            )
+            self._block_iterator = None
+            self._msg_iterator = None
+
+    def __next_file(self) -> None:
+        """
+        Starts reading of the next log after the end of the current one or
+        finishes the opening after the last one
+        """
+        file_index = self._decoders.index(self._decoder) + 1
+        if file_index < len(self._decoders):
+            self._msg_iterator = None
+            self._block_iterator = None
+            self._pipeline = None
+            self._tail = None
+            self.__start_file(file_index)
+        else:
+            self.__finish_open()
+
+    def __finish_open(self, store: bool = True) -> None:
+        """
+        Merges the frames of all logs into one timeline and collects the
+        signals of the accumulated frames at the end of file. The frames are
+        stored to the cache unless 'store' is False.
+        """
+        self._msg_iterator = None
+        self._block_iterator = None
+        self._pipeline = None
+        if not self._follow:
+            self._tail = None
+        if len(self._decoders) > 1:
+            sources = [x.export_frames() for x in self._decoders]
+            self._decoders = []
+            self._decoder = J1939Decoder(self._db, self._timestamp,
+                                         self._import_filter,
+                                         self._time_range)
+            self._decoder.merge_timelines(sources)
+        self._decoders = []
+        # A followed log may get the data later
+        if len(self._decoder) > 0 or self._tail is not None:
+            self._plot_vars = self._decoder.signal_keys
+            self._update_start = len(self._decoder)
+            self._opened = True
+            self._open_progress = LogOpenProgress.OPEN_COMPLETED
+            if store and self._cache is not None and not self._follow:
+                self._cache.store(
+                    self._cache_key,
+                    self._decoder.export_frames(self._raw).to_arrays()
+                )
+        else:
+            self._decoder = None
+            self._open_progress = LogOpenProgress.OPEN_FAILED
+            raise ImportError("No data to plot in the given file",
+                              path=self._filename)
+
+    def redecode(self, dbc_files: list[str]) -> None:
+        """
+        Decodes the opened logs with the databases 'dbc_files' from the raw
+        frames kept in 'keep_raw' mode without parsing the logs again. Only
+        the frames of the messages defined differently in the new databases
+        are decoded (see J1939Decoder.redecode()), the signals decoded so
+        far are kept for the other ones.
+        """
+        if not self._opened or self._raw is None:
+            raise PlotterPlotError("Raw frames of the log aren't kept")
+        if not any(os.path.isfile(x) for x in dbc_files):
+            raise PlotterInitError
+        db = load_j1939_database(
+            dbc_files, self._cache.directory if self._cache is not None
+            else None
+        )
+        changed = changed_frame_ids(self._db, db)
+        self._signals = {
+            var: samples for var, samples in self._signals.items()
+            if self._decoder.message(var).frame_id not in changed
+        }
+        self._decoder = self._decoder.redecode(db, self._raw)
+        self._stream = J1939LogStream(db, self._raw)
+        self._db = db
+        self._dbc_files = dbc_files
+        self._plot_vars = self._decoder.signal_keys
+        self._update_start = len(self._decoder)
+        if self._cache is not None and not self._follow:
+            self._cache_key = self.__make_cache_key()
+            self._cache.store(
+                self._cache_key,
+                self._decoder.export_frames(self._raw).to_arrays()
+            )
+
+    def __parallel_step(self, deadline: Optional[float]) -> None:
+        """
+        Merges the chunks read by the pool of processes so far (until
+        'deadline' if given, otherwise until the end of file) into the
+        decoders of their logs
+        """
+        while not self._parallel.done:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            result = self._parallel.next_result(timeout)
+            if result is None:
+                return
+            processed, frames = result
+            self.__merge_frames(self._parallel_decoders.pop(0), frames)
+            self._processed += processed
+        self._parallel = None
+        self.__finish_open()
+
+    def __pipeline_step(self,
+                        max_messages: int,
+                        deadline: Optional[float]) -> None:
+        """
+        Accumulates the blocks prepared by the pipeline so far (up to
+        'max_messages' messages and until 'deadline' if given)
+        """
+        processed = 0
+        while processed < max_messages:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            result = self._pipeline.next_groups(timeout)
+            if result is None:
+                break
+            count, groups = result
+            if groups is not None:
+                self._decoder.append_prepared(groups)
+            processed += count
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        self._processed += processed
+        if self._pipeline.done:
+            self.__next_file()
+
+    def __block_step(self,
+                     max_messages: int,
+                     deadline: Optional[float]) -> None:
+        """
+        Reads and accumulates frame blocks of the log (up to 'max_messages'
+        messages and until 'deadline' if given)
+        """
+        processed = 0
+        for block in self._block_iterator:
+            self._decoder.append_block(block, self._stream)
+            processed += len(block)
+            if processed >= max_messages or (
+                    deadline is not None and time.monotonic() >= deadline):
+                break
+        self._processed += processed
+        if processed == 0:
+            self.__next_file()
+
+    def __message_step(self,
+                       max_messages: int,
+                       deadline: Optional[float]) -> None:
+        """
+        Reads and accumulates single messages of the log (up to
+        'max_messages' messages and until 'deadline' if given)
+        """
+        processed = 0
+        append = self._decoder.append
+        for msg in itertools.islice(self._msg_iterator, max_messages):
+            append(msg, self._stream)
+            processed += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        self._processed += processed
+        if processed == 0:
+            self.__next_file()
+
+    def open(self,
+             max_messages: int = 1,
+             time_budget: Optional[float] = None) -> LogOpenProgress:
+        """
+        Performs an opening step. A single step reads up to 'max_messages'
+        messages and stops earlier if 'time_budget' (in seconds) is given and
+        exceeded. When the log is read in parallel, a step collects all chunks
+        completed within 'time_budget'. Fast text parsers and the pipeline
+        read whole blocks of frames, so a step may exceed 'max_messages' by a
+        part of a block.
+        Signals are decoded from the read frames later on the first plot
+        request.
         """
 
         if self._open_progress == LogOpenProgress.OPEN_FAILED:
@@ -232,81 +740,41 @@ class J1939DumpPlotter(BasePlotter):
             return self._open_progress
 
         if self._open_progress == LogOpenProgress.OPEN_NOT_STARTED:
-            # Select the reader
-            _, ext = os.path.splitext(self._filename)
-            if ext == ".log":
-                self._reader = can.CanutilsLogReader(self._filename)
-            elif ext == ".asc":
-                self._reader = can.ASCReader(self._filename,
-                                             self._asc_base,
-                                             self._asc_rel_timestamp)
-            elif ext == ".blf":
-                self._reader = can.BLFReader(self._filename)
-            elif ext == ".csv":
-                self._reader = can.CSVReader(self._filename)
-            else:
-                raise ImportError("Format is not supported",
-                                  path=self._filename)
-
-            # Generate an iterator
-            self._msg_iterator = iter(self._reader)
-
-            self._processed = 0
+            if self.__start_open():
+                return self._open_progress
             self._open_progress = LogOpenProgress.OPEN_IN_PROGRESS
-            # pylint: disable-next=consider-using-with
-            self._temp_file = tempfile.NamedTemporaryFile(
-                delete=False, mode='w+', suffix='.jsonl'
-            )
 
-        try:
-            msg = next(self._msg_iterator)
-        except StopIteration as exc:
-            self._temp_file.flush()
-            self._temp_file.seek(0)
-            self._df = pd.read_json(
-                self._temp_file.name, lines=True, convert_dates=False
-            )
-            print(self._temp_file.name)
-            self._temp_file.close()
-            os.unlink(self._temp_file.name)
-            self._df.dropna(axis="columns", how="all", inplace=True)
-            if self._timestamp in self._df.columns:
-                self._opened = True
-                self._open_progress = LogOpenProgress.OPEN_COMPLETED
-            else:
-                self._open_progress = LogOpenProgress.OPEN_FAILED
-                raise ImportError("No data to plot in the given file",
-                                  path=self._filename) from exc
-        else:
-            decoded = self.__decode_message(msg)
-            if decoded[0]:
-                if msg.channel:
-                    if isinstance(msg.channel, str):
-                        can_ch = msg.channel + "."
-                    else:
-                        can_ch = "CAN" + str(msg.channel) + "."
-                else:
-                    can_ch = ""
-                frame_unp = cantools.j1939.frame_id_unpack(msg.arbitration_id)
-                if cantools.j1939.is_pdu_format_1(frame_unp.pdu_format):
-                    data_key = self.PDU1_TEMPLATE.format(
-                        can=can_ch,
-                        sa=str(frame_unp.source_address),
-                        da=str(frame_unp.pdu_specific),
-                        msg=decoded[0]
-                    )
-                else:
-                    data_key = self.PDU2_TEMPLATE.format(
-                        can=can_ch,
-                        sa=str(frame_unp.source_address),
-                        ge=str(frame_unp.pdu_specific),
-                        msg=decoded[0]
-                    )
-                msg_data = {self._timestamp: msg.timestamp}
-                for sig, value in decoded[1].items():
-                    msg_data[data_key + "." + sig] = value
-                json.dump(msg_data, self._temp_file)
-                self._temp_file.write('\n')
-            self._processed += 1
+        deadline = None
+        if time_budget is not None:
+            deadline = time.monotonic() + time_budget
 
+        if self._parallel is not None:
+            self.__parallel_step(deadline)
+        elif self._pipeline is not None:
+            self.__pipeline_step(max_messages, deadline)
+        elif self._block_iterator is not None:
+            self.__block_step(max_messages, deadline)
+        else:
+            self.__message_step(max_messages, deadline)
         return self._open_progress
+
+    def cancel_open(self) -> None:
+        """
+        Aborts the opening process in progress
+        """
+        if self._parallel is not None:
+            self._parallel.cancel()
+            self._parallel = None
+        if self._pipeline is not None:
+            self._pipeline.cancel()
+            self._pipeline = None
+        self._msg_iterator = None
+        self._block_iterator = None
+        self._tail = None
+        self._decoder = None
+        self._decoders = []
+        self._parallel_decoders = []
+        self._stream = None
+        self._raw = None
+        if self._open_progress == LogOpenProgress.OPEN_IN_PROGRESS:
+            self._open_progress = LogOpenProgress.OPEN_NOT_STARTED
@@ -0,0 +1,183 @@
+""" Raw CAN frames store module """
+
+import json
+from typing import Optional, Union
+
+import can
+import numpy as np
+
+from .accumulator import GrowableArray
+from .log_parsers import FrameBlock, iter_message_blocks
+
+# Payload widths of classic CAN and CAN FD frames
+CLASSIC_WIDTH = 8
+FD_WIDTH = 64
+
+def raw_frame_dtype(width: int) -> np.dtype:
+    """
+    Returns the structured dtype of raw frames with 'width' bytes payloads
+    """
+    return np.dtype([("timestamp", np.float64),
+                     ("channel", np.uint16),
+                     ("arbitration_id", np.uint32),
+                     ("dlc", np.uint8),
+                     ("data", np.uint8, (width,))])
+
+class RawFrameStore:
+    """
+    Compact store of all frames read from a log as a structured array of
+    timestamp, channel index (see channels), arbitration id, data length and
+    payload. The payload is 8 bytes wide until a CAN FD frame is stored,
+    then all frames are widened to 64 bytes.
+    """
+
+    # Messages collected before they are stored as a block
+    PENDING_MESSAGES = 10000
+
+    def __init__(self) -> None:
+        self._frames = GrowableArray(raw_frame_dtype(CLASSIC_WIDTH))
+        self._channels = []
+        self._channel_index = {}
+        self._pending = []
+
+    def __len__(self) -> int:
+        return len(self._frames) + len(self._pending)
+
+    @property
+    def channels(self) -> list[Optional[Union[int, str]]]:
+        """
+        Returns the channels referred by the channel indexes of the frames
+        """
+        return self._channels
+
+    @property
+    def frames(self) -> np.ndarray:
+        """
+        Returns the stored frames as a structured array
+        """
+        self.__flush()
+        return self._frames.data
+
+    def __channel(self, channel: Optional[Union[int, str]]) -> int:
+        """
+        Returns the index of 'channel' in the store
+        """
+        try:
+            return self._channel_index[channel]
+        except KeyError:
+            index = len(self._channels)
+            self._channels.append(channel)
+            self._channel_index[channel] = index
+            return index
+
+    def __widen(self, width: int) -> None:
+        """
+        Widens payloads of the stored frames to hold 'width' bytes
+        """
+        current = self._frames.data.dtype["data"].shape[0]
+        if width <= current:
+            return
+        frames = self._frames.data
+        widened = GrowableArray(raw_frame_dtype(FD_WIDTH))
+        widened.reserve(max(len(frames), GrowableArray.INITIAL_CAPACITY))
+        records = np.zeros(len(frames), widened.data.dtype)
+        for name in ("timestamp", "channel", "arbitration_id", "dlc"):
+            records[name] = frames[name]
+        records["data"][:, :current] = frames["data"]
+        widened.extend(records)
+        self._frames = widened
+
+    def __flush(self) -> None:
+        """
+        Stores the pending messages
+        """
+        if self._pending:
+            pending, self._pending = self._pending, []
+            for block in iter_message_blocks(pending, len(pending)):
+                self.extend(block)
+
+    def append(self, msg: can.Message) -> None:
+        """
+        Appends a message read by python-can
+        """
+        self._pending.append(msg)
+        if len(self._pending) >= self.PENDING_MESSAGES:
+            self.__flush()
+
+    def extend(self,
+               block: FrameBlock,
+               selected: Optional[np.ndarray] = None) -> None:
+        """
+        Appends frames of 'block' ('selected' rows only if given)
+        """
+        self.__flush()
+        if selected is not None:
+            indexes = np.flatnonzero(selected)
+        else:
+            indexes = slice(None)
+        width = block.payloads.shape[1]
+        self.__widen(FD_WIDTH if width > CLASSIC_WIDTH else width)
+        channels = np.array([self.__channel(x) for x in block.channels],
+                            np.uint16)
+        timestamps = block.timestamps[indexes]
+        records = np.zeros(len(timestamps), self._frames.data.dtype)
+        records["timestamp"] = timestamps
+        if len(channels):
+            records["channel"] = channels[block.channel_index[indexes]]
+        records["arbitration_id"] = block.arbitration_ids[indexes]
+        records["dlc"] = block.lengths[indexes]
+        records["data"][:, :width] = block.payloads[indexes]
+        self._frames.extend(records)
+
+    def merge(self, other: "RawFrameStore") -> None:
+        """
+        Appends all frames of 'other' store
+        """
+        frames = other.frames
+        if len(frames) == 0:
+            return
+        self.__flush()
+        self.__widen(frames.dtype["data"].shape[0])
+        channels = np.array([self.__channel(x) for x in other.channels],
+                            np.uint16)
+        records = np.zeros(len(frames), self._frames.data.dtype)
+        for name in ("timestamp", "arbitration_id", "dlc"):
+            records[name] = frames[name]
+        records["channel"] = channels[frames["channel"]]
+        records["data"][:, :frames.dtype["data"].shape[0]] = frames["data"]
+        self._frames.extend(records)
+
+    def select(self, selected: np.ndarray) -> FrameBlock:
+        """
+        Returns 'selected' frames (a mask or indexes of the frames) ordered
+        by timestamps as a frame block
+        """
+        frames = self.frames[selected]
+        frames = frames[np.argsort(frames["timestamp"], kind="stable")]
+        return FrameBlock(frames["timestamp"],
+                          list(self._channels),
+                          frames["channel"].astype(np.int64),
+                          frames["arbitration_id"],
+                          frames["dlc"],
+                          frames["data"])
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Returns the store as a flat dict of arrays (e.g. to be saved with
+        numpy.savez())
+        """
+        return {"raw_frames": self.frames,
+                "raw_channels": np.array(json.dumps(self._channels))}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "RawFrameStore":
+        """
+        Constructs the store from a dict of arrays returned by to_arrays()
+        """
+        store = cls()
+        frames = arrays["raw_frames"]
+        store._frames = GrowableArray(frames.dtype)
+        store._frames.extend(frames)
+        for channel in json.loads(str(arrays["raw_channels"])):
+            store.__channel(channel)
+        return store
@@ -0,0 +1,137 @@
+""" Vectorized CAN signal decoder module """
+
+from typing import Optional
+
+import cantools
+import numpy as np
+
+def _needed_bytes(signal: cantools.database.can.Signal) -> int:
+    """
+    Returns the number of payload bytes needed to decode 'signal'
+    """
+    if signal.byte_order == "little_endian":
+        last_bit = signal.start + signal.length - 1
+    else:
+        last_bit = (signal.start // 8) * 8 + (7 - signal.start % 8) + \
+                   signal.length - 1
+    return last_bit // 8 + 1
+
+def _extract_raw(signal: cantools.database.can.Signal,
+                 payloads: np.ndarray) -> np.ndarray:
+    """
+    Returns unsigned raw values of 'signal' extracted from the 2D uint8 array
+    'payloads' (one frame per row)
+    """
+    length = signal.length
+    if signal.byte_order == "little_endian":
+        lsb = signal.start
+    else:
+        # Position of the MSB in the big-endian bit stream of the payload
+        msb = (signal.start // 8) * 8 + (7 - signal.start % 8)
+
+    if payloads.shape[1] <= 8:
+        # Fast path: the whole payload fits into a 64-bit integer
+        padded = np.zeros((payloads.shape[0], 8), dtype=np.uint8)
+        padded[:, :payloads.shape[1]] = payloads
+        if signal.byte_order == "little_endian":
+            raw = padded.view("<u8")[:, 0] >> np.uint64(lsb)
+        else:
+            raw = padded.view(">u8")[:, 0] >> np.uint64(64 - msb - length)
+        raw = raw.astype(np.uint64)
+        if length < 64:
+            raw &= np.uint64((1 << length) - 1)
+        return raw
+
+    # Long (CAN FD) payloads: collect the signal bit by bit
+    if signal.byte_order == "little_endian":
+        bits = np.unpackbits(payloads, axis=1, bitorder="little")
+        positions = range(lsb, lsb + length)
+    else:
+        bits = np.unpackbits(payloads, axis=1, bitorder="big")
+        positions = range(msb + length - 1, msb - 1, -1)
+    raw = np.zeros(payloads.shape[0], dtype=np.uint64)
+    for weight, pos in enumerate(positions):
+        raw |= bits[:, pos].astype(np.uint64) << np.uint64(weight)
+    return raw
+
+def decode_signal(signal: cantools.database.can.Signal,
+                  payloads: np.ndarray,
+                  lengths: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Decodes 'signal' from every row of the 2D uint8 array 'payloads' and
+    returns scaled float64 values. Rows whose actual data length in 'lengths'
+    is too short to contain the signal are set to NaN. Multiplexing is not
+    taken into account (see decode_message()).
+    """
+    raw = _extract_raw(signal, payloads)
+    length = signal.length
+
+    if signal.is_float:
+        if length == 32:
+            values = raw.astype(np.uint32).view(np.float32).astype(np.float64)
+        else:
+            values = raw.view(np.float64)
+    elif signal.is_signed:
+        # Sign extension by shifting the sign bit to the MSB and back
+        shift = 64 - length
+        values = ((raw << np.uint64(shift)).view(np.int64) >>
+                  np.int64(shift)).astype(np.float64)
+    else:
+        values = raw.astype(np.float64)
+
+    if signal.scale != 1:
+        values *= signal.scale
+    if signal.offset != 0:
+        values += signal.offset
+
+    if lengths is not None:
+        values[lengths < _needed_bytes(signal)] = np.nan
+    return values
+
+def decode_message(message: cantools.database.can.Message,
+                   payloads: np.ndarray,
+                   lengths: Optional[np.ndarray] = None) \
+                   -> dict[str, np.ndarray]:
+    """
+    Decodes all signals of 'message' from every row of the 2D uint8 array
+    'payloads' (see decode_signal()). Multiplexed signals are set to NaN in
+    the rows where their multiplexer doesn't select them.
+    """
+    decoded = {
+        signal.name: decode_signal(signal, payloads, lengths)
+        for signal in message.signals
+    }
+
+    for signal in message.signals:
+        mux_ids = signal.multiplexer_ids
+        mux_name = signal.multiplexer_signal
+        while mux_ids and mux_name in decoded:
+            selected = np.isin(decoded[mux_name], mux_ids)
+            decoded[signal.name][~selected] = np.nan
+            mux = message.get_signal_by_name(mux_name)
+            mux_ids = mux.multiplexer_ids
+            mux_name = mux.multiplexer_signal
+
+    return decoded
+
+def decode_message_signal(message: cantools.database.can.Message,
+                          name: str,
+                          payloads: np.ndarray,
+                          lengths: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Decodes a single signal 'name' of 'message' (see decode_message()). Only
+    the multiplexers selecting the signal are decoded in addition.
+    """
+    signal = message.get_signal_by_name(name)
+    values = decode_signal(signal, payloads, lengths)
+
+    mux_ids = signal.multiplexer_ids
+    mux_name = signal.multiplexer_signal
+    while mux_ids and mux_name:
+        mux = message.get_signal_by_name(mux_name)
+        selected = np.isin(decode_signal(mux, payloads, lengths), mux_ids)
+        values[~selected] = np.nan
+        mux_ids = mux.multiplexer_ids
+        mux_name = mux.multiplexer_signal
+
+    return values
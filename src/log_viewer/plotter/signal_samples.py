@@ -0,0 +1,55 @@
+""" Signal samples module """
+
+from dataclasses import dataclass
+
+import numpy
+
+from .dtypes import from_ns_timestamps, to_ns_timestamps
+
+
+@dataclass(frozen=True)
+class SignalSamples:
+    """
+    Timestamps and values of the samples of a single signal. Compact samples
+    keep timestamps as int64 nanoseconds ('ns_timestamps') and values in the
+    narrowest suitable dtype.
+    """
+    timestamps: numpy.ndarray
+    values: numpy.ndarray
+    ns_timestamps: bool = False
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def tail(self, start: int) -> "SignalSamples":
+        """
+        Returns the samples starting from 'start' index
+        """
+        return SignalSamples(self.timestamps[start:], self.values[start:],
+                             self.ns_timestamps)
+
+    def compact(self,
+                dtype: numpy.dtype,
+                ns_timestamps: bool) -> "SignalSamples":
+        """
+        Returns the samples with values converted to 'dtype' and timestamps
+        converted to int64 nanoseconds if 'ns_timestamps' is True
+        """
+        timestamps = self.timestamps
+        if ns_timestamps and not self.ns_timestamps:
+            timestamps = to_ns_timestamps(timestamps)
+        return SignalSamples(timestamps, self.values.astype(dtype, copy=False),
+                             ns_timestamps or self.ns_timestamps)
+
+    def expand(self) -> "SignalSamples":
+        """
+        Returns the samples with float64 timestamps in seconds and float64
+        values (numeric values only) to be plotted
+        """
+        timestamps = self.timestamps
+        if self.ns_timestamps:
+            timestamps = from_ns_timestamps(timestamps)
+        values = self.values
+        if values.dtype.kind in "biu" or values.dtype == numpy.float32:
+            values = values.astype(numpy.float64)
+        return SignalSamples(timestamps, values)
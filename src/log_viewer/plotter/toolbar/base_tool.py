@@ -2,7 +2,7 @@
 
 from weakref import WeakKeyDictionary
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.cbook import Stack
 from matplotlib.widgets import Widget
 
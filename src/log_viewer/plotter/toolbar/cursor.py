@@ -3,7 +3,7 @@
 import numpy as np
 import pandas as pd
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.cbook import Stack
 
 from PyQt6.QtCore import pyqtSignal
@@ -71,6 +71,12 @@ class PlotterToolbarCursor(PlotterBaseTool):
         """
         return self._placed
 
+    def set_plot_points(self, plot_points: pd.DataFrame) -> None:
+        """
+        Replaces the plot points the cursor snaps to
+        """
+        self._plot_points = plot_points
+
     def connect(self):
         for canvas, info in self._canvas_infos.items():
             info["cids"] = [
@@ -12,7 +12,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
 
 import matplotlib as mpl
 from matplotlib.cbook import Stack
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 
 from .cursor import PlotterToolbarCursor
 from .zoomer import PlotterToolbarRectZoomer
@@ -117,6 +117,22 @@ class PlotterToolbar(QToolBar):
         """
         return self._tooldata
 
+    @property
+    def view_changed(self) -> bool:
+        """
+        Returns True if the view was changed from the home one
+        """
+        # pylint: disable-next=protected-access
+        return self._nav_stack._pos > 0
+
+    def set_plot_points(self, plot_points: pd.DataFrame) -> None:
+        """
+        Replaces the plot points (e.g. after new data is appended)
+        """
+        self._plot_points = plot_points
+        if self._cursor_tool:
+            self._cursor_tool.set_plot_points(plot_points)
+
     # pylint: disable-next=unused-argument
     def _home(self, *args):
         self._switch_mode(_PlotterToolbarMode.NONE)
@@ -4,7 +4,7 @@ from collections import namedtuple
 
 import numpy as np
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.cbook import Stack
 from matplotlib.backend_bases import MouseButton
 
@@ -37,7 +37,13 @@ APP_SETTINGS_SCHEMA = {
                     "patternProperties": {
                         ".": {"type": "number"}
                     }
-                }
+                },
+                "compact": {"type": "boolean"},
+                "engine": {"enum": ["c", "pyarrow"]},
+                "lazy": {"type": "boolean"},
+                "cache_columns": {"type": "integer", "minimum": 1},
+                "cache_size_mb": {"type": "integer", "minimum": 0},
+                "derived": {"$ref": "#/$defs/derived_signals"}
             },
             "required": ["delimiter", "timestamp", "scales"]
         },
@@ -47,10 +53,68 @@ APP_SETTINGS_SCHEMA = {
                 "asc_base": {"enum": ["hex", "dec"]},
                 "asc_rel_timestamp": {"type": "boolean"},
                 "db": {"type": "array", "items": {"type": "string"}
+                },
+                "workers": {"type": "integer", "minimum": 0},
+                "cache_size_mb": {"type": "integer", "minimum": 0},
+                "compact": {"type": "boolean"},
+                "pipeline": {"type": "boolean"},
+                "keep_raw": {"type": "boolean"},
+                "derived": {"$ref": "#/$defs/derived_signals"},
+                "filter": {
+                    "type": "object",
+                    "properties": {
+                        "pgn": {"$ref": "#/$defs/id_filter"},
+                        "sa": {"$ref": "#/$defs/address_filter"},
+                        "da": {"$ref": "#/$defs/address_filter"},
+                        "channel": {"$ref": "#/$defs/channel_filter"}
+                    },
+                    "additionalProperties": False
                 }
             },
             "required": ["asc_base", "asc_rel_timestamp", "db"]
         }
     },
-    "required": ["mode", "plot"]
+    "required": ["mode", "plot"],
+    "$defs": {
+        "derived_signals": {
+            "type": "object",
+            "patternProperties": {
+                ".": {"type": "string"}
+            }
+        },
+        "id_filter": {
+            "type": "object",
+            "properties": {
+                "allow": {"type": "array",
+                          "items": {"type": "integer", "minimum": 0,
+                                    "maximum": 0x3ffff}},
+                "deny": {"type": "array",
+                         "items": {"type": "integer", "minimum": 0,
+                                   "maximum": 0x3ffff}}
+            },
+            "additionalProperties": False
+        },
+        "address_filter": {
+            "type": "object",
+            "properties": {
+                "allow": {"type": "array",
+                          "items": {"type": "integer", "minimum": 0,
+                                    "maximum": 255}},
+                "deny": {"type": "array",
+                         "items": {"type": "integer", "minimum": 0,
+                                   "maximum": 255}}
+            },
+            "additionalProperties": False
+        },
+        "channel_filter": {
+            "type": "object",
+            "properties": {
+                "allow": {"type": "array",
+                          "items": {"type": ["integer", "string"]}},
+                "deny": {"type": "array",
+                         "items": {"type": ["integer", "string"]}}
+            },
+            "additionalProperties": False
+        }
+    }
 }
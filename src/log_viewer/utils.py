@@ -4,6 +4,11 @@ import sys
 
 from pathlib import Path
 
+from PyQt6.QtCore import QStandardPaths
+
+# Name of the application folder in the user directories
+APP_DIR_NAME = "log_viewer"
+
 def _get_base_path() -> Path:
     """
     Gets base path to the current directory
@@ -20,6 +25,18 @@ def get_settings_path() -> Path:
     """
     return (_get_base_path() / "cfg").resolve() / "app.json"
 
+def get_cache_path() -> Path:
+    """
+    Gets path to the application folder in the user cache directory (e.g.
+    ~/.cache/log_viewer or %LOCALAPPDATA%/cache/log_viewer), which is
+    writable unlike the application folder of an installed build
+    """
+    location = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericCacheLocation
+    )
+    base_path = Path(location) if location else Path.home() / ".cache"
+    return (base_path / APP_DIR_NAME).resolve()
+
 def get_resource_path() -> Path:
     """
     Gets path to 'resource' folder
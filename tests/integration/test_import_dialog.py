@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import QDialog
 
 # modules under test
 from import_dialog import ImportDialog
-from plotter import J1939DumpPlotter
+from plotter import J1939DumpPlotter, SimpleCsvPlotter
 
 def test_import_dialog_accepted(setup_j1939_dump_file, qtbot):
     """
@@ -49,3 +49,27 @@ def test_import_dialog_rejected(setup_j1939_dump_file, qtbot):
     QTimer.singleShot(0, to_handler)
     assert dialog.exec() == QDialog.DialogCode.Rejected
     assert not plotter.is_opened
+
+def test_import_dialog_simple_csv(tmp_path, qtbot):
+    """
+    Integration test for successful simple CSV file opening
+
+    Step 0: Prepare SimpleCsvPlotter with a CSV file of a single signal
+    Step 1: Instantiate a ImportDialog object and check that it shows the
+        read fraction of the file
+    Step 2: Call exec() of ImportDialog's object and check that it returns
+        Accepted return code
+    Step 3: Check that plotter is successfully opened
+    """
+
+    path = tmp_path / "test_simple_csv.csv"
+    path.write_text("timestamp;sig1\n0;1\n1;2\n", encoding="utf-8")
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {})
+    dialog = ImportDialog(plotter)
+    qtbot.addWidget(dialog)
+    # pylint: disable-next=protected-access
+    assert not dialog._ui.progressBar.isHidden()
+
+    assert dialog.exec() == QDialog.DialogCode.Accepted
+    assert plotter.is_opened
+    assert plotter.plot_vars == ["sig1"]
@@ -0,0 +1,72 @@
+""" Unit-tests for accumulator.py entities """
+
+import numpy as np
+
+# modules under test
+from plotter import ColumnAccumulator, GrowableArray, PayloadAccumulator
+
+def test_growable_array():
+    """
+    Unit-tests for GrowableArray methods
+
+    Step 0: Instantiate an empty GrowableArray of int64 items
+    Step 1: Check that the length is 0 and data is empty
+    Step 2: Append more items than the initial capacity
+    Step 3: Check that the length, dtype and data are as expected
+    """
+    arr = GrowableArray(np.int64)
+
+    assert len(arr) == 0
+    assert arr.data.size == 0
+
+    count = GrowableArray.INITIAL_CAPACITY * 3 + 1
+    for value in range(count):
+        arr.append(value)
+
+    assert len(arr) == count
+    assert arr.data.dtype == np.int64
+    assert np.array_equal(arr.data, np.arange(count))
+
+def test_payload_accumulator():
+    """
+    Unit-tests for PayloadAccumulator methods
+
+    Step 0: Instantiate an empty PayloadAccumulator of 4 bytes wide payloads
+    Step 1: Append payloads which are shorter, equal and longer than 4 bytes
+    Step 2: Check that rows and actual data lengths are stored as is
+    Step 3: Check that payloads are padded/truncated to 4 bytes
+    """
+    acc = PayloadAccumulator(4)
+    assert len(acc) == 0
+    assert acc.payloads.shape == (0, 4)
+
+    acc.append(1, b"\x01\x02")
+    acc.append(5, bytearray(b"\x01\x02\x03\x04"))
+    acc.append(7, b"\x01\x02\x03\x04\x05\x06")
+
+    assert len(acc) == 3
+    assert list(acc.rows) == [1, 5, 7]
+    assert list(acc.lengths) == [2, 4, 6]
+    assert acc.payloads.tolist() == [[1, 2, 0, 0], [1, 2, 3, 4], [1, 2, 3, 4]]
+
+def test_column_accumulator():
+    """
+    Unit-tests for ColumnAccumulator methods
+
+    Step 0: Instantiate an empty ColumnAccumulator
+    Step 1: Append rows one by one and in bulk and check the returned row
+        numbers
+    Step 2: Check the timestamps of the accumulated rows
+    """
+    acc = ColumnAccumulator()
+
+    assert len(acc) == 0
+    assert len(acc.timestamps) == 0
+
+    rows = [acc.append_row(ts) for ts in [0.0, 0.5, 1.0]]
+    assert rows == [0, 1, 2]
+    acc.reserve_rows(10)
+    assert acc.extend_rows(np.array([1.5, 2.0])) == 3
+
+    assert len(acc) == 5
+    assert acc.timestamps.tolist() == [0.0, 0.5, 1.0, 1.5, 2.0]
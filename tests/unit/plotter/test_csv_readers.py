@@ -0,0 +1,64 @@
+""" Unit-tests for CSV files readers module """
+
+import io
+
+import pandas as pd
+import pytest
+
+from plotter import LimitedReader, csv_readers, read_csv_chunks
+
+def test_read_csv_chunks(monkeypatch):
+    """
+    Unit-tests for read_csv_chunks()
+
+    Step 0: Parse a CSV file by the pandas C parser in chunks of two rows
+    Step 1: Check the chunks
+    Step 2: Check that the pyarrow engine returns the same columns
+    Step 3: Check that only the given columns are returned by both engines
+    Step 4: Check that the pyarrow reader raises ValueError on a column
+        which changes its type after the first block
+    """
+    data = b"timestamp;sig1;sig2\n0;1;\n1;2;0.5\n2;3;\n"
+    chunks = list(read_csv_chunks(io.BytesIO(data), ";", 2))
+    assert [len(x) for x in chunks] == [2, 1]
+    df = pd.concat(chunks, ignore_index=True)
+    assert list(df.columns) == ["timestamp", "sig1", "sig2"]
+    assert list(df["sig1"]) == [1, 2, 3]
+
+    arrow_df = pd.concat(list(read_csv_chunks(io.BytesIO(data), ";", 2,
+                                              "pyarrow")), ignore_index=True)
+    assert list(arrow_df.columns) == list(df.columns)
+    for var in df.columns:
+        assert list(arrow_df[var].dropna()) == list(df[var].dropna())
+
+    for engine in ("c", "pyarrow"):
+        chunks = list(read_csv_chunks(io.BytesIO(data), ";", 2, engine,
+                                      ["sig2"]))
+        assert [list(x.columns) for x in chunks] == [["sig2"]] * len(chunks)
+
+    monkeypatch.setattr(csv_readers, "ARROW_BLOCK_SIZE", 1024)
+    mixed = b"a\n" + b"1\n" * 1024 + b"x\n"
+    with pytest.raises(ValueError):
+        list(read_csv_chunks(io.BytesIO(mixed), ";", 2, "pyarrow"))
+
+def test_limited_reader():
+    """
+    Unit-tests for LimitedReader
+
+    Step 0: Wrap a file with an incomplete trailing line limited to the
+        complete lines
+    Step 1: Check that both engines parse the complete lines only
+    Step 2: Check that the position is reported and the source is closed
+        along with the reader
+    """
+    data = b"timestamp;sig1\n0;1\n1;2\n2;"
+    for engine in ("c", "pyarrow"):
+        source = io.BytesIO(data)
+        reader = LimitedReader(source, data.rfind(b"\n") + 1)
+        df = pd.concat(list(read_csv_chunks(reader, ";", 1, engine)),
+                       ignore_index=True)
+        assert list(df["timestamp"]) == [0, 1]
+        assert list(df["sig1"]) == [1, 2]
+        assert reader.tell() == len(data) - 2
+        reader.close()
+        assert source.closed
@@ -0,0 +1,121 @@
+""" Unit-tests for derived signals module """
+
+import numpy as np
+import pytest
+
+from plotter import DerivedExpression, DerivedSignals, SignalSamples, \
+                    align_samples, compile_derived_signals
+
+def test_derived_expression():
+    """
+    Unit-tests for DerivedExpression
+
+    Step 0: Check that invalid, unsafe and signal-free expressions lead to
+        a ValueError exception
+    Step 1: Check the referred signals including dotted names and signal()
+    Step 2: Check arithmetic, functions, bit extraction, comparisons and
+        conditional expressions evaluated over whole arrays
+    """
+    for expression in ["a +", "__import__('os')", "a.b()", "1 + 2",
+                       "lambda: a", "a[0]", "clip(a, 0)", "signal(a)"]:
+        with pytest.raises(ValueError):
+            DerivedExpression(expression)
+
+    expression = DerivedExpression(
+        'SA100.Msg.Sig * 2 + signal("speed, km/h") - SA100.Msg.Sig'
+    )
+    assert expression.inputs == ["SA100.Msg.Sig", "speed, km/h"]
+
+    a = np.array([1.0, -2.0, 3.0, -4.0])
+    b = np.array([0b0110, 0b1010, 0b0001, 0b1111])
+    values = {"a": a, "b": b}
+    expected = {
+        "a * 3.6 + 1": a * 3.6 + 1,
+        "clip(abs(a), 0, 2.5)": [1, 2, 2.5, 2.5],
+        "bits(b, 1, 2)": [3, 1, 0, 3],
+        "b & 3 | 8": [10, 10, 9, 11],
+        "where(a > 0, a, 0)": [1, 0, 3, 0],
+        "a if 0 < b < 8 else -1": [1, -1, 3, -1],
+        "not a > 0 and b > 5": [False, True, False, True],
+        "max(a, 0) ** 2": [1, 0, 9, 0],
+        "a / 0": [np.inf, -np.inf, np.inf, -np.inf],
+        "1 + 0 * a": [1, 1, 1, 1]
+    }
+    for text, result in expected.items():
+        assert np.array_equal(DerivedExpression(text).evaluate(values),
+                              result), text
+
+def test_compile_derived_signals():
+    """
+    Unit-tests for compile_derived_signals()
+
+    Step 0: Compile derived signals referring to each other
+    Step 1: Check that cyclic references lead to a ValueError exception
+    """
+    derived = compile_derived_signals({"x": "y * 2", "y": "a + 1"})
+    assert derived["x"].inputs == ["y"]
+    assert derived["y"].inputs == ["a"]
+
+    with pytest.raises(ValueError):
+        compile_derived_signals({"x": "y * 2", "y": "x + a"})
+    with pytest.raises(ValueError):
+        compile_derived_signals({"x": "x * 2"})
+
+def test_derived_signals():
+    """
+    Unit-tests for DerivedSignals
+
+    Step 0: Check that the derived signals are available in the order of
+        their evaluation once their log inputs are available
+    Step 1: Check that the evaluated samples are kept until the input
+        samples change
+    Step 2: Check the samples preceding an update
+    """
+    derived = DerivedSignals({"x": "y * 2", "y": "a + 1"})
+    assert "x" in derived and "a" not in derived
+    assert list(derived) == ["x", "y"]
+    assert derived.inputs("x") == ["y"]
+    assert not derived.available(["b"])
+    assert derived.available(["a"]) == ["y", "x"]
+
+    inputs = [SignalSamples(np.array([0.0, 1.0]), np.array([1, 2]))]
+    samples = derived.evaluate("y", inputs)
+    assert samples.values.tolist() == [2, 3]
+    assert derived.evaluate("y", list(inputs)) is samples
+    assert derived.update_start("y") == 0
+
+    derived.start_update()
+    inputs = [SignalSamples(np.array([0.0, 1.0, 2.0]), np.array([1, 2, 3]))]
+    assert derived.evaluate("y", inputs).values.tolist() == [2, 3, 4]
+    assert derived.update_start("y") == 2
+    assert derived.update_start("x") == 0
+
+def test_align_samples():
+    """
+    Unit-tests for align_samples()
+
+    Step 0: Check that signals sampled at the same timestamps aren't copied
+    Step 1: Check that signals sampled at different timestamps hold their
+        last values on the union of the timestamps after the latest start
+    Step 2: Check that a signal without samples leads to an empty grid
+    """
+    timestamps = np.array([0.0, 1.0, 2.0])
+    values = np.array([1, 2, 3])
+    grid, aligned = align_samples([(timestamps, values),
+                                   (timestamps.copy(), values * 2)])
+    assert grid is timestamps
+    assert aligned[0] is values
+    assert list(aligned[1]) == [2, 4, 6]
+
+    grid, aligned = align_samples([
+        (np.array([0.0, 1.0, 2.0, 3.0]), np.array([1, 2, 3, 4])),
+        (np.array([0.5, 2.5]), np.array([10.0, 20.0]))
+    ])
+    assert list(grid) == [0.5, 1.0, 2.0, 2.5, 3.0]
+    assert list(aligned[0]) == [1, 2, 3, 3, 4]
+    assert list(aligned[1]) == [10, 10, 10, 20, 20]
+
+    grid, aligned = align_samples([(timestamps, values),
+                                   (np.empty(0), np.empty(0))])
+    assert len(grid) == 0
+    assert [len(x) for x in aligned] == [0, 0]
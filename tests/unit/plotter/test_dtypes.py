@@ -0,0 +1,72 @@
+""" Unit-tests for dtypes.py entities """
+
+import cantools
+import numpy as np
+
+# modules under test
+from plotter import column_dtype, fits_ns_timestamps, from_ns_timestamps, \
+                    signal_dtype, to_ns_timestamps
+
+TEST_DBC = """VERSION ""
+
+BS_:
+
+BU_: Ecu
+
+BO_ 2364540158 Mixed: 8 Ecu
+ SG_ Flag : 0|1@1+ (1,0) [0|0] "" Ecu
+ SG_ Counter : 1|7@1+ (1,0) [0|0] "" Ecu
+ SG_ Offset : 8|8@1+ (1,-125) [0|0] "" Ecu
+ SG_ Signed : 16|12@1- (1,0) [0|0] "" Ecu
+ SG_ Scaled : 28|16@1+ (0.125,0) [0|0] "" Ecu
+ SG_ Wide : 44|20@1+ (4,0) [0|0] "" Ecu
+"""
+
+def test_signal_dtype():
+    """
+    Unit-test for signal_dtype() function
+
+    Step 0: Load a database with signals of different lengths, scales and
+        offsets
+    Step 1: Check that every signal gets the narrowest dtype which holds
+        its physical range
+    """
+    db = cantools.db.load_string(TEST_DBC, "dbc", strict=False)
+    message = db.get_message_by_name("Mixed")
+    expected = {"Flag": np.bool_, "Counter": np.int8, "Offset": np.int16,
+                "Signed": np.int16, "Scaled": np.float32, "Wide": np.int32}
+    for name, dtype in expected.items():
+        assert signal_dtype(message.get_signal_by_name(name)) == dtype
+
+def test_column_dtype():
+    """
+    Unit-test for column_dtype() function
+
+    Step 0-3: Check that boolean, integral, low and high precision float
+        columns get bool, the narrowest int, float32 and float64 dtypes
+    Step 4: Check that a non-numeric column keeps its dtype
+    """
+    assert column_dtype(np.array([0.0, 1.0, 1.0])) == np.bool_
+    assert column_dtype(np.array([-3.0, 100.0])) == np.int8
+    assert column_dtype(np.array([70000, 5])) == np.int32
+    assert column_dtype(np.array([0.5, 0.25, 10.1])) == np.float32
+    assert column_dtype(np.array([1.7e9, 1.7e9 + 0.001])) == np.float64
+    assert column_dtype(np.array(["a", "b"], dtype=object)) == object
+
+def test_ns_timestamps():
+    """
+    Unit-test for int64 nanoseconds timestamps conversion
+
+    Step 0: Check that float seconds are converted to nanoseconds and back
+    Step 1: Check that integer and too large timestamps aren't convertible
+    """
+    timestamps = np.array([0.0, 1.5, 1.7e9 + 0.000001])
+    assert fits_ns_timestamps(timestamps)
+    ns_timestamps = to_ns_timestamps(timestamps)
+    assert ns_timestamps.dtype == np.int64
+    assert list(ns_timestamps[:2]) == [0, 1500000000]
+    assert np.allclose(from_ns_timestamps(ns_timestamps), timestamps,
+                       rtol=0, atol=1e-6)
+
+    assert not fits_ns_timestamps(np.array([1, 2]))
+    assert not fits_ns_timestamps(np.array([1e10]))
@@ -0,0 +1,289 @@
+""" Unit-tests for J1939 frames decoder module """
+
+import shutil
+
+import can
+import cantools
+import numpy as np
+
+from plotter import J1939Decoder, J1939ImportFilter, J1939LogStream, \
+                    J1939RawFrames, RawFrameStore, changed_frame_ids, \
+                    load_j1939_database, merge_timestamps
+from plotter import j1939_decoder
+
+def _assert_same_signals(actual, expected):
+    """
+    Checks that decoders 'actual' and 'expected' decode the same samples of
+    the same signals
+    """
+    assert sorted(actual.signal_keys) == sorted(expected.signal_keys)
+    for key in expected.signal_keys:
+        timestamps, values = actual.decode_signal(key)
+        expected_timestamps, expected_values = expected.decode_signal(key)
+        assert np.array_equal(timestamps, expected_timestamps)
+        assert np.array_equal(values, expected_values)
+
+def test_load_j1939_database(tmp_path, monkeypatch):
+    """
+    Unit-tests for load_j1939_database()
+
+    Step 0: Load a copy of the example database with a cache directory
+    Step 1: Check that the database is reused within the session and saved
+        to the cache directory
+    Step 2: Check that the database is loaded from the cache directory in a
+        new session and matches frame ids regardless of the source address
+    Step 3: Check that the database is reloaded when the DBC file changes
+    Step 4: Check that a pickled database with a wrong signature is ignored
+    """
+    dbc_path = str(tmp_path / "test.dbc")
+    shutil.copy("dbc/example_db.dbc", dbc_path)
+    cache_dir = str(tmp_path / "cache")
+
+    db = load_j1939_database([dbc_path], cache_dir)
+    assert load_j1939_database([dbc_path], cache_dir) is db
+    assert len(list((tmp_path / "cache").glob("db-*.pickle"))) == 1
+
+    # pylint: disable-next=protected-access
+    j1939_decoder._databases.clear()
+    cached = load_j1939_database([dbc_path], cache_dir)
+    assert cached is not db
+    assert cached.get_message_by_frame_id(0xdf00064 & 0xffffff00).name == \
+        "ExampleMessageRx"
+
+    with open(dbc_path, "a", encoding="utf-8") as dbc_file:
+        dbc_file.write("\n")
+    assert load_j1939_database([dbc_path], cache_dir) is not cached
+    assert len(list((tmp_path / "cache").glob("db-*.pickle"))) == 2
+
+    for path in (tmp_path / "cache").glob("db-*.pickle"):
+        data = path.read_bytes()
+        path.write_bytes(bytes(32) + data[32:])
+    # pylint: disable-next=protected-access
+    j1939_decoder._databases.clear()
+    with monkeypatch.context() as patch:
+        patch.setattr(j1939_decoder.pickle, "loads", None)
+        reloaded = load_j1939_database([dbc_path], cache_dir)
+    assert reloaded.get_message_by_frame_id(0xdf00064 & 0xffffff00).name == \
+        "ExampleMessageRx"
+
+def test_j1939_decoder():
+    """
+    Unit-tests for J1939Decoder
+
+    Step 0: Append messages with two known and one unknown frame ids
+    Step 1: Check that a single plan is cached per frame id with a negative
+        entry for the unknown one
+    Step 2: Check that the cached plans contain the expected data keys
+    Step 3: Merge exported frames into another decoder after its own frames
+        and check that the result equals the decoding of all messages at once
+    Step 4: Check the samples of a signal decoded on demand
+    Step 5: Check that frames restored from a dict of arrays are identical
+    """
+    db = load_j1939_database(["dbc/example_db.dbc"])
+    messages = [
+        can.Message(timestamp=float(i), arbitration_id=frame_id,
+                    data=bytes([i, 0]))
+        for i, frame_id in enumerate([0xdf00064, 0x55064f9, 0x18fef100] * 10)
+    ]
+
+    decoder = J1939Decoder(db, "timestamp")
+    for msg in messages:
+        decoder.append(msg)
+
+    # pylint: disable-next=protected-access
+    plans = decoder._plans
+    assert len(plans) == 3
+    assert plans[(None, 0x18fef100)] is None
+    assert plans[(None, 0xdf00064)].data_key == \
+        "SA100.PDU2.GE0.ExampleMessageRx"
+    assert plans[(None, 0x55064f9)].columns["TxSignal1"] == \
+        "SA249.PDU1.DA100.ExampleMessageTx.TxSignal1"
+    assert len(decoder) == 20
+
+    head = J1939Decoder(db, "timestamp")
+    tail = J1939Decoder(db, "timestamp")
+    for msg in messages[:13]:
+        head.append(msg)
+    for msg in messages[13:]:
+        tail.append(msg)
+    head.merge_frames(tail.export_frames())
+
+    assert np.array_equal(head.export_frames().timestamps,
+                          [x.timestamp for x in messages
+                           if x.arbitration_id != 0x18fef100])
+    _assert_same_signals(head, decoder)
+    assert head.signal_keys == decoder.signal_keys
+
+    timestamps, values = head.decode_signal(
+        "SA249.PDU1.DA100.ExampleMessageTx.TxSignal1"
+    )
+    assert timestamps.tolist() == list(range(1, 30, 3))
+    assert values.tolist() == list(range(1, 30, 3))
+
+    frames = J1939RawFrames.from_arrays(head.export_frames().to_arrays())
+    restored = J1939Decoder(db, "timestamp")
+    restored.merge_frames(frames)
+    _assert_same_signals(restored, decoder)
+
+def test_j1939_import_filter():
+    """
+    Unit-tests for J1939ImportFilter
+
+    Step 0: Check that an empty filter settings section gives no filter
+    Step 1: Check that frames are accepted by PGN, source and destination
+        address and channel allow/deny lists
+    Step 2: Check that a decoder skips the frames rejected by the filter
+        before resolving their decode plans
+    """
+    assert J1939ImportFilter.from_settings({}) is None
+    assert J1939ImportFilter.from_settings(
+        {"pgn": {"allow": [], "deny": []}}
+    ) is None
+
+    rx_id, tx_id = 0xdf00064, 0x55064f9
+    rx_pgn = cantools.j1939.pgn_from_frame_id(rx_id)
+    tx_pgn = cantools.j1939.pgn_from_frame_id(tx_id)
+
+    pgn_filter = J1939ImportFilter.from_settings({"pgn": {"allow": [rx_pgn]}})
+    assert pgn_filter.accepts(None, rx_id)
+    assert not pgn_filter.accepts(None, tx_id)
+    pgn_filter = J1939ImportFilter.from_settings({"pgn": {"deny": [tx_pgn]}})
+    assert pgn_filter.accepts(None, rx_id)
+    assert not pgn_filter.accepts(None, tx_id)
+
+    sa_filter = J1939ImportFilter.from_settings({"sa": {"deny": [249, 3, 3]}})
+    assert sa_filter.deny == ((), (3, 249), (), ())
+    assert sa_filter.accepts(None, rx_id)
+    assert not sa_filter.accepts(None, tx_id)
+
+    da_filter = J1939ImportFilter.from_settings({"da": {"allow": [100]}})
+    assert not da_filter.accepts(None, rx_id)
+    assert da_filter.accepts(None, tx_id)
+    da_filter = J1939ImportFilter.from_settings({"da": {"allow": [255]}})
+    assert da_filter.accepts(None, rx_id)
+
+    channel_filter = J1939ImportFilter.from_settings(
+        {"channel": {"allow": [1, "can0"]}}
+    )
+    assert channel_filter.accepts(1, rx_id)
+    assert channel_filter.accepts("can0", rx_id)
+    assert not channel_filter.accepts(2, rx_id)
+    assert not channel_filter.accepts(None, rx_id)
+
+    db = load_j1939_database(["dbc/example_db.dbc"])
+    decoder = J1939Decoder(db, "timestamp", sa_filter)
+    for i, frame_id in enumerate([rx_id, tx_id] * 5):
+        decoder.append(can.Message(timestamp=float(i), arbitration_id=frame_id,
+                                   data=bytes([i, 0])))
+    assert len(decoder) == 5
+    assert decoder.signal_keys == [
+        "SA100.PDU2.GE0.ExampleMessageRx.RxSignal1",
+        "SA100.PDU2.GE0.ExampleMessageRx.RxSignal2"
+    ]
+
+def test_merge_timestamps():
+    """
+    Unit-tests for merge_timestamps()
+
+    Step 0: Merge three sorted timelines with small blocks
+    Step 1: Check that the merged timeline is sorted and the positions of
+        every timeline rows restore the timeline
+    Step 2: Check that an unsorted timeline is merged with its rows order
+    """
+    rng = np.random.default_rng(0)
+    timelines = [np.sort(rng.uniform(0, 100, size)) for size in (50, 7, 0)]
+    merged = []
+    restored = [[] for _ in timelines]
+    for block, positions in merge_timestamps(timelines, 8):
+        for i, source_positions in enumerate(positions):
+            restored[i] += list(block[source_positions])
+        merged += list(block)
+    assert merged == sorted(np.concatenate(timelines))
+    for timeline, rows in zip(timelines, restored):
+        assert rows == list(timeline)
+
+    timelines = [np.array([5.0, 1.0, 3.0]), np.array([2.0, 4.0])]
+    restored = [[] for _ in timelines]
+    for block, positions in merge_timestamps(timelines, 2):
+        for i, source_positions in enumerate(positions):
+            restored[i] += list(block[source_positions])
+    assert restored == [list(x) for x in timelines]
+
+def test_j1939_decoder_merge_timelines():
+    """
+    Unit-tests for J1939Decoder.merge_timelines()
+
+    Step 0: Split messages of two channels into interleaved logs (a log per
+        channel) and consecutive logs of both channels
+    Step 1: Check that merging the frames of the logs equals the decoding
+        of all messages at once
+    """
+    db = load_j1939_database(["dbc/example_db.dbc"])
+    messages = [
+        can.Message(timestamp=float(i), arbitration_id=frame_id,
+                    data=bytes([i, 0]), channel=f"can{i % 2}")
+        for i, frame_id in enumerate([0xdf00064, 0x55064f9, 0xdf00064] * 10)
+    ]
+    decoder = J1939Decoder(db, "timestamp")
+    for msg in messages:
+        decoder.append(msg)
+
+    for parts in ([messages[::2], messages[1::2]],
+                  [messages[:11], messages[11:]]):
+        sources = []
+        for part in parts:
+            source = J1939Decoder(db, "timestamp")
+            for msg in part:
+                source.append(msg)
+            sources.append(source.export_frames())
+        merged = J1939Decoder(db, "timestamp")
+        merged.merge_timelines(sources)
+        _assert_same_signals(merged, decoder)
+
+def test_j1939_decoder_redecode(tmp_path):
+    """
+    Unit-tests for J1939Decoder.redecode() and changed_frame_ids()
+
+    Step 0: Make a database with a rescaled signal of ExampleMessageTx and a
+        new message of the frames unknown to the example database
+    Step 1: Check that the changed messages are found by their frame ids
+    Step 2: Redecode messages accumulated with the kept raw frames and
+        check that the result equals the decoding with the new database
+    Step 3: Check that the groups of the unchanged message are reused
+    """
+    with open("dbc/example_db.dbc", encoding="utf-8") as dbc_file:
+        dbc = dbc_file.read()
+    dbc = dbc.replace('TxSignal1 : 0|8@1- (1,0)', 'TxSignal1 : 0|8@1- (2,0)')
+    dbc = dbc.replace(
+        'BO_ 2236638457', 'BO_ 2566844672 NewMessage: 2 SampleEcu\n'
+        ' SG_ NewSignal : 0|16@1+ (1,0) [0|65535] "" SampleEcu\n\n'
+        'BO_ 2236638457', 1
+    )
+    dbc_path = str(tmp_path / "changed.dbc")
+    with open(dbc_path, "w", encoding="utf-8") as dbc_file:
+        dbc_file.write(dbc)
+    db = load_j1939_database(["dbc/example_db.dbc"])
+    changed_db = load_j1939_database([dbc_path])
+    assert changed_frame_ids(db, changed_db) == {0x5506400, 0x18fef100}
+
+    messages = [
+        can.Message(timestamp=float(i), arbitration_id=frame_id,
+                    data=bytes([i, 0]), channel=f"can{i % 2}")
+        for i, frame_id in enumerate([0xdf00064, 0x55064f9, 0x18fef100] * 10)
+    ]
+    raw = RawFrameStore()
+    stream = J1939LogStream(db, raw)
+    decoder = J1939Decoder(db, "timestamp")
+    expected = J1939Decoder(changed_db, "timestamp")
+    for msg in messages:
+        decoder.append(msg, stream)
+        expected.append(msg)
+    assert len(raw) == 30
+
+    redecoded = decoder.redecode(changed_db, raw)
+    _assert_same_signals(redecoded, expected)
+    data_key = "can0.SA100.PDU2.GE0.ExampleMessageRx"
+    assert np.array_equal(
+        redecoded.export_frames().groups[data_key][4],
+        decoder.export_frames().groups[data_key][4]
+    )
@@ -0,0 +1,143 @@
+""" Unit-tests for J1939 transport protocol reassembly module """
+
+import can
+import cantools
+
+from plotter import FrameBlock, J1939Decoder, J1939LogStream, \
+                    J1939TransportReassembler, iter_message_blocks, \
+                    load_j1939_database
+
+# Frame ids of TP.CM and TP.DT sent by SA 0x21 (broadcast and to DA 0x03)
+BAM_CM_ID = 0x1cecff21
+BAM_DT_ID = 0x1cebff21
+RTS_CM_ID = 0x1cec0321
+CMDT_DT_ID = 0x1ceb0321
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def _transfer(cm_id, dt_id, pgn, data, start=0.0, control=32):
+    """
+    Returns messages of a transport protocol transfer of 'data'
+    """
+    packets = (len(data) + 6) // 7
+    padded = data + bytes(packets * 7 - len(data))
+    messages = [can.Message(
+        timestamp=start, arbitration_id=cm_id,
+        data=bytes([control, len(data) & 0xff, len(data) >> 8, packets, 0xff,
+                    pgn & 0xff, (pgn >> 8) & 0xff, pgn >> 16])
+    )]
+    for i in range(packets):
+        messages.append(can.Message(
+            timestamp=start + (i + 1) * 0.25, arbitration_id=dt_id,
+            data=bytes([i + 1]) + padded[i * 7:(i + 1) * 7]
+        ))
+    return messages
+
+def test_j1939_transport_reassembler():
+    """
+    Unit-tests for J1939TransportReassembler
+
+    Step 0: Feed BAM and CMDT transfers with interleaved packets
+    Step 1: Check that the completed messages have the transfer PGN,
+        addresses, the database priority and the announced size
+    Step 2: Check that a transfer with a packet gap exceeding the timeout
+        and an aborted transfer aren't completed
+    Step 3: Check that reassembled messages of a frame block are returned
+        as a separate block along with the rows of the frames which complete
+        them, so the frame block isn't widened
+    """
+    reassembler = J1939TransportReassembler(
+        J1939TransportReassembler.priorities_of([0x18feec00, 0x0cef0000])
+    )
+    payload = bytes(range(17))
+    bam = _transfer(BAM_CM_ID, BAM_DT_ID, 0xfeec, payload)
+    cmdt = _transfer(RTS_CM_ID, CMDT_DT_ID, 0xef00, payload[::-1], 0.125, 16)
+    completed = []
+    for msg in sorted(bam + cmdt, key=lambda x: x.timestamp):
+        message = reassembler.feed(None, msg.timestamp, msg.arbitration_id,
+                                   bytes(msg.data))
+        if message is not None:
+            completed.append(message)
+    assert completed == [(0.75, 0x18feec21, payload),
+                         (0.875, 0x0cef0321, payload[::-1])]
+
+    late = _transfer(BAM_CM_ID, BAM_DT_ID, 0xfeec, payload)
+    late[-1].timestamp = 2.0
+    aborted = _transfer(RTS_CM_ID, CMDT_DT_ID, 0xef00, payload, 0.0, 16)
+    aborted.insert(2, can.Message(arbitration_id=0x1cec2103,
+                                  data=bytes([255, 1, 255, 255, 255, 0, 0xef,
+                                              0])))
+    for msg in late + aborted:
+        assert reassembler.feed(None, msg.timestamp, msg.arbitration_id,
+                                bytes(msg.data)) is None
+
+    messages = [can.Message(timestamp=-1.0, arbitration_id=0xdf00064,
+                            data=bytes(2))] + bam
+    block = next(iter_message_blocks(messages))
+    rows, result = reassembler.feed_block(block)
+    assert list(rows) == [len(block) - 1]
+    assert isinstance(result, FrameBlock)
+    assert list(result.arbitration_ids) == [0x18feec21]
+    assert list(result.timestamps) == [block.timestamps[-1]]
+    assert list(result.lengths) == [len(payload)]
+    assert result.payloads.shape == (1, len(payload))
+    assert bytes(result.payloads[0]) == payload
+    assert block.payloads.shape[1] == 8
+
+def test_j1939_decoder_transport(tmp_path):
+    """
+    Unit-tests for J1939Decoder transport protocol reassembly
+
+    Step 0: Prepare a database with a 20 bytes long message
+    Step 1: Append BAM transfers of the message and a single CAN FD frame
+        of the same PGN by single messages and by frame blocks
+    Step 2: Check that the message signals are decoded from all of them in
+        the timestamps order
+    Step 3: Check that the transfers aren't reassembled without the log
+        stream
+    """
+    db = cantools.database.Database(messages=[cantools.database.Message(
+        frame_id=0x18feec00, name="LongMessage", length=20,
+        is_extended_frame=True, signals=[
+            cantools.database.Signal("First", 0, 8),
+            cantools.database.Signal("Last", 152, 8)
+        ]
+    )])
+    dbc_file = tmp_path / "long.dbc"
+    dbc_file.write_text(db.as_dbc_string(), encoding="utf-8")
+    db = load_j1939_database([str(dbc_file)])
+
+    messages = []
+    for i in range(3):
+        messages += _transfer(BAM_CM_ID, BAM_DT_ID, 0xfeec,
+                              bytes([i]) + bytes(18) + bytes([10 + i]), i)
+    messages.insert(6, can.Message(timestamp=1.1, arbitration_id=0x18feec21,
+                                   is_fd=True,
+                                   data=bytes([7]) + bytes(18) + bytes([9])))
+    by_message = J1939Decoder(db, "timestamp")
+    stream = J1939LogStream(db)
+    for msg in messages:
+        by_message.append(msg, stream)
+    by_block = J1939Decoder(db, "timestamp")
+    stream = J1939LogStream(db)
+    for block in iter_message_blocks(messages, 5):
+        by_block.append_block(block, stream)
+    by_whole_block = J1939Decoder(db, "timestamp")
+    by_whole_block.append_block(next(iter_message_blocks(messages)),
+                                J1939LogStream(db))
+
+    for decoder in (by_message, by_block, by_whole_block):
+        assert decoder.signal_keys == ["SA33.PDU2.GE236.LongMessage.First",
+                                       "SA33.PDU2.GE236.LongMessage.Last"]
+        timestamps, values = decoder.decode_signal(decoder.signal_keys[0])
+        assert list(timestamps) == [0.75, 1.1, 1.75, 2.75]
+        assert list(values) == [0, 7, 1, 2]
+        timestamps, values = decoder.decode_signal(decoder.signal_keys[1])
+        assert list(timestamps) == [0.75, 1.1, 1.75, 2.75]
+        assert list(values) == [10, 9, 11, 12]
+
+    single_frames = J1939Decoder(db, "timestamp")
+    single_frames.append_block(next(iter_message_blocks(messages)))
+    timestamps, _ = single_frames.decode_signal(
+        "SA33.PDU2.GE236.LongMessage.First"
+    )
+    assert list(timestamps) == [1.1]
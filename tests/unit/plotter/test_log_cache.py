@@ -0,0 +1,68 @@
+""" Unit-tests for decoded logs cache module """
+
+import os
+
+import numpy as np
+
+from plotter import LogCache
+
+def test_log_cache(tmp_path):
+    """
+    Unit-tests for LogCache
+
+    Step 0: Check that the key depends on the contents of the given files
+        and the settings, which aren't read as files
+    Step 1: Check that the size limit given in MiB is converted to bytes and
+        a missing entry isn't loaded
+    Step 2: Store an entry and check that the loaded data is identical
+    Step 3: Check that the entry loaded as memory-mapped arrays is identical
+    Step 4: Store two more entries exceeding the size limit and check that
+        the least recently used entry is evicted
+    """
+    log_path = tmp_path / "test.log"
+    log_path.write_bytes(b"log data")
+    dbc_path = tmp_path / "test.dbc"
+    dbc_path.write_bytes(b"dbc data")
+
+    paths = [str(log_path), str(dbc_path)]
+    key = LogCache.make_key(paths, ["hex", True])
+    assert key == LogCache.make_key(paths, ["hex", True])
+    assert key != LogCache.make_key(paths, ["dec", True])
+    by_name = LogCache.make_key([str(log_path)], [str(dbc_path)])
+    dbc_path.write_bytes(b"new dbc data")
+    assert key != LogCache.make_key(paths, ["hex", True])
+    assert by_name == LogCache.make_key([str(log_path)], [str(dbc_path)])
+    missing = LogCache.make_key([str(tmp_path / "missing.dbc")])
+    assert missing != LogCache.make_key([str(tmp_path / "other.dbc")])
+
+    assert LogCache.from_megabytes(str(tmp_path), 2).max_size == 2 * 1024 * 1024
+
+    cache_dir = tmp_path / "cache"
+    arrays = {
+        "timestamps": np.arange(1000, dtype=np.float64),
+        "payloads": np.zeros((1000, 8), dtype=np.uint8)
+    }
+    cache = LogCache(str(cache_dir), 40000)
+    assert cache.load("a") is None
+
+    cache.store("a", arrays)
+    loaded = cache.load("a")
+    assert list(loaded) == list(arrays)
+    for name, array in arrays.items():
+        assert np.array_equal(loaded[name], array)
+        assert loaded[name].dtype == array.dtype
+
+    mapped = cache.load("a", mmap=True)
+    for name, array in arrays.items():
+        assert isinstance(mapped[name], np.memmap)
+        assert np.array_equal(mapped[name], array)
+        assert mapped[name].dtype == array.dtype
+    del mapped
+
+    cache.store("b", arrays)
+    os.utime(cache_dir / "a.npz", ns=(0, 0))
+    os.utime(cache_dir / "b.npz", ns=(1, 1))
+    cache.store("c", arrays)
+    assert cache.load("a") is None
+    assert cache.load("b") is not None
+    assert cache.load("c") is not None
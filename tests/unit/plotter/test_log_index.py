@@ -0,0 +1,87 @@
+""" Unit-tests for sparse time index of CAN logs module """
+
+import can
+import pytest
+
+from plotter import LogCache, LogChunk, LogIndex, build_log_index, \
+                    join_chunks, load_log_index, read_log_chunk
+
+def _write_log(path, count):
+    """
+    Writes a log of 'count' messages sampled every 10 ms starting from 100 s
+    """
+    with can.Logger(str(path)) as writer:
+        for i in range(count):
+            writer.on_message_received(can.Message(
+                timestamp=100.0 + i / 100, arbitration_id=0xdf00064,
+                data=bytes([i % 256, 0])
+            ))
+
+@pytest.mark.parametrize("ext", [".asc", ".blf", ".log"])
+def test_build_log_index(tmp_path, ext):
+    """
+    Unit-tests for build_log_index() and LogIndex
+
+    Step 0: Build an index of a log of the given format with small chunks
+    Step 1: Check that the index timestamps are the first timestamps of the
+        chunks in ascending order
+    Step 2: Check that the selected chunks contain all messages of a time
+        window and the window isn't the whole log
+    Step 3: Check that the index restored from a dict of arrays is identical
+    """
+    path = tmp_path / ("test_log" + ext)
+    _write_log(path, 20000)
+    index = build_log_index(path, step=16384)
+    assert len(index.chunks) > 4
+    assert list(index.timestamps) == sorted(index.timestamps)
+    for chunk, timestamp in zip(index.chunks, index.timestamps):
+        assert next(iter(read_log_chunk(chunk))).timestamp == timestamp
+
+    start = index.start_time + 50.0
+    end = start + 10.0
+    selected = index.select(start, end)
+    assert 0 < len(selected) < len(index.chunks)
+    timestamps = [msg.timestamp for chunk in selected
+                  for msg in read_log_chunk(chunk)]
+    assert timestamps[0] < start + 0.005
+    assert timestamps[-1] > end - 0.005
+
+    restored = LogIndex.from_arrays(str(path), index.to_arrays())
+    assert restored.chunks == index.chunks
+    assert list(restored.timestamps) == list(index.timestamps)
+
+def test_load_log_index(tmp_path):
+    """
+    Unit-tests for load_log_index()
+
+    Step 0: Load an index of a log with a cache
+    Step 1: Check that the index is reused within the session and saved to
+        the cache
+    Step 2: Check that the index is rebuilt when the log changes
+    """
+    path = tmp_path / "test_log.log"
+    _write_log(path, 1000)
+    cache = LogCache(str(tmp_path / "cache"), 1024 * 1024 * 1024)
+    index = load_log_index(path, cache=cache)
+    assert load_log_index(path, cache=cache) is index
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+
+    _write_log(path, 2000)
+    assert load_log_index(path, cache=cache) is not index
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 2
+
+def test_join_chunks():
+    """
+    Unit-tests for join_chunks()
+
+    Step 0: Check that adjacent chunks are joined up to the given size with
+        the prefix of the first joined chunk
+    Step 1: Check that non-adjacent chunks aren't joined
+    """
+    chunks = [LogChunk("log", 0, 10), LogChunk("log", 10, 20, b"h"),
+              LogChunk("log", 20, 30, b"h"), LogChunk("log", 40, 50, b"h")]
+    assert join_chunks(chunks, 25) == [LogChunk("log", 0, 30),
+                                       LogChunk("log", 40, 50, b"h")]
+    assert join_chunks(chunks, 15) == [LogChunk("log", 0, 20),
+                                       LogChunk("log", 20, 30, b"h"),
+                                       LogChunk("log", 40, 50, b"h")]
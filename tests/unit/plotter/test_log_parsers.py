@@ -0,0 +1,153 @@
+""" Unit-tests for fast CAN text log parsers module """
+
+import can
+import pytest
+
+from plotter import LogChunk, iter_frame_blocks, open_log_reader, \
+                    open_log_tail, read_log_chunk, split_log
+
+def _messages(count):
+    """
+    Returns a list of 'count' messages: mostly classic data frames with
+    some remote, error and CAN FD frames in between
+    """
+    messages = []
+    for i in range(count):
+        if i % 97 == 0:
+            msg = can.Message(timestamp=1.0 + i / 1000, is_error_frame=True,
+                              channel=1)
+        elif i % 89 == 0:
+            msg = can.Message(timestamp=1.0 + i / 1000, arbitration_id=0x123,
+                              is_extended_id=False, is_remote_frame=True,
+                              dlc=8, channel=1)
+        elif i % 83 == 0:
+            msg = can.Message(timestamp=1.0 + i / 1000,
+                              arbitration_id=0x18fef100, is_fd=True,
+                              data=bytes(range(12)), channel=0)
+        else:
+            msg = can.Message(timestamp=1.0 + i / 1000,
+                              arbitration_id=(0xdf00064, 0x55064f9)[i % 2],
+                              data=bytes([i % 256, i // 256 % 256, 1, 2,
+                                          3, 4, 5, 6][:1 + i % 8]),
+                              channel=i % 2)
+        messages.append(msg)
+    return messages
+
+def _frames(blocks):
+    """
+    Returns a list of (timestamp, channel, arbitration_id, data) tuples of
+    the frame 'blocks'
+    """
+    frames = []
+    for block in blocks:
+        for i in range(len(block)):
+            frames.append((
+                round(float(block.timestamps[i]), 6),
+                block.channels[block.channel_index[i]],
+                int(block.arbitration_ids[i]),
+                bytes(block.payloads[i, :block.lengths[i]])
+            ))
+    return frames
+
+def _expected(messages):
+    """
+    Returns a list of (timestamp, channel, arbitration_id, data) tuples of
+    python-can 'messages'
+    """
+    return [(round(x.timestamp, 6), x.channel, x.arbitration_id,
+             bytes(x.data)) for x in messages]
+
+@pytest.mark.parametrize("ext", [".asc", ".log"])
+def test_iter_frame_blocks(tmp_path, ext):
+    """
+    Unit-tests for iter_frame_blocks()
+
+    Step 0: Write a log of the given format with python-can
+    Step 1: Check that the frames parsed in small blocks are equal to the
+        messages read by python-can
+    Step 2: Check that the frames parsed chunk by chunk are equal to the
+        messages read by python-can from the same chunks
+    """
+    path = str(tmp_path / ("test_log" + ext))
+    with can.Logger(path) as writer:
+        for msg in _messages(3000):
+            writer.on_message_received(msg)
+
+    size = (tmp_path / ("test_log" + ext)).stat().st_size
+    blocks = list(iter_frame_blocks(LogChunk(path, 0, size),
+                                    block_size=4096))
+    assert len(blocks) > 1
+    assert _frames(blocks) == _expected(open_log_reader(path))
+
+    for chunk in split_log(path, 16384):
+        assert _frames(iter_frame_blocks(chunk)) == \
+            _expected(read_log_chunk(chunk))
+
+def test_iter_frame_blocks_asc(tmp_path):
+    """
+    Unit-tests for iter_frame_blocks() with ASC header settings
+
+    Step 0: Write an ASC log with decimal base and a trigger block
+    Step 1: Check that the frames are equal to the messages read by
+        python-can with relative and absolute timestamps
+    Step 2: Check that None is returned for formats without a fast parser
+    """
+    path = tmp_path / "test_log.asc"
+    path.write_text(
+        "date Mon Oct 12 10:20:30.000 am 2026\n"
+        "base dec  timestamps absolute\n"
+        "no internal events logged\n"
+        "// version 9.0.0\n"
+        "Begin Triggerblock Mon Oct 12 10:20:31.000 am 2026\n"
+        "   0.000000 Start of measurement\n"
+        "   0.001000 1  234881124x      Rx   d 8 1 2 3 4 5 6 7 255\n"
+        "   0.002000 2  291x            Tx   d 2 16 32\n"
+        "   0.003000 1  Statistic: D 0 R 0 XD 0 XR 0 E 0 O 0 B 0.00%\n"
+        "   0.004000 CANFD   1 Rx 419361024x 1 0 9 12 "
+        "0 1 2 3 4 5 6 7 8 9 10 11\n"
+        "End TriggerBlock\n",
+        encoding="utf-8"
+    )
+    size = path.stat().st_size
+    for rel in (True, False):
+        assert _frames(iter_frame_blocks(LogChunk(str(path), 0, size),
+                                         "hex", rel)) == \
+            _expected(can.ASCReader(str(path), "hex", rel))
+
+    assert iter_frame_blocks(LogChunk(str(path.with_suffix(".blf")),
+                                      0, 0)) is None
+
+def test_log_tail(tmp_path):
+    """
+    Unit-tests for LogTail class
+
+    Step 0: Write a candump log and read it with a LogTail
+    Step 1: Check that a repeated read returns no frames
+    Step 2: Append lines with an incomplete trailing line and check that
+        only the complete lines are read
+    Step 3: Complete the trailing line and check that it is read
+    Step 4: Check that the frames read in parts are equal to the messages
+        read by python-can from the whole log
+    Step 5: Check that None is returned for formats without a fast parser
+    """
+    path = tmp_path / "test_log.log"
+    lines = [f"({1.0 + i / 1000:.6f}) can0 0DF00064#{i % 256:02X}00\n"
+             for i in range(100)]
+    path.write_text("".join(lines[:50]), encoding="utf-8")
+    tail = open_log_tail(path)
+    frames = _frames(tail.read())
+    assert len(frames) == 50
+
+    assert not _frames(tail.read())
+
+    with open(path, "a", encoding="utf-8") as log_file:
+        log_file.write("".join(lines[50:99]) + lines[99][:10])
+    frames += _frames(tail.read())
+    assert len(frames) == 99
+
+    with open(path, "a", encoding="utf-8") as log_file:
+        log_file.write(lines[99][10:])
+    frames += _frames(tail.read())
+    assert frames == _expected(open_log_reader(str(path)))
+
+    assert open_log_tail(path.with_suffix(".blf")) is None
@@ -0,0 +1,57 @@
+""" Unit-tests for CAN log readers module """
+
+import can
+import pytest
+
+from plotter import open_log_reader, read_log_chunk, split_log
+
+def _messages(count):
+    """
+    Returns a list of 'count' J1939 messages with various payloads
+    """
+    return [
+        can.Message(timestamp=1.0 + i / 1000,
+                    arbitration_id=(0xdf00064, 0x55064f9)[i % 2],
+                    data=bytes([i % 256, i // 256 % 256, 1, 2, 3, 4, 5, 6]),
+                    channel=0)
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize("ext", [".asc", ".blf", ".csv", ".log"])
+def test_split_log(tmp_path, ext):
+    """
+    Unit-tests for split_log() and read_log_chunk()
+
+    Step 0: Write a log of the given format with python-can
+    Step 1: Split the log into chunks of a few kilobytes
+    Step 2: Check that the chunks are contiguous and cover the whole file
+    Step 3: Check that the messages read chunk by chunk are equal to the
+        messages read by a sequential reader
+    """
+    path = str(tmp_path / ("test_log" + ext))
+    with can.Logger(path) as writer:
+        for msg in _messages(5000):
+            writer.on_message_received(msg)
+
+    chunks = split_log(path, 4096)
+    assert len(chunks) > 1
+    for prev, chunk in zip(chunks, chunks[1:]):
+        assert prev.end == chunk.start
+
+    expected = [(x.timestamp, x.arbitration_id, bytes(x.data))
+                for x in open_log_reader(path)]
+    assert len(expected) == 5000
+    actual = [(x.timestamp, x.arbitration_id, bytes(x.data))
+              for chunk in chunks for x in read_log_chunk(chunk)]
+    assert actual == expected
+
+def test_split_log_unsupported(tmp_path):
+    """
+    Unit-tests for split_log() with an unsupported format
+
+    Step 0: Check that ImportError is raised for a .txt file
+    """
+    path = tmp_path / "test_log.txt"
+    path.write_text("")
+    with pytest.raises(ImportError):
+        split_log(str(path), 4096)
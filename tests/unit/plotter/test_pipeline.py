@@ -0,0 +1,67 @@
+""" Unit-tests for pipelined J1939 import module """
+
+import can
+import numpy as np
+import pytest
+
+from plotter import ImportPipeline, J1939Decoder, iter_message_blocks, \
+                    load_j1939_database
+
+def _messages(count):
+    """
+    Returns 'count' messages of two known frame ids
+    """
+    return [can.Message(timestamp=float(i),
+                        arbitration_id=(0xdf00064, 0x55064f9)[i % 2],
+                        data=bytes([i % 256, 0]))
+            for i in range(count)]
+
+def test_import_pipeline():
+    """
+    Unit-tests for ImportPipeline
+
+    Step 0: Read blocks of messages through the pipeline and accumulate the
+        prepared blocks
+    Step 1: Check that all frames are accumulated as by the sequential
+        appending
+    Step 2: Check that an exception raised by the reader stage is re-raised
+        by next_groups()
+    Step 3: Check that a pipeline is cancelled while its stages are blocked
+        by the full queues
+    """
+    db = load_j1939_database(["dbc/example_db.dbc"])
+    messages = _messages(1000)
+    expected = J1939Decoder(db, "timestamp")
+    for msg in messages:
+        expected.append(msg)
+
+    decoder = J1939Decoder(db, "timestamp")
+    pipeline = ImportPipeline(iter_message_blocks(messages, 64), decoder, 2)
+    processed = 0
+    while not pipeline.done:
+        result = pipeline.next_groups()
+        if result is not None:
+            processed += result[0]
+            decoder.append_prepared(result[1])
+    assert processed == 1000
+    assert decoder.signal_keys == expected.signal_keys
+    for key in expected.signal_keys:
+        timestamps, values = decoder.decode_signal(key)
+        expected_timestamps, expected_values = expected.decode_signal(key)
+        assert np.array_equal(timestamps, expected_timestamps)
+        assert np.array_equal(values, expected_values)
+
+    def failing_blocks():
+        yield from iter_message_blocks(messages[:10])
+        raise ValueError("broken log")
+
+    pipeline = ImportPipeline(failing_blocks(), decoder)
+    assert pipeline.next_groups() is not None
+    with pytest.raises(ValueError):
+        pipeline.next_groups()
+    assert pipeline.done
+
+    pipeline = ImportPipeline(iter_message_blocks(messages, 10), decoder, 1)
+    assert pipeline.next_groups(1.0) is not None
+    pipeline.cancel()
+    assert not pipeline.done
@@ -1,5 +1,7 @@
 """ Unit-tests for plot_window.py entities """
 
+import pandas as pd
+
 # modules under test
 from plotter import PlotProperty, PlotProperties, PlotPropertiesHeader, \
                     PlotWindow
@@ -82,3 +84,50 @@ def test_plot_window(setup_plot_list, qtbot):
     assert props.topLevelItem(props._signals.index("sig1")).text(
         PlotProperty.RMS.value
     ) == "10.0"
+
+# pylint: disable-next=unused-argument
+def test_plot_window_append_data(setup_plot_list, monkeypatch, qtbot):
+    """
+    Unit-tests for PlotWindow.append_data method
+
+    Step 0: Instantiate a PlotWindow with setup_plot_list fixture
+    Step 1: Append new samples of both signals
+    Step 2: Check that the plotted lines are extended with the new samples
+    Step 3: Check that the merged plot points contain the new timestamps
+    Step 4: Check that the properties are updated with the new samples
+    Step 5: Append samples while the view is zoomed and check that the
+        properties aren't updated
+    Step 6: Append samples with the view reset and check that the
+        properties include the samples appended while zoomed
+    """
+    pwin = PlotWindow(setup_plot_list, "Test PlotWindow")
+    pwin.append_data([
+        pd.DataFrame({"timestamp": [6, 8], "sig1": [6, 8]}),
+        pd.DataFrame({"timestamp": [7], "sig2": [-6]})
+    ])
+
+    assert pwin.signals == ["sig1", "sig2"]
+    line = pwin.canvas.figure.get_axes()[1].get_lines()[0]
+    assert list(line.get_xdata()) == [0, 2, 4, 6, 8]
+    assert list(line.get_ydata()) == [0, 2, 4, 6, 8]
+
+    assert list(pwin.plot_points.iloc[:, 0]) == [0, 1, 2, 3, 4, 5, 6, 7, 8]
+
+    props = pwin.plot_properties
+    # pylint: disable-next=protected-access
+    row = props.topLevelItem(props._signals.index("sig1"))
+    assert row.text(PlotProperty.Max.value) == "8.0"
+    # pylint: disable-next=protected-access
+    row = props.topLevelItem(props._signals.index("sig2"))
+    assert row.text(PlotProperty.Min.value) == "-6.0"
+
+    with monkeypatch.context() as patch:
+        patch.setattr(type(pwin.toolbar), "view_changed", True)
+        pwin.append_data([pd.DataFrame({"timestamp": [10], "sig1": [20]})])
+        # pylint: disable-next=protected-access
+        row = props.topLevelItem(props._signals.index("sig1"))
+        assert row.text(PlotProperty.Max.value) == "8.0"
+    pwin.append_data([pd.DataFrame({"timestamp": [12], "sig1": [1]})])
+    assert list(line.get_xdata()) == [0, 2, 4, 6, 8, 10, 12]
+    assert row.text(PlotProperty.Max.value) == "20.0"
+    assert list(pwin.plot_points.iloc[:, 0])[-2:] == [10, 12]
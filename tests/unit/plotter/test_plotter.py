@@ -1,11 +1,31 @@
 """ Unit-tests for plotter.py entities """
 
+import multiprocessing
+import time
+
+import can
+import numpy as np
+import pandas as pd
 import pytest
 
 # modules under test
-from plotter import BasePlotter, SimpleCsvPlotter, J1939DumpPlotter, \
+from plotter import BasePlotter, SimpleCsvPlotter, J1939DumpPlotter, LogCache, \
                     LogOpenProgress, PlotWindow, PlotterInitError, \
-                    PlotterPlotError
+                    PlotterPlotError, SignalSamples, align_samples
+from plotter import csv_plotter
+
+def _assert_same_samples(actual, expected, var):
+    """
+    Asserts that the 'actual' and 'expected' plotters have the same samples
+    of signal 'var'
+    """
+    samples = actual.samples(var)
+    expected_samples = expected.samples(var)
+    np.testing.assert_array_equal(samples.timestamps,
+                                  expected_samples.timestamps)
+    np.testing.assert_array_equal(samples.values, expected_samples.values)
+    assert samples.values.dtype == expected_samples.values.dtype
+    assert samples.ns_timestamps == expected_samples.ns_timestamps
 
 def test_base_plotter_init():
     """
@@ -66,6 +86,290 @@ def test_simple_csv_plotter(setup_simple_csv_file, qtbot):
     pwin = plotter.plot([["sig1"]], False)
     assert isinstance(pwin, PlotWindow)
 
+# pylint: disable-next=unused-argument
+def test_simple_csv_plotter_sparse(tmp_path, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter signals storage
+
+    Step 0: Open a CSV file with signals sampled in different rows
+    Step 1: Check that every signal is stored as SignalSamples with the
+        sampled values only
+    Step 2: Check that the plot data of a signal contains no NaN
+    """
+    path = tmp_path / "test_sparse.csv"
+    path.write_text("timestamp;sig1;sig2\n0;1;\n1;;5\n2;3;\n3;;7\n",
+                    encoding="utf-8")
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig2": 2.0})
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.plot_vars == ["sig1", "sig2"]
+
+    # pylint: disable=protected-access
+    samples = plotter._signal("sig1")
+    assert isinstance(samples, SignalSamples)
+    assert list(samples.timestamps) == [0, 2]
+    assert list(samples.values) == [1, 3]
+    assert list(plotter._signal("sig2").values) == [10, 14]
+
+    df = plotter._signal_frame("sig2")
+    assert list(df.columns) == ["timestamp", "sig2"]
+    assert not df.isna().any().any()
+
+# pylint: disable-next=unused-argument
+def test_simple_csv_plotter_chunked(tmp_path, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter chunked opening
+
+    Step 0: Open a CSV file with unsorted timestamps in steps of a chunk
+    Step 1: Check that the processed rows and the read fraction of the file
+        grow with every step
+    Step 2: Check that the signals equal the ones of the file opened at once
+        and are sorted by timestamps
+    Step 3: Cancel the opening in progress and check that the file is opened
+        from the beginning by the next step
+    """
+    path = tmp_path / "test_chunked.csv"
+    timestamps = [3, 1, 2, 0, 7, 5, 6, 4, 9, 8]
+    path.write_text("timestamp;sig1;sig2\n" + "".join(
+        f"{x};{x * 10};{'' if x % 3 else x}\n" for x in timestamps
+    ), encoding="utf-8")
+
+    expected = SimpleCsvPlotter(str(path), ";", "timestamp", {})
+    assert expected.open() == LogOpenProgress.OPEN_COMPLETED
+
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {})
+    plotter.CHUNK_ROWS = 4
+    assert plotter.progress == 0.0
+    assert plotter.open(4) == LogOpenProgress.OPEN_IN_PROGRESS
+    assert plotter.processed == 4
+    assert not plotter.is_opened
+    assert plotter.open(4) == LogOpenProgress.OPEN_IN_PROGRESS
+    assert plotter.processed == 8
+    assert plotter.open(4) == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.processed == 10
+    assert plotter.progress == 1.0
+    assert plotter.plot_vars == expected.plot_vars
+    for var in expected.plot_vars:
+        _assert_same_samples(plotter, expected, var)
+    assert list(plotter.samples("sig1").timestamps) == list(range(10))
+    assert list(plotter.samples("sig2").values) == [0, 3, 6, 9]
+
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {})
+    plotter.CHUNK_ROWS = 4
+    assert plotter.open(4) == LogOpenProgress.OPEN_IN_PROGRESS
+    plotter.cancel_open()
+    assert plotter.processed == 0
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.processed == 10
+
+# pylint: disable-next=unused-argument
+def test_simple_csv_plotter_engine(setup_simple_csv_file, monkeypatch, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter parsing engines
+
+    Step 0: Check that an unknown engine leads to a PlotterInitError
+        exception
+    Step 1: Open setup_simple_csv_file fixture by the pyarrow engine and
+        check that the signals equal the ones parsed by the C parser
+    Step 2: Make the pyarrow engine fail after the first chunk and check
+        that the file is parsed by the C parser from the beginning
+    """
+    with pytest.raises(PlotterInitError):
+        SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {},
+                         engine="python")
+
+    expected = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {})
+    expected.open()
+    plotter = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {},
+                               engine="pyarrow")
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.plot_vars == expected.plot_vars
+    assert np.array_equal(plotter.samples("sig1").values,
+                          expected.samples("sig1").values)
+
+    read_csv_chunks = csv_plotter.read_csv_chunks
+
+    def failing_chunks(source, delimiter, chunk_rows, engine="c"):
+        chunks = read_csv_chunks(source, delimiter, chunk_rows, "c")
+        if engine == "c":
+            return chunks
+        def fail():
+            chunk = next(chunks, None)
+            if chunk is not None:
+                yield chunk
+            raise ValueError("Conversion error")
+        return fail()
+
+    monkeypatch.setattr(csv_plotter, "read_csv_chunks", failing_chunks)
+    plotter = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {},
+                               engine="pyarrow")
+    plotter.CHUNK_ROWS = 3
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.processed == 8
+    assert np.array_equal(plotter.samples("sig1").values,
+                          expected.samples("sig1").values)
+
+# pylint: disable-next=unused-argument
+def test_simple_csv_plotter_lazy(tmp_path, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter lazy mode
+
+    Step 0: Check that lazy mode in follow mode or without cached columns
+        leads to a PlotterInitError exception
+    Step 1: Open a CSV file with unsorted timestamps in lazy mode and check
+        that all signals are listed while no column is read
+    Step 2: Check that the samples of every signal equal the ones of the file
+        opened at once
+    Step 3: Check that only the recently requested columns are kept
+    Step 4: Call plot() method and check that the returned object has a
+        PlotWindow type
+    """
+    path = tmp_path / "test_lazy.csv"
+    timestamps = [3, 1, 2, 0, 5, 4]
+    path.write_text("sig1;timestamp;sig2;sig3\n" + "".join(
+        f"{x * 10};{x};{'' if x % 2 else x};{-x}\n" for x in timestamps
+    ), encoding="utf-8")
+
+    with pytest.raises(PlotterInitError):
+        SimpleCsvPlotter(str(path), ";", "timestamp", {}, True, lazy=True)
+    with pytest.raises(PlotterInitError):
+        SimpleCsvPlotter(str(path), ";", "timestamp", {}, lazy=True,
+                         cache_columns=0)
+
+    expected = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig3": 2.0})
+    expected.open()
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig3": 2.0},
+                               lazy=True, cache_columns=2)
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.is_opened
+    assert plotter.plot_vars == ["sig1", "sig2", "sig3"]
+    # pylint: disable=protected-access
+    assert not plotter._signals
+
+    for var in expected.plot_vars:
+        pd.testing.assert_frame_equal(plotter._signal_frame(var),
+                                      expected._signal_frame(var))
+    assert list(plotter._signals) == ["sig2", "sig3"]
+    samples = plotter.samples("sig2")
+    assert plotter.samples("sig2") is samples
+    assert list(plotter._signals) == ["sig3", "sig2"]
+    assert list(samples.timestamps) == [0, 2, 4]
+
+    pwin = plotter.plot([["sig1", "sig3"]], False)
+    assert isinstance(pwin, PlotWindow)
+    assert list(plotter._signals) == ["sig1", "sig3"]
+
+def test_simple_csv_plotter_cache(tmp_path, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter binary cache
+
+    Step 0: Open a CSV file with a sparse column and check that it's stored
+        to the cache
+    Step 1: Open the file again and check that the signals are mapped from
+        the cache within a single step and equal the parsed ones
+    Step 2: Check that another scale or a changed file aren't loaded from the
+        cache
+    Step 3: Check that a file with a non-numeric column isn't cached
+    Step 4: Call plot() method and check that the returned object has a
+        PlotWindow type
+    """
+    path = tmp_path / "test_cache.csv"
+    timestamps = [3, 1, 2, 0, 5, 4]
+    path.write_text("sig1;timestamp;sig2\n" + "".join(
+        f"{x * 10};{x};{'' if x % 2 else x}\n" for x in timestamps
+    ), encoding="utf-8")
+    cache = LogCache(str(tmp_path / "cache"), 1024 * 1024)
+
+    expected = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig2": 2.0},
+                                cache=cache)
+    assert expected.open() == LogOpenProgress.OPEN_COMPLETED
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig2": 2.0},
+                               lazy=True, cache=cache)
+    assert plotter.open(max_rows=1) == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.plot_vars == ["sig1", "sig2"]
+    # pylint: disable=protected-access
+    for var in expected.plot_vars:
+        assert isinstance(plotter.samples(var).values.base, np.memmap)
+        pd.testing.assert_frame_equal(plotter._signal_frame(var),
+                                      expected._signal_frame(var))
+    assert list(plotter.samples("sig2").timestamps) == [0, 2, 4]
+
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {}, cache=cache)
+    plotter.open(max_rows=1)
+    assert not plotter.is_opened
+    with path.open("a", encoding="utf-8") as csv_file:
+        csv_file.write("60;6;6\n")
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig2": 2.0},
+                               cache=cache)
+    plotter.open(max_rows=1)
+    assert not plotter.is_opened
+
+    text_path = tmp_path / "test_cache_text.csv"
+    text_path.write_text("timestamp;sig1\n0;a\n1;b\n", encoding="utf-8")
+    text_cache = LogCache(str(tmp_path / "text_cache"), 1024 * 1024)
+    SimpleCsvPlotter(str(text_path), ";", "timestamp", {},
+                     cache=text_cache).open()
+    assert not (tmp_path / "text_cache").exists()
+
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {"sig2": 2.0},
+                               cache=cache)
+    plotter.open()
+    pwin = plotter.plot([["sig1", "sig2"]], False)
+    qtbot.addWidget(pwin)
+    assert isinstance(pwin, PlotWindow)
+
+def test_simple_csv_plotter_derived(tmp_path, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter derived signals
+
+    Step 0: Check that an invalid expression leads to a PlotterInitError
+        exception
+    Step 1: Open a CSV file in follow mode with derived signals and check
+        that the ones with available inputs are listed after the columns
+    Step 2: Check the samples of a derived signal of columns sampled at
+        different rows and of a derived signal of another one
+    Step 3: Check that the samples are reused until the inputs change
+    Step 4: Append rows to the file, call update() and check the new samples
+        of the derived signal
+    Step 5: Call plot() method and check that the returned object has a
+        PlotWindow type
+    """
+    path = tmp_path / "test_derived.csv"
+    path.write_text("timestamp;a;b\n0;1;\n1;2;10\n2;3;\n3;4;20\n",
+                    encoding="utf-8")
+    with pytest.raises(PlotterInitError):
+        SimpleCsvPlotter(str(path), ";", "timestamp", {},
+                         derived={"x": "a +"})
+
+    plotter = SimpleCsvPlotter(str(path), ";", "timestamp", {"a": 2.0}, True,
+                               derived={"half": "total / 2",
+                                        "total": "a + b",
+                                        "missing": "a + c"})
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert plotter.plot_vars == ["a", "b", "total", "half"]
+
+    total = plotter.samples("total")
+    assert list(total.timestamps) == [1, 2, 3]
+    assert list(total.values) == [14, 16, 28]
+    assert list(plotter.samples("half").values) == [7, 8, 14]
+    assert plotter.samples("total") is total
+    with pytest.raises(PlotterPlotError):
+        plotter.samples("missing")
+
+    with path.open("a", encoding="utf-8") as csv_file:
+        csv_file.write("4;5;30\n")
+    assert plotter.update()
+    assert plotter.samples("total") is not total
+    df = plotter.new_samples("half")
+    assert list(df["timestamp"]) == [4]
+    assert list(df["half"]) == [20]
+    assert list(plotter.new_samples("half")["half"]) == [20]
+
+    pwin = plotter.plot([["a", "total"], ["half"]], False)
+    assert isinstance(pwin, PlotWindow)
+    qtbot.addWidget(pwin)
+
 # pylint: disable-next=unused-argument
 def test_j1939_dump_plotter(setup_j1939_dump_file, qtbot):
     """
@@ -117,3 +421,431 @@ def test_j1939_dump_plotter(setup_j1939_dump_file, qtbot):
 
     pwin = plotter.plot([["SA100.PDU2.GE0.ExampleMessageRx.RxSignal1"]], False)
     assert isinstance(pwin, PlotWindow)
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_batched(setup_j1939_dump_file, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter batched opening
+
+    Step 0: Instantiate a J1939DumpPlotter with setup_j1939_dump_file fixture
+    Step 1: Perform opening process with 1000 messages per step and check
+        that every step in progress processes exactly 1000 messages
+    Step 2: Check that the number of steps corresponds to the fixture size
+    Step 3: Check that a step limited by a zero time budget processes a
+        single message only
+    """
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"])
+
+    steps = 0
+    while plotter.open(1000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        steps += 1
+        assert plotter.processed == steps * 1000
+
+    assert steps == 20
+    assert plotter.is_opened
+
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"])
+    assert plotter.open(1000, 0.0) == LogOpenProgress.OPEN_IN_PROGRESS
+    assert plotter.processed == 1
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_parallel(setup_j1939_dump_file, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter parallel opening
+
+    Step 0: Open setup_j1939_dump_file fixture sequentially
+    Step 1: Open the same file with 2 workers and small chunks
+    Step 2: Check that all messages are processed and the data is identical
+        to the sequential one
+    Step 3: Kill the worker processes while opening and check that it leads
+        to an ImportError exception
+    """
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"])
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+
+    parallel = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                                workers=2)
+    parallel.PARALLEL_CHUNK_SIZE = 64 * 1024
+    while parallel.open(100000, 0.1) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+
+    assert parallel.is_opened
+    assert parallel.processed == 20000
+    assert parallel.plot_vars == plotter.plot_vars
+    for var in plotter.plot_vars:
+        _assert_same_samples(parallel, plotter, var)
+
+    parallel = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                                workers=2)
+    parallel.PARALLEL_CHUNK_SIZE = 64 * 1024
+    assert parallel.open(100000, 0.0) == LogOpenProgress.OPEN_IN_PROGRESS
+    while not multiprocessing.active_children():
+        time.sleep(0.01)
+    for process in multiprocessing.active_children():
+        process.kill()
+    with pytest.raises(ImportError):
+        while parallel.open(100000, 0.1) == LogOpenProgress.OPEN_IN_PROGRESS:
+            pass
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_pipelined(setup_j1939_dump_file, tmp_path, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter pipelined opening
+
+    Step 0: Open setup_j1939_dump_file fixture and its copy in candump
+        format sequentially and pipelined
+    Step 1: Check that all messages are processed and the data is identical
+        to the sequential one
+    Step 2: Cancel a pipelined opening in progress and check that the
+        plotter can be opened again
+    """
+    path = str(tmp_path / "test_j1939_dump.log")
+    with can.Logger(path) as writer:
+        for msg in can.LogReader(setup_j1939_dump_file):
+            writer.on_message_received(msg)
+
+    for filename in (setup_j1939_dump_file, path):
+        plotter = J1939DumpPlotter(filename, ["dbc/example_db.dbc"])
+        while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+            pass
+
+        pipelined = J1939DumpPlotter(filename, ["dbc/example_db.dbc"],
+                                     pipelined=True)
+        while pipelined.open(1000, 0.1) == LogOpenProgress.OPEN_IN_PROGRESS:
+            pass
+        assert pipelined.processed == 20000
+        assert pipelined.plot_vars == plotter.plot_vars
+        for var in plotter.plot_vars:
+            _assert_same_samples(pipelined, plotter, var)
+
+    pipelined = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                                 pipelined=True)
+    assert pipelined.open(1, None) == LogOpenProgress.OPEN_IN_PROGRESS
+    pipelined.cancel_open()
+    while pipelined.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    assert pipelined.processed == 20000
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_cache(setup_j1939_dump_file, tmp_path, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter decoded data caching
+
+    Step 0: Open setup_j1939_dump_file fixture with an empty cache
+    Step 1: Check that the decoded data is stored to the cache
+    Step 2: Open the same file again and check that it is opened within a
+        single step with the identical signals
+    """
+    cache = LogCache(str(tmp_path / "cache"), 1024 * 1024 * 1024)
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                               cache=cache)
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+
+    cached = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                              cache=cache)
+    assert cached.open() == LogOpenProgress.OPEN_COMPLETED
+    assert cached.is_opened
+    assert cached.plot_vars == plotter.plot_vars
+    for var in plotter.plot_vars:
+        _assert_same_samples(cached, plotter, var)
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_derived(setup_j1939_dump_file, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter derived signals
+
+    Step 0: Open setup_j1939_dump_file fixture with a derived signal of two
+        signals of different messages
+    Step 1: Check that the derived signal is listed and equals the aligned
+        decoded signals
+    Step 2: Call plot() method with spectrum and check that the returned
+        object has a PlotWindow type
+    """
+    tx_var = "SA249.PDU1.DA100.ExampleMessageTx.TxSignal1"
+    rx_var = "SA100.PDU2.GE0.ExampleMessageRx.RxSignal1"
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                               derived={"diff": f"{tx_var} - {rx_var}"})
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    assert plotter.plot_vars[-1] == "diff"
+
+    tx_samples = plotter.samples(tx_var).expand()
+    rx_samples = plotter.samples(rx_var).expand()
+    grid, (tx_values, rx_values) = align_samples(
+        [(tx_samples.timestamps, tx_samples.values),
+         (rx_samples.timestamps, rx_samples.values)]
+    )
+    samples = plotter.samples("diff")
+    assert len(samples) > 0
+    assert np.array_equal(samples.timestamps, grid)
+    assert np.array_equal(samples.values, tx_values - rx_values)
+
+    pwin = plotter.plot([["diff"]], True)
+    assert isinstance(pwin, PlotWindow)
+
+def test_j1939_dump_plotter_redecode(setup_j1939_dump_file, tmp_path):
+    """
+    Unit-tests for J1939DumpPlotter.redecode()
+
+    Step 0: Open setup_j1939_dump_file fixture keeping the raw frames
+    Step 1: Redecode it with a database with a rescaled signal of
+        ExampleMessageTx
+    Step 2: Check that the rescaled signal is decoded again while the decoded
+        signals of ExampleMessageRx are kept
+    Step 3: Check that the redecoded data is stored to the cache
+    Step 4: Check that a log opened without the raw frames can't be
+        redecoded
+    """
+    with open("dbc/example_db.dbc", encoding="utf-8") as dbc_file:
+        dbc = dbc_file.read()
+    dbc_path = str(tmp_path / "changed.dbc")
+    with open(dbc_path, "w", encoding="utf-8") as dbc_file:
+        dbc_file.write(dbc.replace('TxSignal1 : 0|8@1- (1,0)',
+                                   'TxSignal1 : 0|8@1- (2,0)'))
+
+    cache = LogCache(str(tmp_path / "cache"), 1024 * 1024 * 1024)
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                               cache=cache, keep_raw=True)
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    tx_var = "SA249.PDU1.DA100.ExampleMessageTx.TxSignal1"
+    rx_var = "SA100.PDU2.GE0.ExampleMessageRx.RxSignal1"
+    tx_samples = plotter.samples(tx_var)
+    rx_samples = plotter.samples(rx_var)
+    plot_vars = plotter.plot_vars
+
+    plotter.redecode([dbc_path])
+    assert plotter.plot_vars == plot_vars
+    assert plotter.samples(rx_var) is rx_samples
+    assert np.array_equal(plotter.samples(tx_var).timestamps,
+                          tx_samples.timestamps)
+    assert np.array_equal(plotter.samples(tx_var).values,
+                          tx_samples.values * 2)
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 2
+
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"])
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    with pytest.raises(PlotterPlotError):
+        plotter.redecode([dbc_path])
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_lazy(setup_j1939_dump_file, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter on demand signals decoding
+
+    Step 0: Open setup_j1939_dump_file fixture
+    Step 1: Check that no signal is decoded while opening
+    Step 2: Plot a signal and check that only this signal is decoded
+    Step 3: Check that the decoded signal is reused by the next plot
+    """
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"])
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    # pylint: disable=protected-access
+    assert not plotter._signals
+
+    var = "SA100.PDU2.GE0.ExampleMessageRx.RxSignal1"
+    plotter.plot([[var]], False)
+    assert list(plotter._signals) == [var]
+    assert len(plotter._signals[var]) == 10000
+
+    samples = plotter._signals[var]
+    plotter.plot([[var]], True)
+    assert plotter._signal(var) is samples
+
+# pylint: disable-next=unused-argument
+def test_simple_csv_plotter_follow(setup_simple_csv_file, qtbot):
+    """
+    Unit-tests for SimpleCsvPlotter follow mode
+
+    Step 0: Open setup_simple_csv_file fixture in follow mode
+    Step 1: Check that update() returns False while the file isn't changed
+    Step 2: Append rows with an incomplete trailing row and check that only
+        the complete rows are returned by new_samples()
+    Step 3: Check that the whole data contains the appended rows
+    Step 4: Check that an incomplete trailing row isn't read while opening
+        by both engines
+    """
+    plotter = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {},
+                               True)
+    assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+    assert not plotter.update()
+
+    with open(setup_simple_csv_file, "a", encoding="utf-8") as csv_file:
+        csv_file.write("8;5\n9;6\n10;")
+    assert plotter.update()
+    new = plotter.new_samples("sig1")
+    assert list(new["timestamp"]) == [8, 9]
+    assert list(new["sig1"]) == [5, 6]
+    assert len(plotter.samples("sig1")) == 10
+
+    for engine in ("c", "pyarrow"):
+        plotter = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp",
+                                   {}, True, engine=engine)
+        assert plotter.open() == LogOpenProgress.OPEN_COMPLETED
+        assert plotter.samples("sig1").timestamps[-1] == 9
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_follow(tmp_path, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter follow mode
+
+    Step 0: Open a candump log in follow mode
+    Step 1: Check that update() returns False while the file isn't changed
+    Step 2: Append frames and check that new_samples() returns the decoded
+        values of the appended frames only
+    Step 3: Check that the whole signal contains the appended frames
+    """
+    path = tmp_path / "test_j1939_dump.log"
+    lines = [f"({i:.6f}) can0 0DF00064#{i % 100:02X}00\n" for i in range(20)]
+    path.write_text("".join(lines[:10]), encoding="utf-8")
+
+    plotter = J1939DumpPlotter(str(path), ["dbc/example_db.dbc"], follow=True)
+    while plotter.open() == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+    assert plotter.is_opened
+    assert not plotter.update()
+
+    var = "can0.SA100.PDU2.GE0.ExampleMessageRx.RxSignal1"
+    # pylint: disable-next=protected-access
+    values = list(plotter._signal_frame(var)[var])
+    with open(path, "a", encoding="utf-8") as log_file:
+        log_file.write("".join(lines[10:]))
+    assert plotter.update()
+    new = plotter.new_samples(var)
+    assert len(new) == 10
+    assert list(new.iloc[:, 0]) == list(range(10, 20))
+    # pylint: disable-next=protected-access
+    assert list(plotter._signal_frame(var)[var]) == values + list(new[var])
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_time_range(tmp_path, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter time range opening
+
+    Step 0: Write a candump log and open it entirely
+    Step 1: Open a time range of the log sequentially and in parallel with
+        small chunks
+    Step 2: Check that only a part of the log is read and the signals equal
+        the time range of the entire log signals
+    """
+    path = str(tmp_path / "test_j1939_dump.log")
+    with can.Logger(path) as writer:
+        for i in range(40000):
+            writer.on_message_received(can.Message(
+                timestamp=100.0 + i / 100,
+                arbitration_id=(0xdf00064, 0x55064f9)[i % 2],
+                data=bytes([i % 256, 0])
+            ))
+    plotter = J1939DumpPlotter(path, ["dbc/example_db.dbc"])
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+
+    for workers in (1, 2):
+        ranged = J1939DumpPlotter(path, ["dbc/example_db.dbc"],
+                                  workers=workers, time_range=(200.0, 210.0))
+        ranged.PARALLEL_CHUNK_SIZE = 64 * 1024
+        while ranged.open(100000, 0.1) == LogOpenProgress.OPEN_IN_PROGRESS:
+            pass
+        assert ranged.processed < 40000
+        assert ranged.plot_vars == plotter.plot_vars
+        for var in plotter.plot_vars:
+            # pylint: disable=protected-access
+            expected = plotter._signal_frame(var)
+            timestamps = expected.iloc[:, 0]
+            expected = expected[(timestamps >= 200.0) & (timestamps <= 210.0)]
+            pd.testing.assert_frame_equal(ranged._signal_frame(var),
+                                          expected.reset_index(drop=True))
+
+# pylint: disable-next=unused-argument
+def test_j1939_dump_plotter_multiple_files(tmp_path, qtbot):
+    """
+    Unit-tests for J1939DumpPlotter opening of multiple logs
+
+    Step 0: Write a log of two channels and split it into consecutive logs
+        and into a log per channel
+    Step 1: Open the split logs sequentially, in parallel with small chunks
+        and from the cache
+    Step 2: Check that the signals equal the signals of the entire log
+    Step 3: Check that follow mode isn't allowed for multiple logs
+    """
+    messages = [
+        can.Message(timestamp=100.0 + i / 100,
+                    arbitration_id=(0xdf00064, 0x55064f9)[i % 2],
+                    data=bytes([i % 256, 0]), channel=f"can{i // 2 % 2}")
+        for i in range(20000)
+    ]
+    paths = {}
+    for name, selected in (("all.log", messages),
+                           ("first.log", messages[:7000]),
+                           ("second.log", messages[7000:]),
+                           ("can0.log", messages[0::4] + messages[1::4]),
+                           ("can1.log", messages[2::4] + messages[3::4])):
+        paths[name] = str(tmp_path / name)
+        selected = sorted(selected, key=lambda x: x.timestamp)
+        with can.Logger(paths[name]) as writer:
+            for msg in selected:
+                writer.on_message_received(msg)
+
+    plotter = J1939DumpPlotter(paths["all.log"], ["dbc/example_db.dbc"])
+    while plotter.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+        pass
+
+    cache = LogCache(str(tmp_path / "cache"), 1024 * 1024 * 1024)
+    for names in (["first.log", "second.log"], ["can0.log", "can1.log"]):
+        for workers in (1, 2, 2):
+            merged = J1939DumpPlotter([paths[x] for x in names],
+                                      ["dbc/example_db.dbc"], workers=workers,
+                                      cache=cache)
+            merged.PARALLEL_CHUNK_SIZE = 64 * 1024
+            while merged.open(1000, 0.1) == LogOpenProgress.OPEN_IN_PROGRESS:
+                pass
+            assert sorted(merged.plot_vars) == sorted(plotter.plot_vars)
+            for var in plotter.plot_vars:
+                _assert_same_samples(merged, plotter, var)
+
+    with pytest.raises(PlotterInitError):
+        J1939DumpPlotter([paths["can0.log"], paths["can1.log"]],
+                         ["dbc/example_db.dbc"], follow=True)
+
+# pylint: disable-next=unused-argument
+def test_plotter_compact(setup_simple_csv_file, setup_j1939_dump_file, qtbot):
+    """
+    Unit-tests for plotters compact storage mode
+
+    Step 0: Open setup_simple_csv_file fixture in compact mode
+    Step 1: Check that the signal values are stored as int8 and the plot
+        data equals the data of the default mode
+    Step 2: Open setup_j1939_dump_file fixture in compact mode
+    Step 3: Check that the decoded signal is stored with int64 nanoseconds
+        timestamps and the narrowest dtype and the plot data equals the data
+        of the default mode
+    """
+    # pylint: disable=protected-access
+    plotter = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {})
+    plotter.open()
+    compact = SimpleCsvPlotter(setup_simple_csv_file, ";", "timestamp", {},
+                               compact=True)
+    compact.open()
+    assert compact._signal("sig1").values.dtype == np.int8
+    pd.testing.assert_frame_equal(compact._signal_frame("sig1"),
+                                  plotter._signal_frame("sig1"),
+                                  check_dtype=False)
+
+    var = "SA100.PDU2.GE0.ExampleMessageRx.RxSignal1"
+    plotter = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"])
+    compact = J1939DumpPlotter(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                               compact=True)
+    for item in (plotter, compact):
+        while item.open(100000) == LogOpenProgress.OPEN_IN_PROGRESS:
+            pass
+    samples = compact._signal(var)
+    assert samples.ns_timestamps
+    assert samples.timestamps.dtype == np.int64
+    assert samples.values.itemsize < 8
+    pd.testing.assert_frame_equal(compact._signal_frame(var),
+                                  plotter._signal_frame(var))
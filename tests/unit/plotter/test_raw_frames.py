@@ -0,0 +1,65 @@
+""" Unit-tests for raw CAN frames store module """
+
+import can
+import numpy as np
+
+from plotter import RawFrameStore, iter_message_blocks
+
+def test_raw_frame_store():
+    """
+    Unit-tests for RawFrameStore
+
+    Step 0: Append classic frames one by one and as a block of selected rows
+    Step 1: Check the stored frames and the channels
+    Step 2: Append a CAN FD block and check that all payloads are widened
+    Step 3: Merge the store into another one with other channels and check
+        the remapped channel indexes
+    Step 4: Select frames in the timestamps order as a frame block
+    Step 5: Check that a store restored from a dict of arrays is identical
+    """
+    messages = [
+        can.Message(timestamp=float(i), arbitration_id=0x18fef100 + i,
+                    data=bytes([i] * (i % 8 + 1)), channel=f"can{i % 2}")
+        for i in range(10)
+    ]
+    store = RawFrameStore()
+    for msg in messages[:4]:
+        store.append(msg)
+    block = next(iter_message_blocks(messages[4:]))
+    store.extend(block, np.arange(len(block)) % 2 == 0)
+    assert len(store) == 7
+    frames = store.frames
+    assert list(frames["timestamp"]) == [0, 1, 2, 3, 4, 6, 8]
+    assert list(frames["dlc"]) == [1, 2, 3, 4, 5, 7, 1]
+    assert frames["data"].shape == (7, 8)
+    assert list(frames["data"][1]) == [1, 1, 0, 0, 0, 0, 0, 0]
+    assert store.channels == ["can0", "can1"]
+    assert list(frames["channel"]) == [0, 1, 0, 1, 0, 0, 0]
+
+    store.extend(next(iter_message_blocks([can.Message(
+        timestamp=0.5, arbitration_id=0x18fef200, data=bytes(range(12)),
+        channel="can2", is_fd=True
+    )])))
+    frames = store.frames
+    assert frames["data"].shape == (8, 64)
+    assert list(frames["data"][1, :3]) == [1, 1, 0]
+    assert list(frames["data"][7, :12]) == list(range(12))
+    assert frames["dlc"][7] == 12
+
+    merged = RawFrameStore()
+    merged.append(can.Message(timestamp=10.0, arbitration_id=1, data=b"\x01",
+                              channel="can2"))
+    merged.merge(store)
+    assert merged.channels == ["can2", "can0", "can1"]
+    assert list(merged.frames["channel"]) == [0, 1, 2, 1, 2, 1, 1, 1, 0]
+    assert merged.frames["data"].shape == (9, 64)
+
+    selected = merged.select(merged.frames["arbitration_id"] > 1)
+    assert list(selected.timestamps) == [0, 0.5, 1, 2, 3, 4, 6, 8]
+    assert [selected.channels[x] for x in selected.channel_index] == \
+        ["can0", "can2", "can1", "can0", "can1", "can0", "can0", "can0"]
+    assert selected.arbitration_ids[1] == 0x18fef200
+
+    restored = RawFrameStore.from_arrays(merged.to_arrays())
+    assert restored.channels == merged.channels
+    assert np.array_equal(restored.frames, merged.frames)
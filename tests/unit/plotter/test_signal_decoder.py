@@ -0,0 +1,101 @@
+""" Unit-tests for signal_decoder.py entities """
+
+import cantools
+import numpy as np
+
+# modules under test
+from plotter import decode_message, decode_message_signal, decode_signal
+
+TEST_DBC = """VERSION ""
+
+BS_:
+
+BU_: Ecu
+
+BO_ 2364540158 Mixed: 8 Ecu
+ SG_ LeUnsigned : 0|12@1+ (0.5,10) [0|0] "" Ecu
+ SG_ LeSigned : 12|9@1- (1,0) [0|0] "" Ecu
+ SG_ BeUnsigned : 23|11@0+ (1,-5) [0|0] "" Ecu
+ SG_ BeSigned : 44|7@0- (2,0) [0|0] "" Ecu
+ SG_ LeFloat : 32|32@1- (1,0) [0|0] "" Ecu
+
+BO_ 2364540159 Muxed: 8 Ecu
+ SG_ Mux M : 0|8@1+ (1,0) [0|0] "" Ecu
+ SG_ MuxedA m1 : 8|16@1+ (1,0) [0|0] "" Ecu
+ SG_ MuxedB m2 : 8|16@1- (0.1,0) [0|0] "" Ecu
+
+SIG_VALTYPE_ 2364540158 LeFloat : 1;
+"""
+
+def test_decode_signal():
+    """
+    Unit-test for decode_signal() function
+
+    Step 0: Generate random 8 bytes long payloads
+    Step 1: Check that every signal of the test message is decoded the same
+        way as cantools does it for each single payload
+    Step 2: Check that rows too short to contain a signal are NaN
+    """
+    db = cantools.db.load_string(TEST_DBC, "dbc", strict=False)
+    message = db.get_message_by_name("Mixed")
+
+    rng = np.random.default_rng(0)
+    payloads = rng.integers(0, 256, size=(200, 8), dtype=np.uint8)
+    # Keep float signal finite
+    payloads[:, 7] &= 0x3f
+
+    expected = [message.decode(bytes(p), decode_choices=False)
+                for p in payloads]
+    for signal in message.signals:
+        values = decode_signal(signal, payloads)
+        assert np.allclose(values, [e[signal.name] for e in expected])
+
+    lengths = np.full(200, 8, dtype=np.uint8)
+    lengths[:10] = 2
+    values = decode_signal(message.get_signal_by_name("LeSigned"),
+                           payloads, lengths)
+    assert np.isnan(values[:10]).all()
+    assert not np.isnan(values[10:]).any()
+
+def test_decode_message():
+    """
+    Unit-test for decode_message() function
+
+    Step 0: Prepare payloads for multiplexer values 1 and 2
+    Step 1: Check that multiplexed signals are decoded as cantools does it
+        and are NaN in the rows where they are not selected
+    """
+    db = cantools.db.load_string(TEST_DBC, "dbc", strict=False)
+    message = db.get_message_by_name("Muxed")
+
+    payloads = np.array([[1, 0x34, 0x12, 0, 0, 0, 0, 0],
+                         [2, 0xff, 0xff, 0, 0, 0, 0, 0]], dtype=np.uint8)
+
+    decoded = decode_message(message, payloads)
+    assert list(decoded["Mux"]) == [1, 2]
+    assert decoded["MuxedA"][0] == 0x1234
+    assert np.isnan(decoded["MuxedA"][1])
+    assert np.isnan(decoded["MuxedB"][0])
+    assert np.isclose(decoded["MuxedB"][1], -0.1)
+
+def test_decode_message_signal():
+    """
+    Unit-test for decode_message_signal() function
+
+    Step 0: Prepare payloads for multiplexer values 1 and 2
+    Step 1: Check that every signal decoded alone equals the one decoded
+        with decode_message()
+    """
+    db = cantools.db.load_string(TEST_DBC, "dbc", strict=False)
+    message = db.get_message_by_name("Muxed")
+
+    payloads = np.array([[1, 0x34, 0x12, 0, 0, 0, 0, 0],
+                         [2, 0xff, 0xff, 0, 0, 0, 0, 0]], dtype=np.uint8)
+
+    decoded = decode_message(message, payloads)
+    for signal in message.signals:
+        assert np.array_equal(
+            decode_message_signal(message, signal.name, payloads),
+            decoded[signal.name],
+            equal_nan=True
+        )
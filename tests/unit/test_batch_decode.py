@@ -0,0 +1,104 @@
+""" Unit-tests for batch_decode.py module entities """
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# modules under test
+from batch_decode import decode_file, make_parser, output_names, run
+
+def test_decode_file(setup_j1939_dump_file, tmp_path):
+    """
+    Unit-tests for decode_file() function
+
+    Step 0: Decode setup_j1939_dump_file fixture to NPZ
+    Step 1: Check that every signal is written as timestamp and value arrays
+        of the fixture messages
+    Step 2: Decode setup_j1939_dump_file fixture to Parquet and Feather
+        with a given output name
+    Step 3: Check that the long tables hold the same samples
+    """
+    path, processed = decode_file(setup_j1939_dump_file,
+                                  ["dbc/example_db.dbc"], str(tmp_path))
+    assert processed == 20000
+    with np.load(path) as arrays:
+        assert len(arrays.files) == 8
+        key = "SA249.PDU1.DA100.ExampleMessageTx.TxSignal1"
+        assert len(arrays[key + "/timestamp"]) == 10000
+        assert list(arrays[key + "/timestamp"][:2]) == [1, 3]
+        assert len(arrays[key + "/value"]) == 10000
+
+    for output_format, read in (("parquet", pd.read_parquet),
+                                ("feather", pd.read_feather)):
+        path, _ = decode_file(setup_j1939_dump_file, ["dbc/example_db.dbc"],
+                              str(tmp_path), output_format,
+                              output_name="decoded")
+        assert os.path.basename(path) == "decoded." + output_format
+        df = read(path)
+        assert list(df.columns) == ["signal", "timestamp", "value"]
+        assert df["signal"].nunique() == 4
+        assert len(df) == 4 * 10000
+
+def test_output_names():
+    """
+    Unit-tests for output_names() function
+
+    Step 0: Check that logs of different names keep their names
+    Step 1: Check that logs of the same name in different directories or
+        with different extensions get the names of their relative paths
+    Step 2: Check that a log given twice leads to a ValueError exception
+    """
+    assert output_names(["a/run1.log", "b/run2.asc"]) == ["run1", "run2"]
+    assert output_names([os.path.join("logs", "bench1", "run.log"),
+                         os.path.join("logs", "bench2", "run.log"),
+                         os.path.join("logs", "run.asc"),
+                         "other.blf"]) == \
+        ["bench1_run_log", "bench2_run_log", "run_asc", "other"]
+    with pytest.raises(ValueError):
+        output_names(["a/run.log", "b/../a/run.log"])
+
+def test_run(setup_j1939_dump_file, tmp_path, capsys):
+    """
+    Unit-tests for make_parser() and run() functions
+
+    Step 0: Decode setup_j1939_dump_file fixture and a missing log with two
+        worker processes
+    Step 1: Check that the exit code reports the failed log, the existing
+        log is decoded and the progress of both is printed to stderr
+    Step 2: Decode two logs of the same name in different directories and
+        check that both output files are written
+    Step 3: Check that a log given twice fails before decoding
+    """
+    args = make_parser().parse_args([
+        setup_j1939_dump_file, str(tmp_path / "missing.log"),
+        "--db", "dbc/example_db.dbc", "-o", str(tmp_path / "out"), "-j", "2"
+    ])
+    assert run(args) == 1
+    assert (tmp_path / "out" / "test_j1939_dump.npz").is_file()
+    stderr = capsys.readouterr().err
+    assert "[2/2]" in stderr
+    assert "missing.log: failed" in stderr
+
+    for bench in ("bench1", "bench2"):
+        (tmp_path / bench).mkdir()
+        shutil.copy(setup_j1939_dump_file, tmp_path / bench / "run.csv")
+    args = make_parser().parse_args([
+        str(tmp_path / "bench1" / "run.csv"),
+        str(tmp_path / "bench2" / "run.csv"),
+        "--db", "dbc/example_db.dbc", "-o", str(tmp_path / "out"), "-j", "1"
+    ])
+    assert run(args) == 0
+    assert (tmp_path / "out" / "bench1_run_csv.npz").is_file()
+    assert (tmp_path / "out" / "bench2_run_csv.npz").is_file()
+
+    args = make_parser().parse_args([
+        str(tmp_path / "bench1" / "run.csv"),
+        str(tmp_path / "bench1" / "run.csv"),
+        "--db", "dbc/example_db.dbc", "-o", str(tmp_path / "dup")
+    ])
+    assert run(args) == 1
+    assert "Output names collide" in capsys.readouterr().err
+    assert not (tmp_path / "dup").exists()